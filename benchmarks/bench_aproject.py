@@ -0,0 +1,76 @@
+"""Benchmark the event loop latency of deep projection with project and aproject.
+
+Projects batches of records (a dict with nested list and dict values) in an asyncio task while ten
+other tasks sleep for 1ms in a loop, first with the synchronous project and then with aproject and
+a few budgets. Reports the total time of the projections, and the p99 and maximum wake-up lag of
+the sleeping tasks, which is how long they overslept:
+
+    python benchmarks/bench_aproject.py --records 50000 --batches 3
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Optional
+
+import opticol
+
+_SLEEP_S = 0.001
+
+
+async def _sleeper(lags: list[float], done: asyncio.Event) -> None:
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(_SLEEP_S)
+        lags.append(time.perf_counter() - start - _SLEEP_S)
+
+
+async def _run(batches: list[Any], budget_ms: Optional[float]) -> tuple[float, list[float]]:
+    """Project every batch while the sleepers run, returning the seconds taken and their lags."""
+    lags: list[float] = []
+    done = asyncio.Event()
+    sleepers = [asyncio.create_task(_sleeper(lags, done)) for _ in range(10)]
+    await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    for batch in batches:
+        if budget_ms is None:
+            opticol.default.project(batch)
+        else:
+            await opticol.default.aproject(batch, budget_ms=budget_ms)
+        # Lets the sleepers run between batches, as a request handler would.
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+
+    done.set()
+    await asyncio.gather(*sleepers)
+    return elapsed, lags
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=50_000, help="records per batch")
+    parser.add_argument("--batches", type=int, default=3, help="batches to project")
+    args = parser.parse_args()
+
+    def batch() -> list[Any]:
+        return [
+            {"id": i, "tags": [f"t{i % 5}", "x"], "meta": {"a": i, "b": [i, i + 1]}}
+            for i in range(args.records)
+        ]
+
+    print(f"{'variant':<24} {'total s':>8} {'p99 lag ms':>11} {'max lag ms':>11}")
+    for name, budget_ms in (
+        ("project", None),
+        ("aproject budget 5ms", 5.0),
+        ("aproject budget 1ms", 1.0),
+    ):
+        batches = [batch() for _ in range(args.batches)]
+        elapsed, lags = asyncio.run(_run(batches, budget_ms))
+        lags.sort()
+        p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+        print(f"{name:<24} {elapsed:>8.2f} {p99 * 1e3:>11.1f} {lags[-1] * 1e3:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
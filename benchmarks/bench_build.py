@@ -0,0 +1,79 @@
+"""Benchmark build_seqs and build_mappings against projecting rows one at a time.
+
+Builds rows of three ints into optimized sequences and mappings, once through the projector methods
+per row and once with the bulk builders, from tuples, from a flat array and (for mappings) from
+prebuilt dicts. Reports the seconds taken by each, with the garbage collector paused and running:
+
+    python benchmarks/bench_build.py --rows 1000000
+"""
+
+import argparse
+from array import array
+from collections.abc import Callable
+import gc
+import time
+from typing import Any, Optional
+
+from opticol.bulk import build_mappings, build_seqs
+from opticol.projector import OptimizedCollectionProjector
+
+_KEYS = ("a", "b", "c")
+
+
+def _seconds(stmt: Callable[[], Any], paused: bool) -> float:
+    """Time a statement once, dropping its result before the next run."""
+    gc.collect()
+    if paused:
+        gc.disable()
+    try:
+        start = time.perf_counter()
+        stmt()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows to build")
+    args = parser.parse_args()
+
+    projector = OptimizedCollectionProjector(0, 3, True)
+    seq = projector.seq
+    mapping = projector.mapping
+    rows = [(i, i + 1, i + 2) for i in range(args.rows)]
+    flat = array("q", (value for row in rows for value in row))
+    dicts = [dict(zip(_KEYS, row)) for row in rows]
+
+    cases: list[tuple[str, Callable[[], Any], Optional[Callable[[], Any]]]] = [
+        (
+            "seq from tuples",
+            lambda: [seq(row) for row in rows],
+            lambda: build_seqs(rows, 3, project=seq),
+        ),
+        (
+            "seq from flat array",
+            lambda: [seq(flat[i : i + 3]) for i in range(0, len(flat), 3)],
+            lambda: build_seqs(flat, 3, layout="buffer", project=seq),
+        ),
+        # Dicts have no bulk path, so this is the baseline of already decoded rows.
+        ("mapping from prebuilt dicts", lambda: [mapping(d) for d in dicts], None),
+        (
+            "mapping from tuples",
+            lambda: [mapping(dict(zip(_KEYS, row))) for row in rows],
+            lambda: build_mappings(rows, _KEYS, project=mapping),
+        ),
+    ]
+
+    print(f"{'rows':<28} {'gc':<8} {'per row s':>10} {'bulk s':>8}")
+    for paused in (True, False):
+        for name, per_row, bulk in cases:
+            bulk_s = "-" if bulk is None else f"{_seconds(bulk, paused):.2f}"
+            print(
+                f"{name:<28} {'paused' if paused else 'running':<8} "
+                f"{_seconds(per_row, paused):>10.2f} {bulk_s:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
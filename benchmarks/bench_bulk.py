@@ -0,0 +1,96 @@
+"""Benchmark how bulk_project scales from one worker to every core.
+
+Projects a batch of JSON records, loaded with json.loads in the workers, serially and then with
+thread and process pools of 1 to N workers. Reports the seconds taken by each run and its speedup
+over the serial run. Threads only scale on free-threaded builds, and processes only scale the load
+and packing done in the workers, since the parent rebuilds every record:
+
+    python benchmarks/bench_bulk.py --records 200000 --max-workers 8
+"""
+
+import argparse
+from collections.abc import Callable
+from functools import partial
+import gc
+import json
+import os
+import time
+from typing import Any, Literal
+
+from opticol.bulk import bulk_project, free_threaded
+from opticol.projector import OptimizedCollectionProjector
+
+
+def _seconds(stmt: Callable[[], Any]) -> float:
+    """Time a statement once, with the collector paused as in a bulk load."""
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        stmt()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def _worker_counts(max_workers: int) -> list[int]:
+    """List 1, 2, 4, etc. up to max_workers, which is always included."""
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200_000, help="records to project")
+    parser.add_argument(
+        "--max-workers", type=int, default=os.cpu_count() or 1, help="largest pool to measure"
+    )
+    parser.add_argument("--chunk-size", type=int, default=1024, help="records per chunk")
+    args = parser.parse_args()
+
+    lines = [
+        json.dumps(
+            {
+                "id": i,
+                "status": ("ok", "failed", "pending")[i % 3],
+                "tags": [f"tag{i % 7}", f"tag{i % 11}"],
+                "scores": {"a": i % 5, "b": i / 3},
+            }
+        )
+        for i in range(args.records)
+    ]
+    factory = partial(OptimizedCollectionProjector, 0, 3, True)
+
+    def run(executor: Literal["serial", "thread", "process"], workers: int = 1) -> float:
+        return _seconds(
+            lambda: bulk_project(
+                lines,
+                factory,
+                load=json.loads,
+                workers=workers,
+                chunk_size=args.chunk_size,
+                executor=executor,
+            )
+        )
+
+    print(
+        f"{args.records} records, {os.cpu_count()} CPUs, free-threaded: {free_threaded()}",
+        end="\n\n",
+    )
+    serial = run("serial")
+    print(f"{'executor':<10} {'workers':>7} {'seconds':>9} {'speedup':>8}")
+    print(f"{'serial':<10} {1:>7} {serial:>9.2f} {1:>8.2f}")
+    executors: tuple[Literal["thread", "process"], ...] = ("thread", "process")
+    for executor in executors:
+        for workers in _worker_counts(args.max_workers):
+            elapsed = run(executor, workers)
+            print(f"{executor:<10} {workers:>7} {elapsed:>9.2f} {serial / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark loading a dataset with and without bulk_load.
+
+Loads projected records from a JSON payload in a fresh interpreter per mode, once plainly and once
+inside bulk_load. Reports the load time, the numbers of tracked and frozen objects and the pause of
+a full collection afterwards. On Linux, it also forks a worker and reports the memory the worker
+made private (Private_Dirty of /proc/self/smaps_rollup) by a gc.collect() and then by reading every
+record:
+
+    python benchmarks/bench_bulk_load.py --records 300000
+"""
+
+import argparse
+from contextlib import nullcontext
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Optional
+
+from opticol.bulk import bulk_load, full_collection_ms
+from opticol.projector import OptimizedCollectionProjector
+
+_MODES = ("plain", "bulk_load")
+
+
+def _private_dirty_mib() -> Optional[float]:
+    """Read the private dirty memory of the process in MiB, or None where it is not available."""
+    try:
+        with open("/proc/self/smaps_rollup", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Private_Dirty:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _read(records: Any) -> int:
+    total = 0
+    for record in records:
+        total += record["id"] + len(record["tags"]) + len(record["meta"])
+    return total
+
+
+def _forked_worker(records: Any) -> str:
+    """Measure the memory made private by a forked worker, formatted for the report."""
+    if not hasattr(os, "fork") or _private_dirty_mib() is None:
+        return f"{'n/a':>12} {'n/a':>12}"
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        base = _private_dirty_mib() or 0.0
+        gc.collect()
+        collected = (_private_dirty_mib() or 0.0) - base
+        _read(records)
+        read = (_private_dirty_mib() or 0.0) - base
+        os.write(write_fd, f"{collected:>12.1f} {read:>12.1f}".encode())
+        os._exit(0)  # pylint: disable=protected-access
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as f:
+        result = f.read().decode()
+    os.waitpid(pid, 0)
+    return result
+
+
+def _measure(mode: str, records: int) -> str:
+    """Load the records in the given mode, returning the formatted report line."""
+    payload = json.dumps(
+        [
+            {"id": i, "tags": [f"t{i % 9}", "x"], "meta": {"a": i % 3, "b": [i]}}
+            for i in range(records)
+        ]
+    )
+    projector = OptimizedCollectionProjector(0, 3, True)
+    gc.collect()
+
+    start = time.perf_counter()
+    with bulk_load() if mode == "bulk_load" else nullcontext():
+        loaded = projector.project(json.loads(payload))
+    del payload
+    load_s = time.perf_counter() - start
+
+    # Frozen objects are left out of gc.get_objects, like they are out of collections.
+    tracked = len(gc.get_objects())
+    frozen = gc.get_freeze_count()
+    pause_ms = full_collection_ms()
+    return (
+        f"{mode:<10} {load_s:>7.2f} {tracked:>9} {frozen:>9} {pause_ms:>10.2f} "
+        f"{_forked_worker(loaded)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=300_000, help="records to load")
+    parser.add_argument("--mode", choices=_MODES, help="measure one mode in this process")
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        print(_measure(args.mode, args.records))
+        return
+
+    print(
+        f"{'mode':<10} {'load s':>7} {'tracked':>9} {'frozen':>9} {'full gc ms':>10} "
+        f"{'gc MiB':>12} {'read MiB':>12}"
+    )
+    for mode in _MODES:
+        # Each mode runs in a fresh interpreter, since freezing cannot be fully undone.
+        subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--records", str(args.records)], check=True
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark the optimized Counter, defaultdict, OrderedDict and deque classes.
+
+For every type, reports the memory of an instance of three elements and the latency of a lookup
+(and of appendleft plus popleft for deques), for the builtin type and its projection:
+
+    python benchmarks/bench_collections.py --count 100000
+"""
+
+import argparse
+from collections import Counter, OrderedDict, defaultdict, deque
+from collections.abc import Callable
+import timeit
+import tracemalloc
+from typing import Any
+
+from opticol.projector import OptimizedCollectionProjector
+
+_PROJECTOR = OptimizedCollectionProjector(0, 3, True)
+
+_CASES: tuple[tuple[str, Callable[[], Any], Callable[[Any], Any]], ...] = (
+    ("Counter", lambda: Counter(a=1, b=2, c=3), _PROJECTOR.counter),
+    ("defaultdict", lambda: defaultdict(list, a=1, b=2, c=3), _PROJECTOR.default_dict),
+    ("OrderedDict", lambda: OrderedDict(a=1, b=2, c=3), _PROJECTOR.ordered_dict),
+    ("deque", lambda: deque([1, 2, 3], maxlen=4), _PROJECTOR.deque),
+)
+
+
+def _bytes_per_instance(create: Callable[[], Any], count: int) -> float:
+    """Measure the memory allocated per instance while creating count instances."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [create() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # The list holding the instances is not part of their size.
+    return (after - before) / len(instances) - 8
+
+
+def _ns_per_call(stmt: Callable[[], Any], number: int) -> float:
+    """Time a statement, taking the best of five runs to reduce noise."""
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="instances per measurement")
+    args = parser.parse_args()
+
+    print(f"{'type':<12} {'variant':<10} {'bytes':>8} {'lookup ns':>10} {'left ops ns':>12}")
+    for name, create, project in _CASES:
+        for variant, factory in (("builtin", create), ("opticol", lambda: project(create()))):
+            size = _bytes_per_instance(factory, args.count)
+            inst = factory()
+            key = 0 if name == "deque" else "b"
+            lookup = _ns_per_call(lambda: inst[key], args.count)
+            left = ""
+            if name == "deque":
+                inst.pop()
+
+                def appendleft_popleft() -> None:
+                    inst.appendleft(0)
+                    inst.popleft()
+
+                left = f"{_ns_per_call(appendleft_popleft, args.count):.0f}"
+            print(f"{name:<12} {variant:<10} {size:>8.0f} {lookup:>10.0f} {left:>12}")
+
+
+if __name__ == "__main__":
+    main()
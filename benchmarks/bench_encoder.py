@@ -0,0 +1,58 @@
+"""Benchmark opticol.encoder against json.dumps with a default hook.
+
+Encodes projected records (an int, a str, a three element list and a three key mapping each),
+immutable and mutable, with opticol.encoder.dumps and with json.dumps through a default hook which
+converts collections with dict and list, and encodes the builtin records for reference:
+
+    python benchmarks/bench_encoder.py --records 20000
+"""
+
+import argparse
+from collections.abc import Callable, Mapping
+import json
+import timeit
+from typing import Any
+
+from opticol import encoder
+from opticol.projector import OptimizedCollectionProjector
+
+
+def _default(o: Any) -> Any:
+    """Convert a collection the usual way, one element at a time."""
+    if isinstance(o, Mapping):
+        return dict(o)
+    return list(o)
+
+
+def _ms_per_call(stmt: Callable[[], Any]) -> float:
+    """Time a statement, taking the best of five runs to reduce noise."""
+    return min(timeit.repeat(stmt, number=1, repeat=5)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20_000, help="records to encode")
+    args = parser.parse_args()
+
+    records = [
+        {"id": i, "name": f"row{i}", "tags": ["a", "b", "c"], "pos": {"x": i, "y": 0, "z": 1}}
+        for i in range(args.records)
+    ]
+    projector = OptimizedCollectionProjector(0, 4, True)
+    immutable = projector.project(records)
+    mutable = projector.project(records, mutable=True)
+
+    expected = json.dumps(records)
+    assert encoder.dumps(immutable) == expected
+    assert encoder.dumps(mutable) == expected
+
+    print(f"{'records':<10} {'encoder ms':>11} {'default ms':>11}")
+    print(f"{'builtin':<10} {_ms_per_call(lambda: json.dumps(records)):>11.1f} {'':>11}")
+    for name, value in (("immutable", immutable), ("mutable", mutable)):
+        fast = _ms_per_call(lambda: encoder.dumps(value))
+        hook = _ms_per_call(lambda: json.dumps(value, default=_default))
+        print(f"{name:<10} {fast:>11.1f} {hook:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark the mappings keyed by the members of an Enum.
+
+Reports the memory of a mapping holding every member of an Enum and the latency of a lookup and of
+an assignment, for a dict and for the classes from create_enum_mapping_class and
+create_enum_mut_mapping_class:
+
+    python benchmarks/bench_enum.py --count 100000 --members 8
+"""
+
+import argparse
+from collections.abc import Callable
+from enum import Enum
+import timeit
+import tracemalloc
+from typing import Any
+
+from opticol.factory import create_enum_mapping_class, create_enum_mut_mapping_class
+
+
+def _bytes_per_instance(create: Callable[[], Any], count: int) -> float:
+    """Measure the memory allocated per instance while creating count instances."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [create() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # The list holding the instances is not part of their size.
+    return (after - before) / len(instances) - 8
+
+
+def _ns_per_call(stmt: Callable[[], Any], number: int) -> float:
+    """Time a statement, taking the best of five runs to reduce noise."""
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="instances per measurement")
+    parser.add_argument("--members", type=int, default=8, help="members of the Enum")
+    args = parser.parse_args()
+
+    key_type = Enum("Key", [f"M{i}" for i in range(args.members)])
+    members = list(key_type)
+    source = {member: i for i, member in enumerate(members)}
+    key = members[-1]
+
+    cases: tuple[tuple[str, Callable[[Any], Any]], ...] = (
+        ("dict", dict),
+        ("enum mapping", create_enum_mapping_class(key_type)),
+        ("enum mut mapping", create_enum_mut_mapping_class(key_type)),
+    )
+
+    print(f"{'variant':<18} {'bytes':>8} {'lookup ns':>10} {'assign ns':>10}")
+    for name, cls in cases:
+        size = _bytes_per_instance(lambda: cls(source), args.count)
+        inst = cls(source)
+        lookup = _ns_per_call(lambda: inst[key], args.count)
+        assign = ""
+        if hasattr(inst, "__setitem__"):
+
+            def set_item() -> None:
+                inst[key] = 0
+
+            assign = f"{_ns_per_call(set_item, args.count):.0f}"
+        print(f"{name:<18} {size:>8.0f} {lookup:>10.0f} {assign:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark memory-mapped snapshots against rebuilding and pickling a graph.
+
+Builds records of an int id, a two element tags list and a float score as optimized collections,
+writes them with snapshot.dump and reopens them with snapshot.load. Reports the seconds taken to
+build and dump the records, the size of the file, the time and resident memory taken by load, by a
+first record access and by iterating every record, the time to read two fields of every record, and
+the write and read times of the pickle path (to_builtin plus pickle.dump, then pickle.load plus a
+deep projection):
+
+    python benchmarks/bench_snapshot.py --records 1000000
+
+Resident memory is read from /proc/self/statm, so it is only reported on Linux.
+"""
+
+import argparse
+from collections.abc import Callable
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, Optional
+
+import opticol
+from opticol import snapshot
+
+
+def _rss_mib() -> Optional[float]:
+    """Read the resident memory of the process in MiB, or None where /proc is not available."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _timed(stmt: Callable[[], Any]) -> tuple[Any, float, Optional[float]]:
+    """Run a statement once, returning its result, the seconds taken and the RSS growth in MiB."""
+    before = _rss_mib()
+    start = time.perf_counter()
+    value = stmt()
+    elapsed = time.perf_counter() - start
+    after = _rss_mib()
+    return value, elapsed, None if before is None or after is None else after - before
+
+
+def _format_mib(mib: Optional[float]) -> str:
+    return "n/a" if mib is None else f"{mib:+.1f} MiB"
+
+
+def _iterate(root: Any) -> int:
+    return sum(1 for _ in root)
+
+
+def _read(root: Any) -> float:
+    total = 0.0
+    for record in root:
+        total += record["score"] + len(record["tags"])
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000, help="records to store")
+    args = parser.parse_args()
+
+    def build() -> Any:
+        return opticol.seq(
+            [
+                opticol.mapping(
+                    {"id": i, "tags": opticol.seq([f"tag{i % 100}", i % 7]), "score": i / 3}
+                )
+                for i in range(args.records)
+            ]
+        )
+
+    records, build_s, _ = _timed(build)
+    print(f"{'rebuild with opticol.mapping/seq':<36} {build_s:>9.2f} s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "records.optc")
+        size, dump_s, _ = _timed(lambda: snapshot.dump(records, path))
+        print(f"{'snapshot.dump':<36} {dump_s:>9.2f} s  {size / (1024 * 1024):.0f} MiB file")
+
+        snap, load_s, load_rss = _timed(lambda: snapshot.load(path))
+        with snap:
+            print(f"{'snapshot.load':<36} {load_s * 1e3:>9.2f} ms {_format_mib(load_rss)}")
+            _, first_s, _ = _timed(lambda: snap.root[len(snap.root) // 2]["id"])
+            print(f"{'first record access':<36} {first_s * 1e6:>9.1f} us")
+            _, iterate_s, iterate_rss = _timed(lambda: _iterate(snap.root))
+            print(f"{'iterate every record':<36} {iterate_s:>9.2f} s  {_format_mib(iterate_rss)}")
+            _, read_s, _ = _timed(lambda: _read(snap.root))
+            print(f"{'read two fields of every record':<36} {read_s:>9.2f} s")
+
+        pickled = os.path.join(directory, "records.pickle")
+
+        def write_pickle() -> None:
+            with open(pickled, "wb") as f:
+                pickle.dump(opticol.to_builtin(records), f, pickle.HIGHEST_PROTOCOL)
+
+        def read_pickle() -> Any:
+            with open(pickled, "rb") as f:
+                return opticol.default.project(pickle.load(f))
+
+        _, write_s, _ = _timed(write_pickle)
+        print(f"{'to_builtin + pickle.dump':<36} {write_s:>9.2f} s")
+        _, unpickle_s, _ = _timed(read_pickle)
+        print(f"{'pickle.load + project':<36} {unpickle_s:>9.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark the intern_keys option of OptimizedCollectionProjector.
+
+Projects rows whose str keys are built at runtime, as a parser reading one record at a time does,
+and reports the memory kept by the projected rows and the latency of a lookup with a literal key,
+with and without interned keys:
+
+    python benchmarks/bench_str_keys.py --rows 100000 --keys 4
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+from typing import Any
+
+from opticol.projector import OptimizedCollectionProjector
+
+
+def _rows(count: int, keys: int) -> list[dict[str, int]]:
+    # Joining a list builds a new str for every row instead of reusing the interned literal.
+    return [{"".join(["field_", str(k)]): k for k in range(keys)} for _ in range(count)]
+
+
+def _run(intern_keys: bool, count: int, keys: int) -> None:
+    projector = OptimizedCollectionProjector(0, keys, True, intern_keys=intern_keys)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        # The rows are built while tracing, so that freeing their keys is accounted for.
+        rows = _rows(count, keys)
+        projected: list[Any] = [projector.mapping(row) for row in rows]
+        del rows
+        gc.collect()
+        kept = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    row = projected[-1]
+    key = f"field_{keys - 1}"
+    lookup = min(timeit.repeat(lambda: row[key], number=count, repeat=5)) / count * 1e9
+    print(f"{str(intern_keys):<12} {kept / (1024 * 1024):>9.2f} {lookup:>10.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="rows to project")
+    parser.add_argument("--keys", type=int, default=4, help="str keys per row")
+    args = parser.parse_args()
+
+    print(f"{'intern_keys':<12} {'kept MiB':>9} {'lookup ns':>10}")
+    for intern_keys in (False, True):
+        _run(intern_keys, args.rows, args.keys)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark RecordTable against rows stored as optimized mappings.
+
+Stores rows of an int id, a str name and a float score both in a RecordTable with typed id and
+score columns and as a list of opticol.mapping rows. Reports the memory kept by each, the time to
+sum the scores, to find every tenth id and to build the rows, and the cost of accessing one row as
+a view, of materializing it and of creating an optimized mapping of the same row:
+
+    python benchmarks/bench_table.py --rows 1000000
+"""
+
+import argparse
+from collections.abc import Callable
+import gc
+import time
+import timeit
+import tracemalloc
+from typing import Any
+
+import opticol
+from opticol.table import RecordTable
+
+
+def _kept(build: Callable[[], Any]) -> tuple[Any, float, float]:
+    """Build a value, returning it with the MiB it keeps allocated and the seconds taken."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        value = build()
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        kept = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return value, kept / (1024 * 1024), elapsed
+
+
+def _seconds(stmt: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    stmt()
+    return time.perf_counter() - start
+
+
+def _ns_per_call(stmt: Callable[[], Any], number: int) -> float:
+    """Time a statement, taking the best of five runs to reduce noise."""
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows to store")
+    args = parser.parse_args()
+
+    ids = list(range(args.rows))
+    names = [f"name{i % 1000}" for i in ids]
+    scores = [i / 7 for i in ids]
+
+    def build_table() -> RecordTable:
+        table = RecordTable(
+            opticol.default, ("id", "name", "score"), typecodes={"id": "q", "score": "d"}
+        )
+        table.extend_columns({"id": ids, "name": names, "score": scores})
+        return table
+
+    def build_mappings() -> list[Any]:
+        return [
+            opticol.mapping({"id": i, "name": n, "score": s}) for i, n, s in zip(ids, names, scores)
+        ]
+
+    table, table_mib, table_build = _kept(build_table)
+    rows, rows_mib, rows_build = _kept(build_mappings)
+
+    print(f"{'operation':<22} {'table':>12} {'mappings':>12}")
+    print(f"{'kept MiB':<22} {table_mib:>12.1f} {rows_mib:>12.1f}")
+    print(f"{'build s':<22} {table_build:>12.2f} {rows_build:>12.2f}")
+
+    column_sum = _seconds(lambda: sum(table.column("score")))
+    rows_sum = _seconds(lambda: sum(row["score"] for row in rows))
+    print(f"{'sum of scores s':<22} {column_sum:>12.3f} {rows_sum:>12.3f}")
+
+    where = _seconds(lambda: table.where("id", lambda v: v % 10 == 0))
+    scan = _seconds(lambda: [i for i, row in enumerate(rows) if row["id"] % 10 == 0])
+    print(f"{'every tenth id s':<22} {where:>12.3f} {scan:>12.3f}")
+
+    count = 100_000
+    index = args.rows // 2
+    row = {"id": ids[index], "name": names[index], "score": scores[index]}
+    view = _ns_per_call(lambda: table[index], count)
+    materialize = _ns_per_call(lambda: table.materialize(index), count)
+    mapping = _ns_per_call(lambda: opticol.mapping(row), count)
+    view_lookup = _ns_per_call(lambda: table[index]["name"], count)
+    print(f"{'row view ns':<22} {view:>12.0f}")
+    print(f"{'row view lookup ns':<22} {view_lookup:>12.0f}")
+    print(f"{'materialize ns':<22} {materialize:>12.0f} {mapping:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark opticol.to_builtin against a recursive conversion.
+
+Converts projected records with five nested collections each, immutable and mutable, back to
+builtin types with to_builtin and with a recursive function converting through items() and
+iteration:
+
+    python benchmarks/bench_to_builtin.py --records 100000
+"""
+
+import argparse
+from collections.abc import Mapping, Sequence, Set
+import time
+from typing import Any
+
+from opticol import to_builtin
+from opticol.projector import OptimizedCollectionProjector
+
+
+def _recursive(value: Any) -> Any:
+    """Convert a graph of collections the usual way, one element at a time."""
+    if isinstance(value, Mapping):
+        return {k: _recursive(v) for k, v in value.items()}
+    if isinstance(value, Set):
+        return set(value)
+    if isinstance(value, Sequence) and not isinstance(value, (str, bytes)):
+        return [_recursive(v) for v in value]
+    return value
+
+
+def _seconds(convert: Any, value: Any) -> float:
+    start = time.perf_counter()
+    convert(value)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000, help="records to convert")
+    args = parser.parse_args()
+
+    records = [
+        {
+            "id": i,
+            "tags": ["a", "b"],
+            "flags": {"x", "y"},
+            "pos": {"x": i, "y": 0},
+            "path": [{"step": 1}, {"step": 2}],
+        }
+        for i in range(args.records)
+    ]
+    projector = OptimizedCollectionProjector(0, 5, True)
+
+    print(f"{'records':<10} {'to_builtin s':>13} {'recursive s':>12}")
+    for name, mutable in (("immutable", False), ("mutable", True)):
+        value = projector.project(records, mutable=mutable)
+        assert to_builtin(value) == _recursive(value) == records
+        fast = _seconds(to_builtin, value)
+        slow = _seconds(_recursive, value)
+        print(f"{name:<10} {fast:>13.2f} {slow:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,16 @@
 This module provides quick-access functions for creating optimized collections using a sensible
 default projector configuration. These functions (seq, mut_seq, set, mut_set, mapping, mut_mapping)
 are backed by a default OptimizedCollectionProjector instance configured for collections of size
-0-3. This projector instance can be accessed by the `default` member as well.
+0-3. This projector instance can be accessed by the `default` member as well. It has no
+mut_ownership mode, so mut_seq, mut_set and mut_mapping return larger inputs unchanged, aliasing
+them. Create a projector with mut_ownership to store them in instances of their own.
 
 For more control over optimization strategy, consumers should use the Projector API directly (see
 opticol.projector). Projectors provide a pluggable policy layer that allows different optimization
 approaches to be swapped based on use case. The factory module (factory.py) contains the underlying
-implementation that generates optimized collection classes of arbitrary sizes.
+implementation that generates optimized collection classes of arbitrary sizes. The projected class
+decorator (see opticol.fields) applies a projector to the collection fields of data model classes,
+and to_builtin (see opticol.builtin) converts optimized collections back to builtin types.
 
 Example:
     >>> import opticol
@@ -16,8 +20,22 @@ Example:
     >>> m = opticol.mapping({'a': 1, 'b': 2})  # Creates optimized mapping
 """
 
-__all__ = ["factory", "projector", "mapping", "mut_mapping", "mut_seq", "mut_set", "seq", "set"]
-
+__all__ = [
+    "factory",
+    "fields",
+    "projector",
+    "mapping",
+    "mut_mapping",
+    "mut_seq",
+    "mut_set",
+    "projected",
+    "seq",
+    "set",
+    "to_builtin",
+]
+
+from opticol.builtin import to_builtin
+from opticol.fields import projected
 from opticol.projector import OptimizedCollectionProjector
 
 default = OptimizedCollectionProjector(0, 3, True)
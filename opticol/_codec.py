@@ -0,0 +1,422 @@
+"""Compact binary encoding of collection graphs with lazily decoding views.
+
+This module implements the binary format shared by the shared memory and snapshot features. A graph
+of collections and primitive values is encoded into a single buffer, and read back through view
+objects which implement the immutable collection ABCs directly on top of the buffer. Nothing is
+decoded until it is accessed, and decoding an element never copies the rest of the buffer.
+
+The buffer starts with a header (magic, version and the offset of the root value). Every value is
+stored at an offset as a one byte tag followed by its payload. All integers of the format are little
+endian, and references to other values are unsigned 32 bit offsets, which limits a buffer to 4 GiB:
+
+* None, False, True: the tag only.
+* int: a signed 64 bit integer, or a length prefixed two's complement byte string for larger values.
+* float: an IEEE 754 double.
+* str, bytes: a 32 bit length followed by the UTF-8 encoded or raw bytes.
+* Sequence, Set: a 32 bit count followed by the offsets of the elements.
+* Mapping: a 32 bit count followed by the offsets of the keys and then the offsets of the values.
+
+Equal scalars and repeated collection objects are written once and referenced by offset, so shared
+structure in the source graph stays shared in the buffer.
+
+Mapping keys and set elements must stay hashable, so they are decoded eagerly, with sequences as
+tuples and sets as frozensets. Set and mapping views with more than a few entries build an index
+of their keys (a frozenset or dict) on the first lookup, after which lookups take constant time.
+The indexes are cached by offset for the whole decoded graph, so every view of a collection shares
+one, however often it is reached from its parent. Like any decoded value, an index is private to
+the process which built it.
+"""
+
+from collections.abc import Callable, Iterator, Mapping, Sequence, Set
+import struct
+from typing import Any, Optional
+
+from opticol import _convert, _deep
+from opticol._views import _SlotItemsView
+
+MAGIC = b"OPTC"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHI")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_TAGGED_U32 = struct.Struct("<BI")
+_TAGGED_I64 = struct.Struct("<Bq")
+_TAGGED_F64 = struct.Struct("<Bd")
+
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_BIG_INT = 4
+_FLOAT = 5
+_STR = 6
+_BYTES = 7
+_SEQUENCE = 8
+_SET = 9
+_MAPPING = 10
+
+_MAX_OFFSET = 0xFFFFFFFF
+
+_INDEX_MIN_COUNT = 8
+"""The smallest number of keys or elements for which a view indexes them instead of scanning."""
+
+
+_NATIVE_TYPES = frozenset((dict, list, tuple, set, frozenset))
+"""The builtin collection types which are encoded as they are."""
+
+_CONVERTERS: dict[type, Optional[Callable[[Any], Any]]] = {}
+"""
+The converter of every other collection type encoded so far, which reads its contents.
+"""
+
+
+def _contents(value: Any) -> Any:
+    """Read the contents of a collection in a single call where possible (see opticol.encoder).
+
+    Returns:
+        A dict for mappings, a collection of the elements otherwise, or value itself.
+    """
+    cls = type(value)
+    if cls in _NATIVE_TYPES:
+        return value
+
+    try:
+        converter = _CONVERTERS[cls]
+    except KeyError:
+        converter = _CONVERTERS[cls] = _convert.converter(cls)
+    return value if converter is None else converter(value)
+
+
+class _Encoder:
+    """Accumulates the encoding of a value graph into a bytearray."""
+
+    def __init__(self) -> None:
+        self.out = bytearray(_HEADER.size)
+        self.scalars: dict[tuple[type, Any], int] = {}
+        self.containers: dict[int, int] = {}
+        # Keeps the encoded containers alive so that their ids stay unique during encoding.
+        self.keep_alive: list[Any] = []
+
+    def _emit(self, tag: int, payload: bytes = b"") -> int:
+        offset = len(self.out)
+        if offset > _MAX_OFFSET:
+            raise ValueError("The encoded collection graph exceeds the 4 GiB format limit.")
+
+        self.out.append(tag)
+        self.out += payload
+        return offset
+
+    def _refs(self, offsets: list[int]) -> bytes:
+        return struct.pack(f"<I{len(offsets)}I", len(offsets), *offsets)
+
+    def encode(self, value: Any) -> int:
+        """Encode a value (and everything it references) and return its offset."""
+        if type(value) is str:
+            # The most common scalar is keyed by itself, which no other key equals.
+            key: Any = value
+        elif isinstance(value, float):
+            # Keyed by representation so that 0.0 and -0.0 (or distinct NaNs) stay distinct.
+            key = (float, _F64.pack(value))
+        elif value is None or isinstance(value, (int, str, bytes)):
+            key = (type(value), value)
+        else:
+            return self._encode_container(value)
+
+        offset = self.scalars.get(key)
+        if offset is None:
+            offset = self._encode_scalar(value)
+            self.scalars[key] = offset
+        return offset
+
+    def _encode_scalar(self, value: Any) -> int:
+        # Tags and fixed size payloads are packed together, since encoding is dominated by the
+        # per value overhead.
+        out = self.out
+        offset = len(out)
+        if offset > _MAX_OFFSET:
+            raise ValueError("The encoded collection graph exceeds the 4 GiB format limit.")
+
+        if value is None:
+            out.append(_NONE)
+        elif isinstance(value, bool):
+            out.append(_TRUE if value else _FALSE)
+        elif isinstance(value, int):
+            if -(2**63) <= value < 2**63:
+                out += _TAGGED_I64.pack(_INT, value)
+            else:
+                raw = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+                out += _TAGGED_U32.pack(_BIG_INT, len(raw))
+                out += raw
+        elif isinstance(value, float):
+            out += _TAGGED_F64.pack(_FLOAT, value)
+        elif isinstance(value, str):
+            raw = value.encode("utf-8", "surrogatepass")
+            out += _TAGGED_U32.pack(_STR, len(raw))
+            out += raw
+        else:
+            out += _TAGGED_U32.pack(_BYTES, len(value))
+            out += value
+        return offset
+
+    def _encode_container(self, value: Any) -> int:
+        offset = self.containers.get(id(value))
+        if offset is not None:
+            return offset
+
+        kind = _deep.kind_of(value)
+        if kind is None:
+            # Other sequences, such as bytearray, are encoded as sequences of their elements.
+            if not isinstance(value, Sequence):
+                raise TypeError(f"Values of type {type(value)} cannot be encoded.")
+            kind = _deep.SEQUENCE
+
+        encode = self.encode
+        contents = _contents(value)
+        if kind in _deep.MAPPING_KINDS:
+            keys = [encode(k) for k in contents]
+            values = [encode(v) for v in contents.values()]
+            offset = self._emit(
+                _MAPPING, self._refs(keys) + struct.pack(f"<{len(values)}I", *values)
+            )
+        else:
+            offset = self._emit(
+                _SET if kind == _deep.SET else _SEQUENCE, self._refs([encode(v) for v in contents])
+            )
+
+        self.containers[id(value)] = offset
+        self.keep_alive.append(value)
+        return offset
+
+
+def encode(value: Any) -> bytearray:
+    """Encode a graph of collections and primitive values into the binary format.
+
+    Args:
+        value: The root value. Collections may be any Sequence, Set or Mapping (including the
+            optimized classes) and primitives may be None, bool, int, float, str or bytes.
+
+    Returns:
+        The encoded buffer.
+
+    Raises:
+        TypeError: If the graph contains a value which cannot be encoded.
+        ValueError: If the encoded graph exceeds the 4 GiB limit of the format.
+    """
+    encoder = _Encoder()
+    root = encoder.encode(value)
+    _HEADER.pack_into(encoder.out, 0, MAGIC, VERSION, 0, root)
+    return encoder.out
+
+
+def decode(buf: memoryview) -> Any:
+    """Open the root value of an encoded buffer.
+
+    Args:
+        buf: A byte formatted memoryview over the encoded buffer. The returned views keep a
+            reference to it.
+
+    Returns:
+        The root value: a primitive, or a view implementing Sequence, Set or Mapping.
+
+    Raises:
+        ValueError: If the buffer does not start with a valid header.
+    """
+    if len(buf) < _HEADER.size:
+        raise ValueError("The buffer is too small to hold an encoded collection graph.")
+
+    magic, version, _, root = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Unsupported encoding (magic {magic!r}, version {version}).")
+
+    return _load(buf, root, {})
+
+
+def _load(buf: memoryview, offset: int, indexes: dict[int, Any]) -> Any:
+    """Decode the value stored at an offset, creating a view for collections.
+
+    Args:
+        buf: The encoded buffer.
+        offset: The offset of the value's tag.
+        indexes: The key indexes of the set and mapping views of the graph, by offset.
+
+    Returns:
+        The decoded primitive or a lazily decoding view.
+    """
+    tag = buf[offset]
+    start = offset + 1
+    if tag == _NONE:
+        return None
+    if tag == _FALSE:
+        return False
+    if tag == _TRUE:
+        return True
+    if tag == _INT:
+        return _I64.unpack_from(buf, start)[0]
+    if tag == _FLOAT:
+        return _F64.unpack_from(buf, start)[0]
+    if tag in (_STR, _BYTES, _BIG_INT):
+        (length,) = _U32.unpack_from(buf, start)
+        raw = buf[start + 4 : start + 4 + length]
+        if tag == _STR:
+            return str(raw, "utf-8", "surrogatepass")
+        if tag == _BYTES:
+            return bytes(raw)
+        return int.from_bytes(raw, "little", signed=True)
+    if tag == _SEQUENCE:
+        return BufferSequence(buf, start, indexes)
+    if tag == _SET:
+        return BufferSet(buf, start, indexes)
+    if tag == _MAPPING:
+        return BufferMapping(buf, start, indexes)
+    raise ValueError(f"Unknown tag {tag} at offset {offset}.")
+
+
+def _load_key(buf: memoryview, offset: int, indexes: dict[int, Any]) -> Any:
+    """Decode a mapping key or set element, which must be hashable.
+
+    Sequences are decoded as tuples and sets as frozensets, eagerly and recursively, since views are
+    neither hashable nor equal to the tuples and frozensets they were encoded from.
+
+    Args:
+        buf: The encoded buffer.
+        offset: The offset of the value's tag.
+        indexes: The key indexes of the graph (see _load).
+
+    Returns:
+        The decoded primitive, tuple or frozenset.
+    """
+    tag = buf[offset]
+    if tag not in (_SEQUENCE, _SET):
+        return _load(buf, offset, indexes)
+
+    start = offset + 1
+    (count,) = _U32.unpack_from(buf, start)
+    offsets = struct.unpack_from(f"<{count}I", buf, start + 4)
+    elements = (_load_key(buf, element, indexes) for element in offsets)
+    return tuple(elements) if tag == _SEQUENCE else frozenset(elements)
+
+
+class _BufferView:
+    """Common state of the views: the buffer, the shared indexes, the count offset and the count."""
+
+    __slots__ = ("_buf", "_indexes", "_start", "_count")
+
+    def __init__(self, buf: memoryview, start: int, indexes: dict[int, Any]) -> None:
+        self._buf = buf
+        self._indexes = indexes
+        self._start = start
+        self._count = _U32.unpack_from(buf, start)[0]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _element(self, i: int) -> Any:
+        """Decode the element referenced by the i-th offset after the count."""
+        (offset,) = _U32.unpack_from(self._buf, self._start + 4 + 4 * i)
+        return _load(self._buf, offset, self._indexes)
+
+    def _key(self, i: int) -> Any:
+        """Decode the i-th offset after the count as a mapping key or set element."""
+        (offset,) = _U32.unpack_from(self._buf, self._start + 4 + 4 * i)
+        return _load_key(self._buf, offset, self._indexes)
+
+
+class BufferSequence(_BufferView, Sequence):
+    """Sequence view over an encoded sequence. Elements are decoded on access."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        match key:
+            case int():
+                adjusted = key if key >= 0 else self._count + key
+                if adjusted < 0 or adjusted >= self._count:
+                    raise IndexError(f"{key} is outside of the expected bounds.")
+                return self._element(adjusted)
+            case slice():
+                return [self._element(i) for i in range(*key.indices(self._count))]
+            case _:
+                raise TypeError(f"Sequence accessors must be integers or slices, not {type(key)}")
+
+    def __iter__(self) -> Iterator:
+        for i in range(self._count):
+            yield self._element(i)
+
+    def __repr__(self) -> str:
+        return f"[{", ".join(repr(v) for v in self)}]"
+
+
+class BufferSet(_BufferView, Set):
+    """Set view over an encoded set.
+
+    Membership is tested by a linear scan over the elements of small sets, and through a frozenset
+    of the elements built on the first test for larger ones.
+    """
+
+    __slots__ = ()
+
+    def __contains__(self, value) -> bool:
+        index = self._indexes.get(self._start)
+        if index is None:
+            if self._count < _INDEX_MIN_COUNT:
+                return any(v == value for v in self)
+            index = self._indexes[self._start] = frozenset(self)
+        return value in index
+
+    def __iter__(self) -> Iterator:
+        for i in range(self._count):
+            yield self._key(i)
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return set(it)
+
+    def __repr__(self) -> str:
+        if self._count == 0:
+            return "set()"
+        return f"{{{", ".join(repr(v) for v in self)}}}"
+
+
+class BufferMapping(_BufferView, Mapping):
+    """Mapping view over an encoded mapping.
+
+    Keys are located by a linear scan in small mappings, and through a dict from every key to its
+    position built on the first lookup in larger ones.
+    """
+
+    __slots__ = ()
+
+    def _value(self, i: int) -> Any:
+        return self._element(self._count + i)
+
+    def __getitem__(self, key):
+        index = self._indexes.get(self._start)
+        if index is None:
+            if self._count < _INDEX_MIN_COUNT:
+                for i in range(self._count):
+                    if self._key(i) == key:
+                        return self._value(i)
+                raise KeyError(key)
+            index = self._indexes[self._start] = {k: i for i, k in enumerate(self)}
+
+        try:
+            return self._value(index[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator:
+        for i in range(self._count):
+            yield self._key(i)
+
+    def _iter_items(self) -> Iterator:
+        for i in range(self._count):
+            yield (self._key(i), self._value(i))
+
+    def items(self):
+        return _SlotItemsView(self)
+
+    def __repr__(self) -> str:
+        items = [f"{repr(k)}: {repr(v)}" for k, v in self._iter_items()]
+        return f"{{{", ".join(items)}}}"
@@ -0,0 +1,687 @@
+"""Metaclasses for generating optimized versions of the types of the collections module.
+
+Counter, defaultdict and OrderedDict are generated on top of the mutable mappings of _mapping, with
+the same interleaved key and value slots, and overflow to an instance of the builtin type instead of
+a dict. deque is generated with one slot per element, and overflows to a builtin deque. Every class
+keeps the API of the type it replaces (such as most_common, default_factory or popleft), but is not
+an instance of it.
+
+Settings of the replaced types which outlive overflow (default_factory and maxlen) are stored in an
+additional last slot, so the element slots stay the leading ones.
+"""
+
+from collections import Counter, OrderedDict, defaultdict, deque
+from collections.abc import Callable, Iterable, Mapping, MutableMapping, MutableSequence, Sequence
+from itertools import chain, repeat, starmap
+from operator import add, and_, itemgetter, or_, sub
+from typing import Any, Optional
+
+from opticol._mapping import (
+    _add_mut_mapping_methods,
+    _add_mut_mapping_overflow_methods,
+    _mut_mapping_assign,
+    _pair_slot_names,
+    OptimizedMutableMappingMeta,
+)
+from opticol._meta import OptimizedCollectionMeta
+from opticol._sentinel import END
+from opticol._sequence import _adjust_index, _mut_assign
+
+_MARKER = object()
+
+
+def _new_counter(_: Any, pairs: Mapping | Iterable[tuple[Any, Any]]) -> Counter:
+    """Create the overflow Counter of a counter, copying the counts instead of counting pairs."""
+    counter: Counter = Counter()
+    dict.update(counter, pairs)
+    return counter
+
+
+def _new_default_dict(inst: Any, pairs: Mapping | Iterable[tuple[Any, Any]]) -> defaultdict:
+    """Create the overflow defaultdict of a defaultdict with the default factory of the instance."""
+    return defaultdict(inst._default_factory, pairs)
+
+
+def _new_ordered_dict(_: Any, pairs: Mapping | Iterable[tuple[Any, Any]]) -> OrderedDict:
+    """Create the overflow OrderedDict of an ordered dict."""
+    return OrderedDict(pairs)
+
+
+def _add_missing_methods(
+    slots: Sequence[str], namespace: dict[str, Any], missing: Callable[[Any, Any], Any]
+) -> None:
+    """Route the lookups of missing keys of a slot mapping through a __missing__ method.
+
+    The Mapping mixins get, __contains__, pop and setdefault rely on __getitem__ raising KeyError,
+    so they are replaced by versions which use the lookup of the mapping directly.
+
+    Args:
+        slots: Interleaved key and value slot names.
+        namespace: Class namespace dict holding the methods of a mutable slot mapping.
+        missing: The __missing__ method, called with the instance and a key which is not found.
+    """
+    pair_slots = tuple(zip(slots[0::2], slots[1::2]))
+    lookup = namespace["__getitem__"]
+
+    def __getitem__(self, key):
+        for key_slot, val_slot in pair_slots:
+            k = getattr(self, key_slot)
+            if k is END:
+                break
+
+            if k == key:
+                return getattr(self, val_slot)
+
+        return missing(self, key)
+
+    def __contains__(self, key):
+        try:
+            lookup(self, key)
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return lookup(self, key)
+        except KeyError:
+            return default
+
+    def pop(self, key, default=_MARKER):
+        try:
+            value = lookup(self, key)
+        except KeyError:
+            if default is _MARKER:
+                raise
+            return default
+
+        del self[key]
+        return value
+
+    def setdefault(self, key, default=None):
+        try:
+            return lookup(self, key)
+        except KeyError:
+            self[key] = default
+            return default
+
+    namespace["__getitem__"] = __getitem__
+    namespace["__missing__"] = missing
+    namespace["__contains__"] = __contains__
+    namespace["get"] = get
+    namespace["pop"] = pop
+    namespace["setdefault"] = setdefault
+
+
+def _add_missing_overflow_methods(data_slot: str, namespace: dict[str, Any]) -> None:
+    """Add setdefault to an overflow class, whose builtin mapping handles missing keys itself."""
+
+    def setdefault(self, key, default=None):
+        return getattr(self, data_slot).setdefault(key, default)
+
+    namespace["setdefault"] = setdefault
+
+
+def _counter_operator(op: Callable[[Counter, Counter], Counter], reflected: bool) -> Callable:
+    """Create a binary operator of a counter, which computes a builtin Counter."""
+
+    def method(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+
+        counter = self._counter()
+        other = other if isinstance(other, Counter) else _new_counter(None, other.items())
+        return op(other, counter) if reflected else op(counter, other)
+
+    return method
+
+
+class OptimizedCounterMeta(OptimizedMutableMappingMeta):
+    """Metaclass for generating overflow-capable Counter implementations.
+
+    Counts are stored in the key and value slots of a mutable mapping, and the instance overflows to
+    a builtin Counter. Missing keys count as zero without being inserted, and most_common, total,
+    elements, update, subtract, copy and equality behave like the Counter methods. The arithmetic
+    operators return builtin Counters.
+    """
+
+    shared_mutators: tuple[str, ...] = ()
+
+    @staticmethod
+    def add_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableMapping], MutableMapping]],
+    ) -> None:
+        _add_mut_mapping_methods(slots, namespace, False, _new_counter)
+        _assign = _mut_mapping_assign(slots, False)
+
+        def __missing__(_, __):
+            return 0
+
+        _add_missing_methods(slots, namespace, __missing__)
+        delitem = namespace["__delitem__"]
+
+        def __delitem__(self, key):
+            if key in self:
+                delitem(self, key)
+
+        def _counter(self):
+            return _new_counter(self, self._iter_items())
+
+        def most_common(self, n=None):
+            ranked = sorted(self._iter_items(), key=itemgetter(1), reverse=True)
+            return ranked if n is None else ranked[: max(n, 0)]
+
+        def total(self):
+            return sum(v for _, v in self._iter_items())
+
+        def elements(self):
+            return chain.from_iterable(starmap(repeat, self._iter_items()))
+
+        def update(self, iterable=None, /, **kwds):
+            current = self._counter()
+            current.update(iterable, **kwds)
+            _assign(self, current)
+
+        def subtract(self, iterable=None, /, **kwds):
+            current = self._counter()
+            current.subtract(iterable, **kwds)
+            _assign(self, current)
+
+        def copy(self):
+            inst = object.__new__(self._slot_cls)
+            _assign(inst, self._counter())
+            return inst
+
+        def __pos__(self):
+            return +self._counter()
+
+        def __neg__(self):
+            return -self._counter()
+
+        def __eq__(self, other):
+            # Like Counter, missing elements count as zero when comparing with another counter.
+            if isinstance(other, Counter) or isinstance(type(other), OptimizedCounterMeta):
+                return all(self[e] == other[e] for c in (self, other) for e in c)
+            return Mapping.__eq__(self, other)
+
+        def __repr__(self):
+            return repr(self._counter())
+
+        namespace["__delitem__"] = __delitem__
+        namespace["_counter"] = _counter
+        namespace["most_common"] = most_common
+        namespace["total"] = total
+        namespace["elements"] = elements
+        namespace["update"] = update
+        namespace["subtract"] = subtract
+        namespace["copy"] = copy
+        namespace["__pos__"] = __pos__
+        namespace["__neg__"] = __neg__
+        namespace["__eq__"] = __eq__
+        namespace["__repr__"] = __repr__
+        for name, op in (("add", add), ("sub", sub), ("or", or_), ("and", and_)):
+            namespace[f"__{name}__"] = _counter_operator(op, False)
+            namespace[f"__r{name}__"] = _counter_operator(op, True)
+
+    @staticmethod
+    def add_overflow_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableMapping], MutableMapping]],
+    ) -> None:
+        _add_mut_mapping_overflow_methods(slots, namespace, False)
+        _add_missing_overflow_methods(slots[0], namespace)
+        data_slot = slots[0]
+
+        def _counter(self):
+            return getattr(self, data_slot).copy()
+
+        def most_common(self, n=None):
+            return getattr(self, data_slot).most_common(n)
+
+        def total(self):
+            return getattr(self, data_slot).total()
+
+        def elements(self):
+            return getattr(self, data_slot).elements()
+
+        def update(self, iterable=None, /, **kwds):
+            getattr(self, data_slot).update(iterable, **kwds)
+
+        def subtract(self, iterable=None, /, **kwds):
+            getattr(self, data_slot).subtract(iterable, **kwds)
+
+        namespace["_counter"] = _counter
+        namespace["most_common"] = most_common
+        namespace["total"] = total
+        namespace["elements"] = elements
+        namespace["update"] = update
+        namespace["subtract"] = subtract
+
+
+class OptimizedDefaultDictMeta(OptimizedMutableMappingMeta):
+    """Metaclass for generating overflow-capable defaultdict implementations.
+
+    Pairs are stored in the key and value slots of a mutable mapping, followed by a slot holding the
+    default factory, and the instance overflows to a builtin defaultdict. Looking up a missing key
+    inserts the result of the default factory, while get, in, pop and setdefault do not.
+    """
+
+    shared_mutators: tuple[str, ...] = ()
+
+    @staticmethod
+    def slot_names(internal_size: int) -> tuple[str, ...]:
+        return _pair_slot_names(internal_size) + ("_default_factory",)
+
+    @staticmethod
+    def add_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableMapping], MutableMapping]],
+    ) -> None:
+        pair_slots = slots[:-1]
+        _add_mut_mapping_methods(pair_slots, namespace, False, _new_default_dict)
+        # The constructor of the pairs would leave the default factory unset.
+        del namespace["_make"]
+        init = namespace["__init__"]
+        repr_pairs = namespace["__repr__"]
+
+        def __init__(self, mapping, default_factory=None):
+            if default_factory is None:
+                default_factory = getattr(mapping, "default_factory", None)
+            self._default_factory = default_factory
+            init(self, mapping)
+
+        def __missing__(self, key):
+            factory = self._default_factory
+            if factory is None:
+                raise KeyError(key)
+
+            value = self[key] = factory()
+            return value
+
+        _add_missing_methods(pair_slots, namespace, __missing__)
+
+        def _get_default_factory(self):
+            return self._default_factory
+
+        def _set_default_factory(self, default_factory):
+            self._default_factory = default_factory
+            if type(self) is not self._slot_cls:
+                getattr(self, pair_slots[0]).default_factory = default_factory
+
+        def copy(self):
+            return self._slot_cls(self, self._default_factory)
+
+        def __repr__(self):
+            return f"defaultdict({self._default_factory!r}, {repr_pairs(self)})"
+
+        namespace["__init__"] = __init__
+        namespace["default_factory"] = property(_get_default_factory, _set_default_factory)
+        namespace["copy"] = copy
+        namespace["__repr__"] = __repr__
+
+    @staticmethod
+    def add_overflow_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableMapping], MutableMapping]],
+    ) -> None:
+        _add_mut_mapping_overflow_methods(slots[:-1], namespace, False)
+        _add_missing_overflow_methods(slots[0], namespace)
+
+
+class OptimizedOrderedDictMeta(OptimizedMutableMappingMeta):
+    """Metaclass for generating overflow-capable OrderedDict implementations.
+
+    The pairs of a mutable slot mapping already keep their insertion order, so the classes add
+    move_to_end, popitem with a last argument, reversed iteration and order sensitive equality with
+    other ordered dicts. The instance overflows to a builtin OrderedDict.
+    """
+
+    shared_mutators: tuple[str, ...] = ()
+
+    @staticmethod
+    def add_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableMapping], MutableMapping]],
+    ) -> None:
+        _add_mut_mapping_methods(slots, namespace, False, _new_ordered_dict)
+
+        def move_to_end(self, key, last=True):
+            pairs = list(self._iter_items())
+            for i, (k, _) in enumerate(pairs):
+                if k == key:
+                    pair = pairs.pop(i)
+                    break
+            else:
+                raise KeyError(key)
+
+            if last:
+                pairs.append(pair)
+            else:
+                pairs.insert(0, pair)
+            OptimizedCollectionMeta._store_slots(self, slots, chain.from_iterable(pairs), END)
+
+        def popitem(self, last=True):
+            if not len(self):
+                raise KeyError("dictionary is empty")
+
+            key = next(reversed(self)) if last else next(iter(self))
+            value = self[key]
+            del self[key]
+            return key, value
+
+        def __reversed__(self):
+            return reversed(list(self))
+
+        def __eq__(self, other):
+            if isinstance(other, OrderedDict) or isinstance(type(other), OptimizedOrderedDictMeta):
+                return list(self.items()) == list(other.items())
+            return Mapping.__eq__(self, other)
+
+        def copy(self):
+            return self._slot_cls(self)
+
+        def __repr__(self):
+            return repr(OrderedDict(self._iter_items()))
+
+        namespace["move_to_end"] = move_to_end
+        namespace["popitem"] = popitem
+        namespace["__reversed__"] = __reversed__
+        namespace["__eq__"] = __eq__
+        namespace["copy"] = copy
+        namespace["__repr__"] = __repr__
+
+    @staticmethod
+    def add_overflow_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableMapping], MutableMapping]],
+    ) -> None:
+        _add_mut_mapping_overflow_methods(slots, namespace, False)
+        data_slot = slots[0]
+
+        def move_to_end(self, key, last=True):
+            getattr(self, data_slot).move_to_end(key, last)
+
+        def __reversed__(self):
+            return reversed(getattr(self, data_slot))
+
+        namespace["move_to_end"] = move_to_end
+        namespace["__reversed__"] = __reversed__
+
+
+class OptimizedDequeMeta(OptimizedCollectionMeta[MutableSequence]):
+    """Metaclass for generating overflow-capable deque implementations.
+
+    Elements occupy the leading slots, followed by a slot holding maxlen, and the instance overflows
+    to a builtin deque. append, appendleft, pop and popleft work on the slots directly. append and
+    pop take constant time, but appendleft and popleft shift every element, so they take
+    O(internal_size) time rather than the O(1) of a builtin deque. The other updates go through a
+    temporary deque. Indexing accepts integers only, as for deque.
+    """
+
+    def __new__(
+        mcs,
+        name: str,
+        bases: tuple[type, ...],
+        namespace: dict[str, Any],
+        *,
+        internal_size: int,
+    ) -> type:
+        return super().__new__(
+            mcs,
+            name,
+            bases,
+            namespace,
+            internal_size=internal_size or 1,
+            project=None,
+            collection_name="deque",
+        )
+
+    @staticmethod
+    def slot_names(internal_size: int) -> tuple[str, ...]:
+        return OptimizedCollectionMeta.slot_names(internal_size) + ("_maxlen",)
+
+    @staticmethod
+    def add_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableSequence], MutableSequence]],
+    ) -> None:
+        item_slots = slots[:-1]
+        internal_size = len(item_slots)
+        slot_values = OptimizedCollectionMeta._slot_values(item_slots)
+        _assign = _mut_assign(item_slots)
+
+        def _index(self, index):
+            if not isinstance(index, int):
+                raise TypeError(f"sequence index must be integer, not '{type(index).__name__}'")
+            return _adjust_index(index, len(self))
+
+        def _rebuilt(self):
+            return deque(self, self._maxlen)
+
+        def _fits(self, n):
+            maxlen = self._maxlen
+            return n < internal_size and (maxlen is None or n < maxlen)
+
+        def __init__(self, iterable=(), maxlen=None):
+            if maxlen is None:
+                maxlen = getattr(iterable, "maxlen", None)
+            self._maxlen = maxlen
+            _assign(self, deque(iterable, maxlen))
+
+        def __getitem__(self, index):
+            return getattr(self, item_slots[_index(self, index)])
+
+        def __setitem__(self, index, value):
+            setattr(self, item_slots[_index(self, index)], value)
+
+        def __delitem__(self, index):
+            current = _rebuilt(self)
+            del current[index]
+            _assign(self, current)
+
+        def __iter__(self):
+            return OptimizedCollectionMeta._slot_iter(self, item_slots, END)
+
+        def __reversed__(self):
+            return reversed(slot_values(self)[: len(self)])
+
+        def __len__(self):
+            return OptimizedCollectionMeta._slot_len(self, item_slots, END)
+
+        def insert(self, index, value):
+            current = _rebuilt(self)
+            current.insert(index, value)
+            _assign(self, current)
+
+        def append(self, value):
+            n = len(self)
+            if _fits(self, n):
+                setattr(self, item_slots[n], value)
+            else:
+                current = _rebuilt(self)
+                current.append(value)
+                _assign(self, current)
+
+        def appendleft(self, value):
+            n = len(self)
+            if _fits(self, n):
+                for i in range(n, 0, -1):
+                    setattr(self, item_slots[i], getattr(self, item_slots[i - 1]))
+                setattr(self, item_slots[0], value)
+            else:
+                current = _rebuilt(self)
+                current.appendleft(value)
+                _assign(self, current)
+
+        def pop(self):
+            n = len(self)
+            if n == 0:
+                raise IndexError("pop from an empty deque")
+
+            value = getattr(self, item_slots[n - 1])
+            setattr(self, item_slots[n - 1], END)
+            return value
+
+        def popleft(self):
+            n = len(self)
+            if n == 0:
+                raise IndexError("pop from an empty deque")
+
+            value = getattr(self, item_slots[0])
+            for i in range(1, n):
+                setattr(self, item_slots[i - 1], getattr(self, item_slots[i]))
+            setattr(self, item_slots[n - 1], END)
+            return value
+
+        def extend(self, values):
+            current = _rebuilt(self)
+            current.extend(values)
+            _assign(self, current)
+
+        def extendleft(self, values):
+            current = _rebuilt(self)
+            current.extendleft(values)
+            _assign(self, current)
+
+        def rotate(self, n=1):
+            current = _rebuilt(self)
+            current.rotate(n)
+            _assign(self, current)
+
+        def clear(self):
+            OptimizedCollectionMeta._store_slots(self, item_slots, (), END)
+
+        def copy(self):
+            return self._slot_cls(self)
+
+        def _get_maxlen(self):
+            return self._maxlen
+
+        def __eq__(self, other):
+            if isinstance(other, deque) or isinstance(type(other), OptimizedDequeMeta):
+                return list(self) == list(other)
+            return NotImplemented
+
+        def __repr__(self):
+            return repr(_rebuilt(self))
+
+        namespace["__init__"] = __init__
+        namespace["__getitem__"] = __getitem__
+        namespace["__setitem__"] = __setitem__
+        namespace["__delitem__"] = __delitem__
+        namespace["__iter__"] = __iter__
+        namespace["__reversed__"] = __reversed__
+        namespace["__len__"] = __len__
+        namespace["insert"] = insert
+        namespace["append"] = append
+        namespace["appendleft"] = appendleft
+        namespace["pop"] = pop
+        namespace["popleft"] = popleft
+        namespace["extend"] = extend
+        namespace["extendleft"] = extendleft
+        namespace["rotate"] = rotate
+        namespace["clear"] = clear
+        namespace["copy"] = copy
+        namespace["maxlen"] = property(_get_maxlen)
+        namespace["__eq__"] = __eq__
+        namespace["__repr__"] = __repr__
+
+    @staticmethod
+    def add_overflow_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableSequence], MutableSequence]],
+    ) -> None:
+        item_slots = slots[:-1]
+        internal_size = len(item_slots)
+        data_slot = item_slots[0]
+        _assign = _mut_assign(item_slots)
+
+        def _shrunk(self, data):
+            if len(data) <= internal_size:
+                _assign(self, data)
+
+        def __getitem__(self, index):
+            return getattr(self, data_slot)[index]
+
+        def __setitem__(self, index, value):
+            getattr(self, data_slot)[index] = value
+
+        def __delitem__(self, index):
+            data = getattr(self, data_slot)
+            del data[index]
+            _shrunk(self, data)
+
+        def __contains__(self, value):
+            return value in getattr(self, data_slot)
+
+        def __iter__(self):
+            return iter(getattr(self, data_slot))
+
+        def __reversed__(self):
+            return reversed(getattr(self, data_slot))
+
+        def __len__(self):
+            return len(getattr(self, data_slot))
+
+        def insert(self, index, value):
+            getattr(self, data_slot).insert(index, value)
+
+        def append(self, value):
+            getattr(self, data_slot).append(value)
+
+        def appendleft(self, value):
+            getattr(self, data_slot).appendleft(value)
+
+        def pop(self):
+            data = getattr(self, data_slot)
+            value = data.pop()
+            _shrunk(self, data)
+            return value
+
+        def popleft(self):
+            data = getattr(self, data_slot)
+            value = data.popleft()
+            _shrunk(self, data)
+            return value
+
+        def remove(self, value):
+            data = getattr(self, data_slot)
+            data.remove(value)
+            _shrunk(self, data)
+
+        def extend(self, values):
+            # deque.extend only copies the deque itself, not this instance, so d.extend(d) would
+            # fail.
+            getattr(self, data_slot).extend(list(values) if values is self else values)
+
+        def extendleft(self, values):
+            getattr(self, data_slot).extendleft(list(values) if values is self else values)
+
+        def rotate(self, n=1):
+            getattr(self, data_slot).rotate(n)
+
+        namespace["__getitem__"] = __getitem__
+        namespace["__setitem__"] = __setitem__
+        namespace["__delitem__"] = __delitem__
+        namespace["__contains__"] = __contains__
+        namespace["__iter__"] = __iter__
+        namespace["__reversed__"] = __reversed__
+        namespace["__len__"] = __len__
+        namespace["insert"] = insert
+        namespace["append"] = append
+        namespace["appendleft"] = appendleft
+        namespace["pop"] = pop
+        namespace["popleft"] = popleft
+        namespace["remove"] = remove
+        namespace["extend"] = extend
+        namespace["extendleft"] = extendleft
+        namespace["rotate"] = rotate
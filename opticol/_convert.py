@@ -0,0 +1,84 @@
+"""Readers of the contents of collections, straight from the slots of the generated classes.
+
+Iterating a generated class runs its __iter__ and __getitem__ methods one element at a time in
+Python. The converters of this module instead read every slot of an instance in a single C level
+call, hand over the builtin collection of an overflowed instance and the tuple of a tuple-backed
+set, and fall back to the public methods for other collections. They are shared by the JSON
+encoder, to_builtin and the binary encoding of opticol._codec.
+"""
+
+from collections.abc import Callable, Mapping, Sequence, Set
+from operator import attrgetter
+from typing import Any, Optional
+
+from opticol._mapping import OptimizedMappingMeta, OptimizedMutableMappingMeta
+from opticol._meta import OptimizedCollectionMeta
+from opticol._sequence import OptimizedMutableSequenceMeta, OptimizedSequenceMeta
+from opticol._set import OptimizedMutableSetMeta, OptimizedSetMeta
+from opticol._tuple import OptimizedTupleMappingMeta, OptimizedTupleSetMeta
+from opticol.persistent import PersistentMapping
+
+_ATOMIC_SEQUENCES = (str, bytes, bytearray, memoryview)
+
+
+def _zip_pairs(pairs: tuple) -> dict:
+    """Build a dict from interleaved key and value slot values."""
+    return dict(zip(pairs[0::2], pairs[1::2]))
+
+
+def _slot_converter(cls: type) -> Optional[Callable[[Any], Any]]:
+    """Create the converter of a generated class, reading its slots directly."""
+    if isinstance(cls, (OptimizedSequenceMeta, OptimizedSetMeta)):
+        return OptimizedCollectionMeta._slot_values(cls.__slots__)
+
+    if isinstance(cls, OptimizedMappingMeta):
+        slot_values = OptimizedCollectionMeta._slot_values(cls.__slots__)
+        return lambda inst: _zip_pairs(slot_values(inst))
+
+    if isinstance(cls, OptimizedTupleSetMeta):
+        return attrgetter("_items")
+
+    if isinstance(cls, OptimizedTupleMappingMeta):
+        return lambda inst: dict(zip(inst._keys, inst._values))
+
+    if not isinstance(
+        cls, (OptimizedMutableSequenceMeta, OptimizedMutableSetMeta, OptimizedMutableMappingMeta)
+    ):
+        return None
+
+    # Mutable collections use the leading slots, or hold a builtin collection in the first slot
+    # once they have overflowed (in the overflow class or its shared subclass).
+    slots = cls._slot_cls.__slots__
+    if cls is not cls._slot_cls:
+        data = attrgetter(slots[0])
+        if isinstance(cls, OptimizedMutableSetMeta):
+            return lambda inst: tuple(data(inst))
+        return data
+
+    slot_values = OptimizedCollectionMeta._slot_values(slots)
+    if isinstance(cls, OptimizedMutableMappingMeta):
+        return lambda inst: _zip_pairs(slot_values(inst)[: 2 * len(inst)])
+    return lambda inst: slot_values(inst)[: len(inst)]
+
+
+def converter(cls: type) -> Optional[Callable[[Any], Any]]:
+    """Create the converter of a type into a builtin dict, tuple or other collection.
+
+    Args:
+        cls: The type of the values to convert.
+
+    Returns:
+        A function returning a dict for mappings and a collection of the elements for other
+        collections (which the json module encodes natively), or None if cls is not a collection.
+    """
+    slot_converter = _slot_converter(cls)
+    if slot_converter is not None:
+        return slot_converter
+
+    if issubclass(cls, PersistentMapping):
+        return lambda inst: dict(inst._iter_items())
+    if issubclass(cls, Mapping):
+        return lambda inst: dict(inst.items())
+    if issubclass(cls, (Set, Sequence)) and not issubclass(cls, _ATOMIC_SEQUENCES):
+        return tuple
+    return None
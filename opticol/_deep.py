@@ -0,0 +1,281 @@
+"""Deep projection of nested collection graphs in resumable steps.
+
+The Projector methods only project a single collection. This module walks a whole graph of nested
+collections (such as a decoded JSON payload) and projects every collection in it, children first.
+The walk is written as a generator which yields after every chunk of projected collections, so the
+same code drives both the synchronous Projector.project and the cooperative Projector.aproject,
+which yields to the event loop whenever its time budget is spent.
+"""
+
+from collections import Counter, OrderedDict, defaultdict, deque
+from collections.abc import Callable, Generator, Iterable, Mapping, Sequence, Set
+from operator import is_not
+import time
+from typing import Any
+
+_CHUNK_SIZE = 64
+"""The number of collections projected between two yields of the walk."""
+
+_ATOMIC_SEQUENCES = (str, bytes, bytearray, memoryview)
+
+MAPPING = 0
+SET = 1
+SEQUENCE = 2
+COUNTER = 3
+DEFAULT_DICT = 4
+ORDERED_DICT = 5
+DEQUE = 6
+
+MAPPING_KINDS = frozenset((MAPPING, COUNTER, DEFAULT_DICT, ORDERED_DICT))
+"""The kinds whose values are children, and whose keys are left unchanged."""
+
+SEQUENCE_KINDS = frozenset((SEQUENCE, DEQUE))
+"""The kinds whose elements are children."""
+
+# The types of the collections module keep their own semantics (missing keys, default factories,
+# order and appends at both ends), so they are routed to their own projector methods. Subclasses
+# are classified with them, before the collection ABCs.
+_COLLECTIONS_KINDS = (
+    (Counter, COUNTER),
+    (defaultdict, DEFAULT_DICT),
+    (OrderedDict, ORDERED_DICT),
+    (deque, DEQUE),
+)
+
+_BUILTIN_KINDS: dict[type, int | None] = {
+    dict: MAPPING,
+    set: SET,
+    frozenset: SET,
+    list: SEQUENCE,
+    tuple: SEQUENCE,
+    Counter: COUNTER,
+    defaultdict: DEFAULT_DICT,
+    OrderedDict: ORDERED_DICT,
+    deque: DEQUE,
+    str: None,
+    int: None,
+    float: None,
+    bool: None,
+    type(None): None,
+}
+"""The kinds of the common builtin types, which are always cached."""
+
+_MAX_KINDS = 1024
+"""The number of types cached by kind_of before its cache is reset.
+
+Bounding the cache keeps it from holding every class created dynamically (such as classes created
+per request) alive forever.
+"""
+
+_KINDS = dict(_BUILTIN_KINDS)
+"""
+The kind of every type classified so far, since checks against the collection ABCs are slow.
+"""
+
+_IMMUTABLE_BUILTINS = (tuple, frozenset)
+"""The builtin collection types which deep projection keeps, since they cannot be changed."""
+
+
+def kind_of(value: Any) -> int | None:
+    """Classify a value as one of the projected collection kinds, or None for leaves."""
+    cls = type(value)
+    try:
+        return _KINDS[cls]
+    except KeyError:
+        pass
+
+    kind = next((k for base, k in _COLLECTIONS_KINDS if isinstance(value, base)), None)
+    if kind is None:
+        if isinstance(value, Mapping):
+            kind = MAPPING
+        elif isinstance(value, Set):
+            kind = SET
+        elif isinstance(value, Sequence) and not isinstance(value, _ATOMIC_SEQUENCES):
+            kind = SEQUENCE
+    if len(_KINDS) >= _MAX_KINDS:
+        _KINDS.clear()
+        _KINDS.update(_BUILTIN_KINDS)
+    _KINDS[cls] = kind
+    return kind
+
+
+def extra_of(value: Any, kind: int) -> Any:
+    """Read the setting of a collection which rebuild needs besides its contents, if any."""
+    if kind == DEFAULT_DICT:
+        return value.default_factory
+    if kind == DEQUE:
+        return value.maxlen
+    return None
+
+
+def rebuild(kind: int, contents: Any, extra: Any = None) -> Any:
+    """Create the builtin collection passed to the projector method of a kind.
+
+    Args:
+        kind: The kind of the collection.
+        contents: A dict of the pairs of the mapping kinds, a list of the elements of the sequence
+            kinds, or an iterable of the elements of a set.
+        extra: The setting returned by extra_of for the collection.
+
+    Returns:
+        A new dict, set, list, Counter, defaultdict, OrderedDict or deque.
+    """
+    if kind == MAPPING:
+        return contents
+    if kind == SET:
+        return set(contents)
+    if kind == SEQUENCE:
+        return contents
+    if kind == COUNTER:
+        return Counter(contents)
+    if kind == DEFAULT_DICT:
+        return defaultdict(extra, contents)
+    if kind == ORDERED_DICT:
+        return OrderedDict(contents)
+    return deque(contents, extra)
+
+
+def projectors_of(projector: Any, mutable: bool) -> tuple[Callable[[Any], Any], ...]:
+    """Collect the projection method of every kind of a projector, indexed by the kind.
+
+    Args:
+        projector: The Projector whose methods are collected.
+        mutable: Flag if the mutable projection methods should be used. The types of the
+            collections module are mutable, so they use their own methods either way.
+
+    Returns:
+        The projection methods, for project_steps.
+    """
+    special = (projector.counter, projector.default_dict, projector.ordered_dict, projector.deque)
+    if mutable:
+        return (projector.mut_mapping, projector.mut_set, projector.mut_seq, *special)
+    return (projector.mapping, projector.set, projector.seq, *special)
+
+
+def children(value: Any, kind: int) -> Iterable[Any]:
+    """List the children of a collection which are projected.
+
+    Mapping keys and set elements are left as they are, since they must stay hashable.
+    """
+    if kind in MAPPING_KINDS:
+        return value.values()
+    if kind in SEQUENCE_KINDS:
+        return value
+    return ()
+
+
+def project_steps(
+    projectors: tuple[Callable[[Any], Any], ...],
+    value: Any,
+) -> Generator[None, None, Any]:
+    """Deeply project a value, yielding after every chunk of projected collections.
+
+    Every Mapping, Set and Sequence (other than str and bytes types) in the graph is rebuilt as a
+    builtin collection of its kind holding the projected children (see rebuild), and then projected.
+    Tuples and frozensets are rebuilt as tuples and frozensets, or passed as they are if none of
+    their children changed. A collection whose children did not change, and whose projection
+    returns the rebuilt collection unchanged (such as a collection outside the size range of a
+    router), is kept as it is. Collections are memoized by identity, so a collection referenced
+    several times is projected once and the projected graph keeps the sharing of the original.
+
+    Args:
+        projectors: The projection function of every kind, indexed by the kind.
+        value: The root of the graph.
+
+    Returns:
+        The projected root, as the value of the StopIteration ending the generator.
+
+    Raises:
+        ValueError: If the graph contains a cycle.
+    """
+    # Maps the id of every original collection to its projection. The originals are referenced by
+    # the graph during the whole walk, so ids stay unique.
+    memo: dict[int, Any] = {}
+    in_progress: set[int] = set()
+    stack: list[tuple[Any, int | None, bool]] = [(value, kind_of(value), False)]
+    projected = 0
+
+    while stack:
+        node, kind, expanded = stack.pop()
+        key = id(node)
+        if kind is None:
+            continue
+
+        if not expanded:
+            if key in memo:
+                continue
+            if key in in_progress:
+                raise ValueError("Cannot project a collection graph which contains a cycle.")
+
+            in_progress.add(key)
+            stack.append((node, kind, True))
+            stack.extend((child, kind_of(child), False) for child in children(node, kind))
+            continue
+
+        in_progress.discard(key)
+        if kind in MAPPING_KINDS:
+            contents: Any = {k: memo.get(id(v), v) for k, v in node.items()}
+            changed = any(map(is_not, contents.values(), node.values()))
+        elif kind == SET:
+            contents = node
+            changed = False
+        else:
+            contents = [memo.get(id(v), v) for v in node]
+            changed = any(map(is_not, contents, node))
+
+        cls = type(node)
+        if cls in _IMMUTABLE_BUILTINS:
+            rebuilt = cls(contents) if changed else node
+        else:
+            rebuilt = rebuild(kind, contents, extra_of(node, kind))
+        result = projectors[kind](rebuilt)
+        memo[key] = node if result is rebuilt and not changed else result
+
+        projected += 1
+        if projected % _CHUNK_SIZE == 0:
+            yield
+
+    return memo.get(id(value), value)
+
+
+def run(steps: Generator[None, None, Any]) -> Any:
+    """Run a deep projection to completion.
+
+    Args:
+        steps: The generator created by project_steps.
+
+    Returns:
+        The projected root.
+    """
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+async def arun(steps: Generator[None, None, Any], budget_ms: float) -> Any:
+    """Run a deep projection, yielding to the event loop whenever a time budget is spent.
+
+    Args:
+        steps: The generator created by project_steps.
+        budget_ms: The longest time in milliseconds to work without yielding to the event loop,
+            which may be exceeded by the time needed to project one chunk.
+
+    Returns:
+        The projected root.
+    """
+    # Imported here so that importing opticol does not import asyncio.
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    budget = budget_ms / 1000
+    deadline = time.perf_counter() + budget
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+        if time.perf_counter() >= deadline:
+            await asyncio.sleep(0)
+            deadline = time.perf_counter() + budget
@@ -0,0 +1,172 @@
+"""Metaclasses for generating optimized mappings keyed by a single Enum type.
+
+This module implements the metaclasses that generate Mapping and MutableMapping implementations for
+a fixed Enum key type. Every member of the Enum owns a dedicated slot selected by the member's
+ordinal, so lookups and assignments resolve to a single slot access. Absent keys are marked with the
+END sentinel.
+"""
+
+from collections.abc import Callable, Mapping, MutableMapping, Sequence
+from enum import Enum
+from typing import Any, Optional
+
+from opticol._meta import OptimizedCollectionMeta
+from opticol._sentinel import END
+
+
+def _member_slots(key_type: type[Enum], slots: Sequence[str]) -> dict[int, str]:
+    """Associate each member of the Enum with the slot at its ordinal.
+
+    Members are keyed by identity since Enum members are singletons, which also avoids the Python
+    level Enum.__hash__ on every lookup.
+
+    Args:
+        key_type: The Enum type whose members are the keys of the mapping.
+        slots: Slot names, one per member in definition order.
+
+    Returns:
+        A dict from the id of each member to the name of its slot.
+    """
+    return {id(member): slot for member, slot in zip(key_type, slots, strict=True)}
+
+
+class OptimizedEnumMappingMeta(OptimizedCollectionMeta[Mapping]):
+    """Metaclass for generating immutable Mapping implementations keyed by an Enum type.
+
+    Creates Mapping classes with one slot per member of the key type. Keys are matched by identity
+    against the members, so only members of the key type (not their values) can be found.
+    """
+
+    def __new__(
+        mcs,
+        name: str,
+        bases: tuple[type, ...],
+        namespace: dict[str, Any],
+        *,
+        key_type: type[Enum],
+    ) -> type:
+        namespace["key_type"] = key_type
+        return super().__new__(
+            mcs,
+            name,
+            bases,
+            namespace,
+            internal_size=len(key_type),
+            project=None,
+            collection_name="Mapping",
+        )
+
+    @staticmethod
+    def add_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[Mapping], Mapping]],
+    ) -> None:
+        key_type = namespace["key_type"]
+        members = tuple(key_type)
+        slot_for = _member_slots(key_type, slots)
+
+        def __init__(self, mapping):
+            for slot in slots:
+                setattr(self, slot, END)
+
+            for key, value in mapping.items():
+                slot = slot_for.get(id(key))
+                if slot is None:
+                    raise TypeError(f"{key!r} is not a member of {key_type.__name__}.")
+                setattr(self, slot, value)
+
+        def __getitem__(self, key):
+            slot = slot_for.get(id(key))
+            if slot is not None:
+                v = getattr(self, slot)
+                if v is not END:
+                    return v
+            raise KeyError(key)
+
+        def __contains__(self, key):
+            slot = slot_for.get(id(key))
+            return slot is not None and getattr(self, slot) is not END
+
+        def __iter__(self):
+            for member, slot in zip(members, slots):
+                if getattr(self, slot) is not END:
+                    yield member
+
+        def __len__(self):
+            count = 0
+            for slot in slots:
+                if getattr(self, slot) is not END:
+                    count += 1
+            return count
+
+        def __repr__(self):
+            items = [f"{repr(k)}: {repr(v)}" for k, v in self.items()]
+            return f"{{{", ".join(items)}}}"
+
+        namespace["__init__"] = __init__
+        namespace["_make"] = classmethod(OptimizedCollectionMeta._make_constructor(slots, END))
+        namespace["__getitem__"] = __getitem__
+        namespace["__contains__"] = __contains__
+        namespace["__iter__"] = __iter__
+        namespace["__len__"] = __len__
+        namespace["__repr__"] = __repr__
+
+
+class OptimizedEnumMutableMappingMeta(OptimizedCollectionMeta[MutableMapping]):
+    """Metaclass for generating MutableMapping implementations keyed by an Enum type.
+
+    Creates MutableMapping classes with one slot per member of the key type. Since the key space is
+    bounded by the Enum, the mapping never overflows: assignment and deletion write the member's
+    slot directly. Assigning a key which is not a member of the key type raises a TypeError.
+    """
+
+    def __new__(
+        mcs,
+        name: str,
+        bases: tuple[type, ...],
+        namespace: dict[str, Any],
+        *,
+        key_type: type[Enum],
+    ) -> type:
+        namespace["key_type"] = key_type
+        return super().__new__(
+            mcs,
+            name,
+            bases,
+            namespace,
+            internal_size=len(key_type),
+            project=None,
+            collection_name="MutableMapping",
+        )
+
+    @staticmethod
+    def add_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableMapping], MutableMapping]],
+    ) -> None:
+        OptimizedEnumMappingMeta.add_methods(slots, namespace, None)
+
+        key_type = namespace["key_type"]
+        slot_for = _member_slots(key_type, slots)
+
+        def __setitem__(self, key, value):
+            slot = slot_for.get(id(key))
+            if slot is None:
+                raise TypeError(f"{key!r} is not a member of {key_type.__name__}.")
+            setattr(self, slot, value)
+
+        def __delitem__(self, key):
+            slot = slot_for.get(id(key))
+            if slot is None or getattr(self, slot) is END:
+                raise KeyError(key)
+            setattr(self, slot, END)
+
+        def clear(self):
+            for slot in slots:
+                setattr(self, slot, END)
+
+        namespace["__setitem__"] = __setitem__
+        namespace["__delitem__"] = __delitem__
+        namespace["clear"] = clear
@@ -1,24 +1,369 @@
 """Metaclasses for generating optimized mapping types.
 
 This module implements the mapping-specific metaclasses that generate immutable Mapping and
-MutableMapping implementations with slot-based storage. Each key-value pair is stored as a tuple in
-an individual slot.
+MutableMapping implementations with slot-based storage. Each key and each value is stored in its own
+slot (_key0, _val0, _key1, _val1, etc.), so no per-pair tuple is allocated to hold an entry. Tuples
+are only built on demand when the items of a mapping are iterated.
+
+String keyed variants of both metaclasses intern str keys on the way in. Equal keys then share a
+single object across every instance, and lookups with interned keys (such as attribute-like names)
+are resolved by the identity check that str equality performs before comparing any characters.
 """
 
-from collections.abc import Callable, Mapping, MutableMapping, Sequence
-from itertools import zip_longest
-import operator
+from collections.abc import Callable, Iterable, Mapping, MutableMapping, Sequence
+from itertools import chain
+import sys
 from typing import Any, Optional
 
 from opticol._meta import OptimizedCollectionMeta
+from opticol._sentinel import END
+from opticol._views import _SlotItemsView, _SlotValuesView
+from opticol.persistent import updated_mapping
+
+
+def _intern_key(key: Any) -> Any:
+    """Intern a key if it is an exact str, otherwise return it unchanged.
+
+    Args:
+        key: The mapping key to intern.
+
+    Returns:
+        The interned str or the original key.
+    """
+    return sys.intern(key) if type(key) is str else key
+
+
+def _pair_slot_names(internal_size: int) -> tuple[str, ...]:
+    """Name the interleaved key and value slots for a mapping of the given size.
+
+    Args:
+        internal_size: The number of key-value pairs stored in slots.
+
+    Returns:
+        The slot names in storage order (_key0, _val0, _key1, _val1, etc.).
+    """
+    return tuple(name for i in range(internal_size) for name in (f"_key{i}", f"_val{i}"))
+
+
+def _make_constructor(slots: Sequence[str], intern_keys: bool, **fill: Any) -> Callable[..., Any]:
+    """Generate the _make constructor of a mapping class.
+
+    The arguments of the constructor are the interleaved keys and values (k0, v0, k1, v1, ...).
+
+    Args:
+        slots: Interleaved key and value slot names.
+        intern_keys: Flag if str keys should be interned.
+        fill: Optional fill keyword (see OptimizedCollectionMeta._make_constructor).
+
+    Returns:
+        The constructor function.
+    """
+    if not intern_keys:
+        return OptimizedCollectionMeta._make_constructor(slots, **fill)
+    return OptimizedCollectionMeta._make_constructor(
+        slots, convert=_intern_key, convert_slots=slots[0::2], **fill
+    )
+
+
+def _add_mapping_methods(
+    slots: Sequence[str],
+    namespace: dict[str, Any],
+    project: Optional[Callable[[Mapping], Mapping]],
+    intern_keys: bool,
+) -> None:
+    """Add the methods of a fixed-size immutable Mapping to the class namespace.
+
+    Args:
+        slots: Interleaved key and value slot names.
+        namespace: Class namespace dict to populate with methods.
+        project: Optional projection function for the results of persistent updates.
+        intern_keys: Flag if str keys should be interned when they are written into a slot.
+    """
+    key_slots = slots[0::2]
+    val_slots = slots[1::2]
+    pair_slots = tuple(zip(key_slots, val_slots))
+    internal_size = len(pair_slots)
+    slot_values = OptimizedCollectionMeta._slot_values(slots)
+
+    def __init__(self, mapping):
+        if len(mapping) != internal_size:
+            raise ValueError(
+                f"Expected provided Mapping to have exactly {internal_size} elements but it "
+                f"has {len(mapping)}."
+            )
+
+        for (key_slot, val_slot), (k, v) in zip(pair_slots, mapping.items(), strict=True):
+            setattr(self, key_slot, _intern_key(k) if intern_keys else k)
+            setattr(self, val_slot, v)
+
+    def __getitem__(self, key):
+        for key_slot, val_slot in pair_slots:
+            if getattr(self, key_slot) == key:
+                return getattr(self, val_slot)
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key_slot in key_slots:
+            yield getattr(self, key_slot)
+
+    def __len__(_):
+        return internal_size
+
+    def _iter_items(self):
+        for key_slot, val_slot in pair_slots:
+            yield (getattr(self, key_slot), getattr(self, val_slot))
+
+    def items(self):
+        return _SlotItemsView(self)
+
+    def values(self):
+        return _SlotValuesView(self)
+
+    def set(self, key, value):
+        pairs = slot_values(self)
+        for i in range(0, len(pairs), 2):
+            if pairs[i] == key:
+                # The keys are unchanged, so the result has the same class.
+                return self._make(*pairs[: i + 1], value, *pairs[i + 2 :])
+
+        mapping = dict(zip(pairs[0::2], pairs[1::2]))
+        mapping[key] = value
+        return updated_mapping(mapping, project)
+
+    def delete(self, key):
+        pairs = slot_values(self)
+        mapping = dict(zip(pairs[0::2], pairs[1::2]))
+        del mapping[key]
+        return updated_mapping(mapping, project)
+
+    def __repr__(self):
+        items = [f"{repr(k)}: {repr(v)}" for k, v in _iter_items(self)]
+        return f"{{{", ".join(items)}}}"
+
+    namespace["__init__"] = __init__
+    namespace["_make"] = classmethod(_make_constructor(slots, intern_keys))
+    namespace["__getitem__"] = __getitem__
+    namespace["__iter__"] = __iter__
+    namespace["__len__"] = __len__
+    namespace["_iter_items"] = _iter_items
+    namespace["items"] = items
+    namespace["values"] = values
+    namespace["set"] = set
+    namespace["delete"] = delete
+    namespace["__repr__"] = __repr__
+
+
+def _mut_mapping_assign(slots: Sequence[str], intern_keys: bool) -> Callable[[Any, Mapping], None]:
+    """Create the function storing the pairs of a mutable mapping.
+
+    Args:
+        slots: Interleaved key and value slot names.
+        intern_keys: Flag if str keys should be interned when they are written into a slot.
+
+    Returns:
+        A function storing a mapping, either in the slots or in the overflow class when it does not
+        fit. A dict which does not fit becomes owned by the instance.
+    """
+    internal_size = len(slots) // 2
+
+    def _assign(self, mapping):
+        if len(mapping) > internal_size:
+            OptimizedCollectionMeta._store_overflow(self, slots, mapping, END)
+            return
+
+        pairs = mapping.items()
+        if intern_keys:
+            pairs = ((_intern_key(k), v) for k, v in pairs)
+        OptimizedCollectionMeta._store_slots(self, slots, chain.from_iterable(pairs), END)
+
+    return _assign
+
+
+def _new_dict(_: Any, pairs: Mapping | Iterable[tuple[Any, Any]]) -> dict:
+    """Create the overflow dict of a mutable mapping (see _add_mut_mapping_methods)."""
+    return dict(pairs)
+
+
+def _add_mut_mapping_methods(
+    slots: Sequence[str],
+    namespace: dict[str, Any],
+    intern_keys: bool,
+    new_data: Callable[[Any, Mapping | Iterable[tuple[Any, Any]]], MutableMapping] = _new_dict,
+) -> None:
+    """Add the methods of an overflow-capable MutableMapping to the class namespace.
+
+    Used pairs occupy the leading key and value slots, and unused slots hold END. Once the mapping
+    overflows, the instance swaps to its overflow class (see _add_mut_mapping_overflow_methods).
+
+    Args:
+        slots: Interleaved key and value slot names.
+        namespace: Class namespace dict to populate with methods.
+        intern_keys: Flag if str keys should be interned when they are written into a slot.
+        new_data: Function creating the builtin mapping an instance overflows to from the instance
+            and a mapping or iterable of pairs.
+    """
+    key_slots = slots[0::2]
+    val_slots = slots[1::2]
+    pair_slots = tuple(zip(key_slots, val_slots))
+    internal_size = len(pair_slots)
+    _assign = _mut_mapping_assign(slots, intern_keys)
+
+    def _find(self, key):
+        for i, key_slot in enumerate(key_slots):
+            k = getattr(self, key_slot)
+            if k is END:
+                return -1, i
+            if k == key:
+                return i, i
+        return -1, internal_size
+
+    def __init__(self, mapping):
+        _assign(self, mapping if len(mapping) <= internal_size else new_data(self, mapping))
+
+    def __getitem__(self, key):
+        for key_slot, val_slot in pair_slots:
+            k = getattr(self, key_slot)
+            if k is END:
+                break
+
+            if k == key:
+                return getattr(self, val_slot)
+
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        index, free = _find(self, key)
+        if index >= 0:
+            setattr(self, val_slots[index], value)
+        elif free < internal_size:
+            setattr(self, key_slots[free], _intern_key(key) if intern_keys else key)
+            setattr(self, val_slots[free], value)
+        else:
+            current = new_data(self, _iter_items(self))
+            current[key] = value
+            _assign(self, current)
+
+    def __delitem__(self, key):
+        index, _ = _find(self, key)
+        if index < 0:
+            raise KeyError(key)
+
+        for i in range(index, internal_size - 1):
+            setattr(self, key_slots[i], getattr(self, key_slots[i + 1]))
+            setattr(self, val_slots[i], getattr(self, val_slots[i + 1]))
+        setattr(self, key_slots[-1], END)
+        setattr(self, val_slots[-1], END)
+
+    def __iter__(self):
+        return OptimizedCollectionMeta._slot_iter(self, key_slots, END)
+
+    def __len__(self):
+        return OptimizedCollectionMeta._slot_len(self, key_slots, END)
+
+    def _iter_items(self):
+        for key_slot, val_slot in pair_slots:
+            k = getattr(self, key_slot)
+            if k is END:
+                return
+            yield (k, getattr(self, val_slot))
+
+    def items(self):
+        return _SlotItemsView(self)
+
+    def values(self):
+        return _SlotValuesView(self)
+
+    def __repr__(self):
+        items = [f"{repr(k)}: {repr(v)}" for k, v in self._iter_items()]
+        return f"{{{", ".join(items)}}}"
+
+    namespace["__init__"] = __init__
+    namespace["_make"] = classmethod(_make_constructor(slots, intern_keys, fill=END))
+    namespace["__getitem__"] = __getitem__
+    namespace["__setitem__"] = __setitem__
+    namespace["__delitem__"] = __delitem__
+    namespace["__iter__"] = __iter__
+    namespace["__len__"] = __len__
+    namespace["_iter_items"] = _iter_items
+    namespace["items"] = items
+    namespace["values"] = values
+    namespace["__repr__"] = __repr__
+
+
+def _add_mut_mapping_overflow_methods(
+    slots: Sequence[str], namespace: dict[str, Any], intern_keys: bool
+) -> None:
+    """Add the methods of the overflow class of a MutableMapping to its namespace.
+
+    The overflow dict is stored in the first key slot, and every method delegates to it.
+
+    Args:
+        slots: Interleaved key and value slot names.
+        namespace: Overflow class namespace dict to populate with methods.
+        intern_keys: Flag if str keys should be interned when the mapping moves back into slots.
+    """
+    internal_size = len(slots) // 2
+    data_slot = slots[0]
+    _assign = _mut_mapping_assign(slots, intern_keys)
+
+    def _shrunk(self, data):
+        if len(data) <= internal_size:
+            _assign(self, data)
+
+    def __getitem__(self, key):
+        return getattr(self, data_slot)[key]
+
+    def get(self, key, default=None):
+        return getattr(self, data_slot).get(key, default)
+
+    def __contains__(self, key):
+        return key in getattr(self, data_slot)
+
+    def __setitem__(self, key, value):
+        getattr(self, data_slot)[key] = value
+
+    def __delitem__(self, key):
+        data = getattr(self, data_slot)
+        del data[key]
+        _shrunk(self, data)
+
+    def pop(self, key, *default):
+        data = getattr(self, data_slot)
+        value = data.pop(key, *default)
+        _shrunk(self, data)
+        return value
+
+    def clear(self):
+        _assign(self, {})
+
+    def __iter__(self):
+        return iter(getattr(self, data_slot))
+
+    def __len__(self):
+        return len(getattr(self, data_slot))
+
+    def _iter_items(self):
+        return iter(getattr(self, data_slot).items())
+
+    namespace["__getitem__"] = __getitem__
+    namespace["get"] = get
+    namespace["__contains__"] = __contains__
+    namespace["__setitem__"] = __setitem__
+    namespace["__delitem__"] = __delitem__
+    namespace["pop"] = pop
+    namespace["clear"] = clear
+    namespace["__iter__"] = __iter__
+    namespace["__len__"] = __len__
+    namespace["_iter_items"] = _iter_items
 
 
 class OptimizedMappingMeta(OptimizedCollectionMeta[Mapping]):
     """Metaclass for generating fixed-size immutable Mapping implementations.
 
     Creates Mapping classes that store exactly the specified number of key-value pairs in individual
-    slots. Each slot contains a (key, value) tuple. Lookups are performed by linear search through
-    the slots.
+    slots. Each key and each value has a dedicated slot. Lookups are performed by linear search
+    through the key slots. The persistent updates set and delete return a new mapping, which is
+    optionally optimized via the project parameter.
     """
 
     def __new__(
@@ -28,6 +373,7 @@ class OptimizedMappingMeta(OptimizedCollectionMeta[Mapping]):
         namespace: dict[str, Any],
         *,
         internal_size: int,
+        project: Optional[Callable[[Mapping], Mapping]] = None,
     ) -> type:
         return super().__new__(
             mcs,
@@ -35,52 +381,38 @@ class OptimizedMappingMeta(OptimizedCollectionMeta[Mapping]):
             bases,
             namespace,
             internal_size=internal_size,
-            project=None,
+            project=project,
             collection_name="Mapping",
         )
 
+    @staticmethod
+    def slot_names(internal_size: int) -> tuple[str, ...]:
+        return _pair_slot_names(internal_size)
+
     @staticmethod
     def add_methods(
         slots: Sequence[str],
         namespace: dict[str, Any],
-        _: Optional[Callable[[Mapping], Mapping]],
+        project: Optional[Callable[[Mapping], Mapping]],
     ) -> None:
-        internal_size = len(slots)
-
-        def __init__(self, mapping):
-            if len(mapping) != internal_size:
-                raise ValueError(
-                    f"Expected provided Mapping to have exactly {internal_size} elements but it "
-                    f"has {len(mapping)}."
-                )
-
-            for slot, t in zip(slots, mapping.items(), strict=True):
-                setattr(self, slot, t)
-
-        def __getitem__(self, key):
-            for slot in slots:
-                item = getattr(self, slot)
-                if item[0] == key:
-                    return item[1]
-            raise KeyError(key)
+        _add_mapping_methods(slots, namespace, project, False)
 
-        def __iter__(self):
-            yield from (getattr(self, slot)[0] for slot in slots)
 
-        def __len__(_):
-            return internal_size
+class OptimizedStrMappingMeta(OptimizedMappingMeta):
+    """Metaclass for generating fixed-size immutable Mapping implementations with str keys.
 
-        def __repr__(self):
-            items = [
-                f"{repr(getattr(self, slot)[0])}: {repr(getattr(self, slot)[1])}" for slot in slots
-            ]
-            return f"{{{", ".join(items)}}}"
+    Behaves like OptimizedMappingMeta, but str keys are interned at construction so that equal keys
+    are shared between instances and lookups with interned keys succeed on the identity check of
+    str equality. Keys of other types are still supported with the same semantics.
+    """
 
-        namespace["__init__"] = __init__
-        namespace["__getitem__"] = __getitem__
-        namespace["__iter__"] = __iter__
-        namespace["__len__"] = __len__
-        namespace["__repr__"] = __repr__
+    @staticmethod
+    def add_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        project: Optional[Callable[[Mapping], Mapping]],
+    ) -> None:
+        _add_mapping_methods(slots, namespace, project, True)
 
 
 class OptimizedMutableMappingMeta(OptimizedCollectionMeta[MutableMapping]):
@@ -88,9 +420,13 @@ class OptimizedMutableMappingMeta(OptimizedCollectionMeta[MutableMapping]):
 
     Creates MutableMapping classes that use slots for small mappings but overflow to a standard dict
     when the number of key-value pairs exceeds capacity. Supports all standard dict operations. When
-    mutations cause overflow or underflow, the internal representation is automatically adjusted.
+    mutations cause overflow or underflow, the instance swaps to or from its overflow class, which
+    delegates to the dict.
+    Assigning to an existing key or into a free pair of slots writes the slots directly.
     """
 
+    shared_mutators: tuple[str, ...] = ("__setitem__", "__delitem__", "pop")
+
     def __new__(
         mcs,
         name: str,
@@ -109,71 +445,46 @@ class OptimizedMutableMappingMeta(OptimizedCollectionMeta[MutableMapping]):
             collection_name="MutableMapping",
         )
 
+    @staticmethod
+    def slot_names(internal_size: int) -> tuple[str, ...]:
+        return _pair_slot_names(internal_size)
+
     @staticmethod
     def add_methods(
         slots: Sequence[str],
         namespace: dict[str, Any],
         _: Optional[Callable[[MutableMapping], MutableMapping]],
     ) -> None:
-        internal_size = len(slots)
-
-        def _assign(self, mapping):
-            if len(mapping) > internal_size:
-                setattr(self, slots[0], mapping)
-                for slot in slots[1:]:
-                    setattr(self, slot, None)
-            else:
-                sentinel = object()
-                for pair, slot in zip_longest(mapping.items(), slots, fillvalue=sentinel):
-                    if pair is sentinel:
-                        setattr(self, slot, None)
-                    else:
-                        setattr(self, slot, pair)
-
-        def __init__(self, mapping):
-            _assign(self, mapping)
-
-        def __getitem__(self, key):
-            first = getattr(self, slots[0])
-            if isinstance(first, dict):
-                return first[key]
-
-            for slot in slots:
-                item = getattr(self, slot)
-                if item is None:
-                    break
-
-                if item[0] == key:
-                    return item[1]
-
-            raise KeyError(key)
+        _add_mut_mapping_methods(slots, namespace, False)
 
-        def __setitem__(self, key, value):
-            current = dict(self)
-            current[key] = value
-            _assign(self, current)
+    @staticmethod
+    def add_overflow_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableMapping], MutableMapping]],
+    ) -> None:
+        _add_mut_mapping_overflow_methods(slots, namespace, False)
 
-        def __delitem__(self, key):
-            current = dict(self)
-            del current[key]
-            _assign(self, current)
 
-        def __iter__(self):
-            yield from OptimizedCollectionMeta._mut_iter(
-                self, slots, dict, lambda d: d, None, operator.itemgetter(0)
-            )
+class OptimizedStrMutableMappingMeta(OptimizedMutableMappingMeta):
+    """Metaclass for generating overflow-capable MutableMapping implementations with str keys.
 
-        def __len__(self):
-            return OptimizedCollectionMeta._mut_len(self, slots, dict, lambda d: d, None)
+    Behaves like OptimizedMutableMappingMeta, but str keys are interned whenever they are written
+    into a slot. Once the mapping overflows, keys are stored by the overflow dict as usual.
+    """
 
-        def __repr__(self):
-            items = [f"{repr(k)}: {repr(v)}" for k, v in self.items()]
-            return f"{{{", ".join(items)}}}"
+    @staticmethod
+    def add_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableMapping], MutableMapping]],
+    ) -> None:
+        _add_mut_mapping_methods(slots, namespace, True)
 
-        namespace["__init__"] = __init__
-        namespace["__getitem__"] = __getitem__
-        namespace["__setitem__"] = __setitem__
-        namespace["__delitem__"] = __delitem__
-        namespace["__iter__"] = __iter__
-        namespace["__len__"] = __len__
-        namespace["__repr__"] = __repr__
+    @staticmethod
+    def add_overflow_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableMapping], MutableMapping]],
+    ) -> None:
+        _add_mut_mapping_overflow_methods(slots, namespace, True)
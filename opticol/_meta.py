@@ -3,20 +3,118 @@
 This module provides the foundational metaclass used by all optimized collection
 implementations. It handles automatic slot generation and provides common helper
 methods for mutable collection operations.
+
+Mutable collections which exceed their slots move to an overflow class: a subclass which adds no
+slots, so the layout of an instance stays compatible and its __class__ can be swapped in place. The
+overflow class stores a builtin collection in the first slot and delegates to it directly, and the
+instance swaps back to the slot class once the collection fits into the slots again. CPython only
+allows __class__ assignment between classes with the same slots, so an instance can never move to a
+class of another size.
+
+The overflow class may in turn have a shared subclass, whose instances hold a builtin collection
+they do not own. It copies the collection and swaps the instance to the overflow class on the first
+write, which implements copy-on-write without any check on the read paths.
 """
 
 from abc import ABCMeta, abstractmethod
 from collections.abc import Callable, Iterable, Iterator, Sequence
+from operator import attrgetter
+import types
 from typing import Any, Optional
 
+_REQUIRED = object()
+
+
+_CONSTRUCTORS: dict[tuple[tuple[str, ...], tuple[str, ...]], types.CodeType] = {}
+"""
+The code of every _make constructor by its slots and converted slots, shared by every class with the
+same slots so that each constructor is compiled once.
+"""
+
+
+def constructor_source(slots: Sequence[str], convert_slots: Sequence[str] = ()) -> str:
+    """Render the source of a _make constructor (see OptimizedCollectionMeta._make_constructor).
+
+    Args:
+        slots: Slot names in storage order. They become the parameter names.
+        convert_slots: The slots whose arguments are passed through _convert before being stored.
+
+    Returns:
+        The source of the function _make, which expects _new and _convert as globals.
+    """
+    params = "".join(f", {slot}" for slot in slots)
+    body = "".join(
+        (
+            f"    self.{slot} = _convert({slot})\n"
+            if slot in convert_slots
+            else f"    self.{slot} = {slot}\n"
+        )
+        for slot in slots
+    )
+    return f"def _make(cls{params}):\n    self = _new(cls)\n{body}    return self\n"
+
+
+def preload_constructor(function: types.FunctionType, convert_slots: Sequence[str] = ()) -> None:
+    """Register a _make constructor compiled ahead of time, so that it is not compiled at runtime.
+
+    Used by the modules written by opticol.codegen, whose constructors are compiled into their
+    bytecode cache along with the rest of the module.
+
+    Args:
+        function: A function defined from the output of constructor_source.
+        convert_slots: The converted slots the source was rendered for.
+    """
+    code = function.__code__
+    _CONSTRUCTORS[(code.co_varnames[1 : code.co_argcount], tuple(convert_slots))] = code
+
+
+def _unsharing_method(name: str, data_slot: str) -> Callable[..., Any]:
+    """Create a write method of a shared overflow class.
+
+    Args:
+        name: The name of the write method of the overflow class.
+        data_slot: The slot holding the shared builtin collection.
+
+    Returns:
+        A method which copies the shared collection, swaps the instance to the overflow class and
+        then calls the method of the overflow class.
+    """
+
+    def method(self, *args):
+        self.__class__ = self._overflow_cls
+        setattr(self, data_slot, getattr(self, data_slot).copy())
+        return getattr(self, name)(*args)
+
+    method.__name__ = name
+    return method
+
+
+def _adopt_functions(cls: type) -> None:
+    """Name the generated functions of a class after it, so they show up cleanly in profiles.
+
+    Args:
+        cls: The class whose namespace holds the functions created by add_methods.
+    """
+    for attr, value in vars(cls).items():
+        if type(value) in (classmethod, staticmethod):
+            value = value.__func__
+        if type(value) is types.FunctionType:
+            value.__qualname__ = f"{cls.__qualname__}.{attr}"
+            value.__module__ = cls.__module__
+
 
 class OptimizedCollectionMeta[C](ABCMeta):
     """Metaclass for creating optimized collection classes with fixed-size slots.
 
     This metaclass generates collection classes that use __slots__ for memory efficiency. Each
     instance stores elements in individually named slots (_item0, _item1, etc.) based on the
-    specified internal_size. Subclasses must implement add_methods() to define collection-specific
-    behavior.
+    specified internal_size, unless the subclass overrides slot_names(). Subclasses must implement
+    add_methods() to define collection-specific behavior.
+
+    Subclasses may also implement add_overflow_methods() to generate the overflow class of a mutable
+    collection, which is then available to both classes as the _overflow_cls class attribute (and
+    the slot class as _slot_cls). Subclasses which also list the writing methods of the overflow
+    class in shared_mutators get a shared overflow class as well (the _shared_cls class attribute).
 
     The static helper methods defined here assume that mutable collections follow a standard
     behavior, but otherwise, logic in add_methods can leverage this structure as it sees fit.
@@ -53,12 +151,73 @@ class OptimizedCollectionMeta[C](ABCMeta):
         if internal_size < 0:
             raise ValueError(f"{internal_size} is not a valid size for the {collection_name} type.")
 
-        slots = tuple(f"_item{i}" for i in range(internal_size))
+        slots = mcs.slot_names(internal_size)
         namespace["__slots__"] = slots
 
         mcs.add_methods(slots, namespace, project)
+        cls = super().__new__(mcs, name, bases, namespace)
+        _adopt_functions(cls)
+
+        overflow_namespace: dict[str, Any] = {}
+        mcs.add_overflow_methods(slots, overflow_namespace, project)
+        if overflow_namespace:
+            overflow_namespace["__slots__"] = ()
+            overflow_namespace["__module__"] = cls.__module__
+            overflow_namespace["__qualname__"] = f"{cls.__qualname__}Overflow"
+            # Created through ABCMeta directly, since the overflow class shares the slots of cls.
+            overflow_cls = ABCMeta.__new__(mcs, f"{name}Overflow", (cls,), overflow_namespace)
+            _adopt_functions(overflow_cls)
+            cls._slot_cls = cls
+            cls._overflow_cls = overflow_cls
+
+            if mcs.shared_mutators:
+                shared_namespace: dict[str, Any] = {
+                    name: _unsharing_method(name, slots[0]) for name in mcs.shared_mutators
+                }
+                shared_namespace["__slots__"] = ()
+                shared_namespace["__module__"] = cls.__module__
+                shared_namespace["__qualname__"] = f"{cls.__qualname__}Shared"
+                shared_cls = ABCMeta.__new__(
+                    mcs, f"{name}Shared", (overflow_cls,), shared_namespace
+                )
+                _adopt_functions(shared_cls)
+                cls._shared_cls = shared_cls
+
+        return cls
+
+    __slots__: tuple[str, ...]
+    """
+    The slots of the classes, which __new__ names through slot_names.
+    """
+
+    _slot_cls: "OptimizedCollectionMeta"
+    _overflow_cls: type
+    _shared_cls: type
+    """
+    The slot, overflow and shared classes of the family of a mutable collection class, which its
+    instances swap between. They are only set on classes which define overflow methods.
+    """
+
+    shared_mutators: tuple[str, ...] = ()
+    """
+    The methods of the overflow class which write to its builtin collection. The methods which
+    replace the collection (such as clear) are left out, since they need no copy.
+    """
+
+    @staticmethod
+    def slot_names(internal_size: int) -> tuple[str, ...]:
+        """Name the slots that will be generated for a collection of the given size.
 
-        return super().__new__(mcs, name, bases, namespace)
+        By default each element is stored in its own slot (_item0, _item1, etc.). Subclasses may
+        override this when an element is spread over several slots.
+
+        Args:
+            internal_size: The number of elements the collection stores in slots.
+
+        Returns:
+            The slot names in storage order.
+        """
+        return tuple(f"_item{i}" for i in range(internal_size))
 
     @staticmethod
     @abstractmethod
@@ -74,39 +233,153 @@ class OptimizedCollectionMeta[C](ABCMeta):
         will be used to create the class.
 
         Args:
-            slots: Tuple of slot names (_item0, _item1, etc.) for storing elements.
+            slots: Tuple of slot names (as returned by slot_names) for storing elements.
             namespace: Class namespace dict to populate with methods.
             project: Optional projection function for recursive collection optimization.
         """
 
     @staticmethod
-    def _mut_len[O](
-        inst: Any,
+    def add_overflow_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        project: Optional[Callable[[C], C]],
+    ) -> None:
+        """Add the methods of the overflow class of a mutable collection to its namespace.
+
+        By default no overflow class is created. Overflow methods find the builtin collection in
+        the first slot, and should swap the instance back to the slot class with _store_slots once
+        the collection fits into the slots again.
+
+        Args:
+            slots: Tuple of slot names (as returned by slot_names) shared with the slot class.
+            namespace: Overflow class namespace dict to populate with methods.
+            project: Optional projection function for recursive collection optimization.
+        """
+
+    @staticmethod
+    def _make_constructor(
         slots: Sequence[str],
-        overflow_type: type[O],
-        overflow_selector: Callable[[O], int],
-        end_object: object,
-    ) -> int:
-        """Calculate length for mutable collections supporting overflow.
+        fill: Any = _REQUIRED,
+        convert: Optional[Callable[[Any], Any]] = None,
+        convert_slots: Sequence[str] = (),
+    ) -> Callable[..., Any]:
+        """Generate a constructor which stores its arguments straight into the slots.
 
-        Mutable collections can exceed their allocated slot count, triggering overflow to a standard
-        collection type or they may underflow and use sentinel objects to represent absent values.
-        This helper assumes the instance follows these conventions and returns its computed length.
+        The generated function is installed as the _make classmethod of every generated class. It
+        takes one positional argument per slot, in slot order, and skips the validation and
+        iteration of __init__. Callers are trusted to pass values which form a valid instance: the
+        right number of distinct elements for sets, distinct keys for mappings, and END in unused
+        slots of mutable collections.
+
+        Args:
+            slots: Slot names in storage order. They become the parameter names.
+            fill: Optional default for every parameter, such as the END sentinel for mutable
+                collections which may use fewer slots than they have.
+            convert: Optional function applied to the arguments of convert_slots before they are
+                stored, such as key interning.
+            convert_slots: The slots whose arguments are converted.
+
+        Returns:
+            The function _make(cls, *values), which returns a new instance of cls.
+        """
+        key = (tuple(slots), tuple(convert_slots))
+        code = _CONSTRUCTORS.get(key)
+        if code is None:
+            compiled: dict[str, Any] = {}
+            exec(constructor_source(*key), compiled)  # pylint: disable=exec-used
+            code = _CONSTRUCTORS[key] = compiled["_make"].__code__
+
+        env: dict[str, Any] = {"_new": object.__new__, "_convert": convert}
+        defaults = None if fill is _REQUIRED else (fill,) * len(slots)
+        return types.FunctionType(code, env, "_make", defaults)
+
+    @staticmethod
+    def _slot_values(slots: Sequence[str]) -> Callable[[Any], tuple]:
+        """Create a function reading every slot of an instance into a tuple in one C level call.
+
+        Args:
+            slots: Slot names in storage order.
+
+        Returns:
+            A function returning the tuple of slot values of an instance.
+        """
+        if len(slots) == 0:
+            return lambda _: ()
+        if len(slots) == 1:
+            getter = attrgetter(slots[0])
+            return lambda inst: (getter(inst),)
+        return attrgetter(*slots)
+
+    @staticmethod
+    def _store_overflow(inst: Any, slots: Sequence[str], data: Any, end_object: object) -> None:
+        """Move an instance to its overflow class, storing a builtin collection in the first slot.
+
+        Args:
+            inst: The collection instance.
+            slots: Slot names of the instance.
+            data: The builtin collection holding every element, which is owned by the instance.
+            end_object: Sentinel stored in the remaining slots.
+        """
+        inst.__class__ = inst._overflow_cls
+        setattr(inst, slots[0], data)
+        for slot in slots[1:]:
+            setattr(inst, slot, end_object)
+
+    @staticmethod
+    def _new_overflow(cls: type[Any], data: Any, end_object: object, shared: bool = False) -> Any:
+        """Create an overflowed instance of a mutable collection class holding a builtin collection.
+
+        Args:
+            cls: The slot class of the instance.
+            data: The builtin collection holding every element.
+            end_object: Sentinel stored in the remaining slots.
+            shared: Flag if data is shared with its creator. The instance then copies it on the
+                first write, and otherwise owns it.
+
+        Returns:
+            The new instance.
+        """
+        inst = object.__new__(cls)
+        OptimizedCollectionMeta._store_overflow(inst, cls.__slots__, data, end_object)
+        if shared:
+            inst.__class__ = cls._shared_cls
+        return inst
+
+    @staticmethod
+    def _store_slots(inst: Any, slots: Sequence[str], values: Iterable, end_object: object) -> None:
+        """Store values in the slots of an instance, moving it back to its slot class if needed.
+
+        Args:
+            inst: The collection instance.
+            slots: Slot names of the instance.
+            values: At most len(slots) values.
+            end_object: Sentinel stored in the slots after the last value.
+        """
+        if type(inst) is not inst._slot_cls:
+            inst.__class__ = inst._slot_cls
+
+        used = 0
+        for slot, v in zip(slots, values):
+            setattr(inst, slot, v)
+            used += 1
+        for slot in slots[used:]:
+            setattr(inst, slot, end_object)
+
+    @staticmethod
+    def _slot_len(inst: Any, slots: Sequence[str], end_object: object) -> int:
+        """Count the used slots of a mutable collection which has not overflowed.
+
+        Mutable collections may underflow and use sentinel objects to represent absent values. This
+        helper assumes the instance follows this convention and returns its computed length.
 
         Args:
             inst: The collection instance.
             slots: Slot names to check for elements.
-            overflow_type: Type used when collection exceeds slot capacity.
-            overflow_selector: Function to extract length from overflow object.
             end_object: Sentinel marking unused slots.
 
         Returns:
             The number of elements in the collection.
         """
-        first = getattr(inst, slots[0])
-        if isinstance(first, overflow_type):
-            return overflow_selector(first)
-
         count = 0
         for slot in slots:
             if getattr(inst, slot) is end_object:
@@ -116,37 +389,19 @@ class OptimizedCollectionMeta[C](ABCMeta):
         return count
 
     @staticmethod
-    def _mut_iter[O](
-        inst: Any,
-        slots: Sequence[str],
-        overflow_type: type[O],
-        overflow_selector: Callable[[O], Iterable],
-        end_object: object,
-        value_selector: Callable,
-    ) -> Iterator:
-        """Iterate over elements in mutable collections supporting overflow.
-
-        Similar to _mut_len, this handles iteration for collections that may have overflowed or
-        underflowed to different representations.
+    def _slot_iter(inst: Any, slots: Sequence[str], end_object: object) -> Iterator:
+        """Iterate over the used slots of a mutable collection which has not overflowed.
 
         Args:
             inst: The collection instance.
             slots: Slot names to iterate over.
-            overflow_type: Type used when collection exceeds slot capacity.
-            overflow_selector: Function to extract iterable from overflow object.
             end_object: Sentinel marking unused slots.
-            value_selector: Function to extract value from slot content.
 
         Yields:
             Elements from the collection.
         """
-        first = getattr(inst, slots[0])
-        if isinstance(first, overflow_type):
-            yield from overflow_selector(first)
-            return
-
         for slot in slots:
             v = getattr(inst, slot)
             if v is end_object:
                 return
-            yield value_selector(v)
+            yield v
@@ -1,12 +1,8 @@
-"""Sentinel values and overflow wrapper for mutable collections.
+"""Sentinel values for mutable collections.
 
-This module defines sentinel objects used to mark empty slots in mutable collections, and an
-Overflow wrapper used when collections exceed their allocated slot capacity.
+This module defines sentinel objects used to mark empty slots in mutable collections.
 """
 
-from dataclasses import dataclass
-from typing import Any
-
 
 class EndMarker:
     """Sentinel class marking the end of used slots in mutable collections.
@@ -15,20 +11,9 @@ class EndMarker:
     containing None or other falsy values.
     """
 
+    def __reduce__(self) -> str:
+        # Pickled by reference, so unpickled collections keep using the one instance.
+        return "END"
 
-END = EndMarker()
-
-
-@dataclass(slots=True, frozen=True)
-class Overflow:
-    """Wrapper for collections that exceed their optimized slot capacity.
 
-    When a mutable collection grows beyond its allocated slots, the entire collection is stored in
-    this wrapper's data attribute (as a standard list, set, or dict). This allows seamless fallback
-    to standard Python types while maintaining the same interface.
-
-    Attributes:
-        data: The standard Python collection (list, set, or dict) holding all elements.
-    """
-
-    data: Any
+END = EndMarker()
@@ -4,13 +4,13 @@ This module implements the sequence-specific metaclasses that generate immutable
 Sequence and MutableSequence implementations with slot-based storage.
 """
 
-from itertools import zip_longest
 from typing import Any, Optional
 
 from collections.abc import Callable, MutableSequence, Sequence
 
 from opticol._meta import OptimizedCollectionMeta
-from opticol._sentinel import END, Overflow
+from opticol._sentinel import END
+from opticol.persistent import updated_sequence
 
 
 def _adjust_index(idx: int, length: int) -> int:
@@ -36,8 +36,9 @@ class OptimizedSequenceMeta(OptimizedCollectionMeta[Sequence]):
     """Metaclass for generating fixed-size immutable Sequence implementations.
 
     Creates Sequence classes that store exactly the specified number of elements in individual
-    slots. Supports indexing (including negative indices) and slicing with optional recursive
-    optimization via the project parameter.
+    slots. Supports indexing (including negative indices), slicing and the persistent updates set
+    and append, which return a new sequence, with optional recursive optimization via the project
+    parameter.
     """
 
     def __new__(
@@ -66,6 +67,7 @@ class OptimizedSequenceMeta(OptimizedCollectionMeta[Sequence]):
         project: Optional[Callable[[Sequence], Sequence]],
     ) -> None:
         internal_size = len(slots)
+        slot_values = OptimizedCollectionMeta._slot_values(slots)
 
         def __init__(self, seq):
             if len(seq) != internal_size:
@@ -83,8 +85,10 @@ class OptimizedSequenceMeta(OptimizedCollectionMeta[Sequence]):
                     key = _adjust_index(key, len(self))
                     return getattr(self, slots[key])
                 case slice():
-                    indices = range(*key.indices(len(self)))
-                    base = [self[i] for i in indices]
+                    # Slicing the tuple of slot values resolves the bounds in C. The router stores
+                    # a list straight into the target size class, and returns it unchanged when
+                    # its size is not routed, so the result is never a tuple.
+                    base = list(slot_values(self)[key])
                     if project is None:
                         return base
 
@@ -97,12 +101,23 @@ class OptimizedSequenceMeta(OptimizedCollectionMeta[Sequence]):
         def __len__(_):
             return internal_size
 
+        def set(self, index, value):
+            i = _adjust_index(index, internal_size)
+            values = slot_values(self)
+            return self._make(*values[:i], value, *values[i + 1 :])
+
+        def append(self, value):
+            return updated_sequence([*slot_values(self), value], project)
+
         def __repr__(self):
             return f"[{", ".join(repr(getattr(self, slot)) for slot in slots)}]"
 
         namespace["__init__"] = __init__
+        namespace["_make"] = classmethod(OptimizedCollectionMeta._make_constructor(slots))
         namespace["__getitem__"] = __getitem__
         namespace["__len__"] = __len__
+        namespace["set"] = set
+        namespace["append"] = append
         namespace["__repr__"] = __repr__
 
 
@@ -112,9 +127,11 @@ class OptimizedMutableSequenceMeta(OptimizedCollectionMeta[MutableSequence]):
     Creates MutableSequence classes that use slots for small collections but overflow to a standard
     list when the number of elements exceeds capacity. Supports all standard list operations
     including indexing, slicing, insertion, and deletion. When mutations cause overflow or
-    underflow, the internal representation is automatically adjusted.
+    underflow, the instance swaps to or from its overflow class, which delegates to the list.
     """
 
+    shared_mutators = ("__setitem__", "__delitem__", "insert", "append", "extend", "pop")
+
     def __new__(
         mcs,
         name: str,
@@ -141,45 +158,19 @@ class OptimizedMutableSequenceMeta(OptimizedCollectionMeta[MutableSequence]):
         project: Optional[Callable[[MutableSequence], MutableSequence]],
     ) -> None:
         internal_size = len(slots)
-
-        def _assign(self, seq):
-            if len(seq) > internal_size:
-                setattr(self, slots[0], Overflow(seq))
-                for slot in slots[1:]:
-                    setattr(self, slot, END)
-            else:
-                sentinel = object()
-                for slot, v in zip_longest(slots, seq, fillvalue=sentinel):
-                    if v is sentinel:
-                        setattr(self, slot, END)
-                    else:
-                        setattr(self, slot, v)
+        slot_values = OptimizedCollectionMeta._slot_values(slots)
+        _assign = _mut_assign(slots)
 
         def __init__(self, seq):
-            _assign(self, seq)
+            _assign(self, seq if len(seq) <= internal_size else list(seq))
 
         def __getitem__(self, key):
-            first = getattr(self, slots[0])
-            overflowed = isinstance(first, Overflow)
-
             match key:
                 case int():
-                    if overflowed:
-                        return first.data[key]
-
                     key = _adjust_index(key, len(self))
-                    v = getattr(self, slots[key])
-                    if v is END:
-                        raise IndexError(f"{key} is outside of the expected bounds.")
-                    return v
+                    return getattr(self, slots[key])
                 case slice():
-                    if overflowed:
-                        base = first.data[key]
-                    else:
-                        indices = range(*key.indices(len(self)))
-                        first = getattr(self, slots[0])
-                        base = [self[i] for i in indices]
-
+                    base = list(slot_values(self)[: len(self)][key])
                     if project is None:
                         return base
 
@@ -199,10 +190,11 @@ class OptimizedMutableSequenceMeta(OptimizedCollectionMeta[MutableSequence]):
             del current[key]
             _assign(self, current)
 
+        def __iter__(self):
+            return OptimizedCollectionMeta._slot_iter(self, slots, END)
+
         def __len__(self):
-            return OptimizedCollectionMeta._mut_len(
-                self, slots, Overflow, lambda o: len(o.data), END
-            )
+            return OptimizedCollectionMeta._slot_len(self, slots, END)
 
         def insert(self, index, value):
             current = list(self)
@@ -213,9 +205,102 @@ class OptimizedMutableSequenceMeta(OptimizedCollectionMeta[MutableSequence]):
             return f"[{", ".join(repr(val) for val in self)}]"
 
         namespace["__init__"] = __init__
+        namespace["_make"] = classmethod(OptimizedCollectionMeta._make_constructor(slots, END))
         namespace["__getitem__"] = __getitem__
         namespace["__setitem__"] = __setitem__
         namespace["__delitem__"] = __delitem__
+        namespace["__iter__"] = __iter__
         namespace["__len__"] = __len__
         namespace["insert"] = insert
         namespace["__repr__"] = __repr__
+
+    @staticmethod
+    def add_overflow_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        project: Optional[Callable[[MutableSequence], MutableSequence]],
+    ) -> None:
+        internal_size = len(slots)
+        data_slot = slots[0]
+        _assign = _mut_assign(slots)
+
+        def _shrunk(self, data):
+            if len(data) <= internal_size:
+                _assign(self, data)
+
+        def __getitem__(self, key):
+            if isinstance(key, slice):
+                base = getattr(self, data_slot)[key]
+                return base if project is None else project(base)
+            return getattr(self, data_slot)[key]
+
+        def __setitem__(self, key, value):
+            data = getattr(self, data_slot)
+            data[key] = value
+            _shrunk(self, data)
+
+        def __delitem__(self, key):
+            data = getattr(self, data_slot)
+            del data[key]
+            _shrunk(self, data)
+
+        def __contains__(self, value):
+            return value in getattr(self, data_slot)
+
+        def __iter__(self):
+            return iter(getattr(self, data_slot))
+
+        def __len__(self):
+            return len(getattr(self, data_slot))
+
+        def insert(self, index, value):
+            getattr(self, data_slot).insert(index, value)
+
+        def append(self, value):
+            getattr(self, data_slot).append(value)
+
+        def extend(self, values):
+            # list.extend would iterate this instance while growing it, as in m.extend(m) or m += m.
+            getattr(self, data_slot).extend(list(values) if values is self else values)
+
+        def pop(self, index=-1):
+            data = getattr(self, data_slot)
+            value = data.pop(index)
+            _shrunk(self, data)
+            return value
+
+        def clear(self):
+            _assign(self, [])
+
+        namespace["__getitem__"] = __getitem__
+        namespace["__setitem__"] = __setitem__
+        namespace["__delitem__"] = __delitem__
+        namespace["__contains__"] = __contains__
+        namespace["__iter__"] = __iter__
+        namespace["__len__"] = __len__
+        namespace["insert"] = insert
+        namespace["append"] = append
+        namespace["extend"] = extend
+        namespace["pop"] = pop
+        namespace["clear"] = clear
+
+
+def _mut_assign(slots: Sequence[str]) -> Callable[[Any, list], None]:
+    """Create the function storing the elements of a mutable sequence.
+
+    Args:
+        slots: Slot names of the sequence class.
+
+    Returns:
+        A function storing a list, which becomes owned by the instance, either in the slots or in
+        the overflow class when it does not fit.
+    """
+    internal_size = len(slots)
+
+    def _assign(self, seq):
+        if len(seq) > internal_size:
+            OptimizedCollectionMeta._store_overflow(self, slots, seq, END)
+        else:
+            OptimizedCollectionMeta._store_slots(self, slots, seq, END)
+
+    return _assign
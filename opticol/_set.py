@@ -4,13 +4,12 @@ This module implements the set-specific metaclasses that generate immutable Set
 implementations with slot-based storage. Elements are stored directly in individual slots.
 """
 
-from itertools import zip_longest
 from typing import Any, Optional
 
-from collections.abc import Callable, MutableSet, Sequence, Set
+from collections.abc import Callable, Iterable, MutableSet, Sequence, Set
 
 from opticol._meta import OptimizedCollectionMeta
-from opticol._sentinel import END, Overflow
+from opticol._sentinel import END
 
 
 class OptimizedSetMeta(OptimizedCollectionMeta[Set]):
@@ -88,6 +87,7 @@ class OptimizedSetMeta(OptimizedCollectionMeta[Set]):
             namespace["_from_iterable"] = classmethod(_from_iterable)
 
         namespace["__init__"] = __init__
+        namespace["_make"] = classmethod(OptimizedCollectionMeta._make_constructor(slots))
         namespace["__contains__"] = __contains__
         namespace["__iter__"] = __iter__
         namespace["__len__"] = __len__
@@ -99,14 +99,16 @@ class OptimizedMutableSetMeta(OptimizedCollectionMeta[MutableSet]):
 
     Creates MutableSet classes that use slots for small sets but overflow to a standard set when the
     number of elements exceeds capacity. Supports all standard set operations including add and
-    discard. When mutations cause overflow or underflow, the internal representation is
-    automatically adjusted between slot-based and set-based storage.
+    discard. When mutations cause overflow or underflow, the instance swaps to or from its overflow
+    class, which delegates to the set.
 
     Because membership testing is done via a linear search, this implementation will accept
     unhashable types. However, it is still not wise to use such values in the set since growing the
     set will likely result in falling back to the python default which will throw.
     """
 
+    shared_mutators = ("add", "discard", "remove", "pop")
+
     def __new__(
         mcs,
         name: str,
@@ -133,28 +135,12 @@ class OptimizedMutableSetMeta(OptimizedCollectionMeta[MutableSet]):
         project: Optional[Callable[[MutableSet], MutableSet]],
     ) -> None:
         internal_size = len(slots)
-
-        def _assign(self, s):
-            if len(s) > internal_size:
-                setattr(self, slots[0], Overflow(s))
-                for slot in slots[1:]:
-                    setattr(self, slot, END)
-            else:
-                sentinel = object()
-                for slot, v in zip_longest(slots, s, fillvalue=sentinel):
-                    if v is sentinel:
-                        setattr(self, slot, END)
-                    else:
-                        setattr(self, slot, v)
+        _assign = _mut_assign(slots)
 
         def __init__(self, s):
-            _assign(self, s)
+            _assign(self, s if len(s) <= internal_size else set(s))
 
         def __contains__(self, value):
-            first = getattr(self, slots[0])
-            if isinstance(first, Overflow):
-                return value in first.data
-
             for slot in slots:
                 v = getattr(self, slot)
                 if v is END:
@@ -164,14 +150,10 @@ class OptimizedMutableSetMeta(OptimizedCollectionMeta[MutableSet]):
             return False
 
         def __iter__(self):
-            yield from OptimizedCollectionMeta._mut_iter(
-                self, slots, Overflow, lambda o: o.data, END, lambda v: v
-            )
+            return OptimizedCollectionMeta._slot_iter(self, slots, END)
 
         def __len__(self):
-            return OptimizedCollectionMeta._mut_len(
-                self, slots, Overflow, lambda o: len(o.data), END
-            )
+            return OptimizedCollectionMeta._slot_len(self, slots, END)
 
         def add(self, value):
             current = set(self)
@@ -196,9 +178,85 @@ class OptimizedMutableSetMeta(OptimizedCollectionMeta[MutableSet]):
             namespace["_from_iterable"] = classmethod(_from_iterable)
 
         namespace["__init__"] = __init__
+        namespace["_make"] = classmethod(OptimizedCollectionMeta._make_constructor(slots, END))
         namespace["__contains__"] = __contains__
         namespace["__iter__"] = __iter__
         namespace["__len__"] = __len__
         namespace["add"] = add
         namespace["discard"] = discard
         namespace["__repr__"] = __repr__
+
+    @staticmethod
+    def add_overflow_methods(
+        slots: Sequence[str],
+        namespace: dict[str, Any],
+        _: Optional[Callable[[MutableSet], MutableSet]],
+    ) -> None:
+        internal_size = len(slots)
+        data_slot = slots[0]
+        _assign = _mut_assign(slots)
+
+        def _shrunk(self, data):
+            if len(data) <= internal_size:
+                _assign(self, data)
+
+        def __contains__(self, value):
+            return value in getattr(self, data_slot)
+
+        def __iter__(self):
+            return iter(getattr(self, data_slot))
+
+        def __len__(self):
+            return len(getattr(self, data_slot))
+
+        def add(self, value):
+            getattr(self, data_slot).add(value)
+
+        def discard(self, value):
+            data = getattr(self, data_slot)
+            data.discard(value)
+            _shrunk(self, data)
+
+        def remove(self, value):
+            data = getattr(self, data_slot)
+            data.remove(value)
+            _shrunk(self, data)
+
+        def pop(self):
+            data = getattr(self, data_slot)
+            value = data.pop()
+            _shrunk(self, data)
+            return value
+
+        def clear(self):
+            _assign(self, ())
+
+        namespace["__contains__"] = __contains__
+        namespace["__iter__"] = __iter__
+        namespace["__len__"] = __len__
+        namespace["add"] = add
+        namespace["discard"] = discard
+        namespace["remove"] = remove
+        namespace["pop"] = pop
+        namespace["clear"] = clear
+
+
+def _mut_assign(slots: Sequence[str]) -> Callable[[Any, Iterable], None]:
+    """Create the function storing the elements of a mutable set.
+
+    Args:
+        slots: Slot names of the set class.
+
+    Returns:
+        A function storing distinct elements, either in the slots or in the overflow class when they
+        do not fit. A set which does not fit becomes owned by the instance.
+    """
+    internal_size = len(slots)
+
+    def _assign(self, s):
+        if len(s) > internal_size:
+            OptimizedCollectionMeta._store_overflow(self, slots, s, END)
+        else:
+            OptimizedCollectionMeta._store_slots(self, slots, s, END)
+
+    return _assign
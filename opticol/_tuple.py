@@ -0,0 +1,248 @@
+"""Metaclasses for generating tuple-backed set and mapping types for mid-size collections.
+
+Past a handful of elements, one slot per element stops paying off: every size needs its own class,
+and each operation loops over the slots with getattr. This module implements the tuple-backed tier
+used for those sizes. Elements are stored in a single internal tuple, so a single class serves every
+size and scans run at C speed.
+
+Sets additionally keep a compact open addressing hash index (one byte per bucket) alongside the
+tuple, which still uses a fraction of the memory of a builtin set. Mappings keep their keys and
+values in two parallel tuples and locate keys with tuple.index, since an index would make them
+larger than the dict they replace.
+"""
+
+from collections.abc import Callable, Mapping, Sequence, Set
+from typing import Any, Optional
+
+from opticol._meta import OptimizedCollectionMeta
+from opticol._views import _SlotItemsView, _SlotValuesView
+from opticol.persistent import updated_mapping
+
+_EMPTY_BUCKET = 0xFF
+
+_SET_SLOTS = ("_items", "_index")
+_MAPPING_SLOTS = ("_keys", "_values")
+
+TUPLE_SET_MAX_SIZE = _EMPTY_BUCKET - 1
+"""
+The largest number of elements which can be addressed by the one byte buckets of the set index.
+"""
+
+
+def _build_index(items: tuple) -> bytes:
+    """Build the open addressing hash index for the elements of a tuple-backed set.
+
+    The index has at least twice as many buckets as there are elements, and each bucket holds the
+    position of an element in the tuple or _EMPTY_BUCKET. Collisions are resolved by linear probing.
+
+    Args:
+        items: The distinct, hashable elements of the set.
+
+    Returns:
+        The index as an immutable bytes object whose length is a power of two.
+    """
+    size = 8
+    while size < 2 * len(items):
+        size *= 2
+
+    mask = size - 1
+    table = bytearray([_EMPTY_BUCKET]) * size
+    for pos, item in enumerate(items):
+        i = hash(item) & mask
+        while table[i] != _EMPTY_BUCKET:
+            i = (i + 1) & mask
+        table[i] = pos
+
+    return bytes(table)
+
+
+class OptimizedTupleSetMeta(OptimizedCollectionMeta[Set]):
+    """Metaclass for generating immutable Set implementations backed by a tuple and hash index.
+
+    Creates a single Set class for any number of elements up to TUPLE_SET_MAX_SIZE. Elements must
+    be hashable, as for the builtin set. Set operations support optional recursive optimization via
+    the project parameter.
+    """
+
+    def __new__(
+        mcs,
+        name: str,
+        bases: tuple[type, ...],
+        namespace: dict[str, Any],
+        *,
+        project: Optional[Callable[[Set], Set]],
+    ) -> type:
+        return super().__new__(
+            mcs,
+            name,
+            bases,
+            namespace,
+            internal_size=2,
+            project=project,
+            collection_name="Set",
+        )
+
+    @staticmethod
+    def slot_names(_: int) -> tuple[str, ...]:
+        return _SET_SLOTS
+
+    @staticmethod
+    def add_methods(
+        _: Sequence[str],
+        namespace: dict[str, Any],
+        project: Optional[Callable[[Set], Set]],
+    ) -> None:
+        def __init__(self, s):
+            items = tuple(s)
+            if len(items) > TUPLE_SET_MAX_SIZE:
+                raise ValueError(
+                    f"Expected provided Set to have at most {TUPLE_SET_MAX_SIZE} elements but it "
+                    f"has {len(items)}."
+                )
+
+            self._items = items
+            self._index = _build_index(items)
+
+        def __contains__(self, value):
+            items = self._items
+            index = self._index
+            mask = len(index) - 1
+
+            i = hash(value) & mask
+            while (pos := index[i]) != _EMPTY_BUCKET:
+                item = items[pos]
+                if item is value or item == value:
+                    return True
+                i = (i + 1) & mask
+            return False
+
+        def __iter__(self):
+            return iter(self._items)
+
+        def __len__(self):
+            return len(self._items)
+
+        def __repr__(self):
+            return f"{{{", ".join(repr(v) for v in self._items)}}}"
+
+        def _from_iterable(cls, it):
+            # The Set mixins pass iterables which may repeat elements, such as the chain of both
+            # operands of a union, while __init__ expects distinct elements.
+            s = set(it)
+            if project is not None:
+                return project(s)
+            return cls(s) if len(s) <= TUPLE_SET_MAX_SIZE else s
+
+        namespace["__init__"] = __init__
+        namespace["_make"] = classmethod(OptimizedCollectionMeta._make_constructor(_SET_SLOTS))
+        namespace["_from_iterable"] = classmethod(_from_iterable)
+        namespace["__contains__"] = __contains__
+        namespace["__iter__"] = __iter__
+        namespace["__len__"] = __len__
+        namespace["__repr__"] = __repr__
+
+
+class OptimizedTupleMappingMeta(OptimizedCollectionMeta[Mapping]):
+    """Metaclass for generating immutable Mapping implementations backed by parallel tuples.
+
+    Creates a single Mapping class for any number of key-value pairs. Keys are located with
+    tuple.index, which compares keys in C and never compares the stored values. The persistent
+    updates set and delete return a new mapping, which is optionally optimized via the project
+    parameter.
+    """
+
+    def __new__(
+        mcs,
+        name: str,
+        bases: tuple[type, ...],
+        namespace: dict[str, Any],
+        *,
+        project: Optional[Callable[[Mapping], Mapping]] = None,
+    ) -> type:
+        return super().__new__(
+            mcs,
+            name,
+            bases,
+            namespace,
+            internal_size=2,
+            project=project,
+            collection_name="Mapping",
+        )
+
+    @staticmethod
+    def slot_names(_: int) -> tuple[str, ...]:
+        return _MAPPING_SLOTS
+
+    @staticmethod
+    def add_methods(
+        _: Sequence[str],
+        namespace: dict[str, Any],
+        project: Optional[Callable[[Mapping], Mapping]],
+    ) -> None:
+        def __init__(self, mapping):
+            self._keys = tuple(mapping)
+            self._values = tuple(mapping.values())
+
+        def __getitem__(self, key):
+            try:
+                return self._values[self._keys.index(key)]
+            except ValueError:
+                raise KeyError(key) from None
+
+        def get(self, key, default=None):
+            try:
+                return self._values[self._keys.index(key)]
+            except ValueError:
+                return default
+
+        def __contains__(self, key):
+            return key in self._keys
+
+        def __iter__(self):
+            return iter(self._keys)
+
+        def __len__(self):
+            return len(self._keys)
+
+        def _iter_items(self):
+            return zip(self._keys, self._values)
+
+        def items(self):
+            return _SlotItemsView(self)
+
+        def values(self):
+            return _SlotValuesView(self)
+
+        def set(self, key, value):
+            try:
+                i = self._keys.index(key)
+            except ValueError:
+                mapping = dict(zip(self._keys, self._values))
+                mapping[key] = value
+                return updated_mapping(mapping, project)
+
+            # The keys are unchanged, so the result has the same class and shares the key tuple.
+            return self._make(self._keys, self._values[:i] + (value,) + self._values[i + 1 :])
+
+        def delete(self, key):
+            mapping = dict(zip(self._keys, self._values))
+            del mapping[key]
+            return updated_mapping(mapping, project)
+
+        def __repr__(self):
+            items = [f"{repr(k)}: {repr(v)}" for k, v in zip(self._keys, self._values)]
+            return f"{{{", ".join(items)}}}"
+
+        namespace["__init__"] = __init__
+        namespace["_make"] = classmethod(OptimizedCollectionMeta._make_constructor(_MAPPING_SLOTS))
+        namespace["__getitem__"] = __getitem__
+        namespace["get"] = get
+        namespace["__contains__"] = __contains__
+        namespace["__iter__"] = __iter__
+        namespace["__len__"] = __len__
+        namespace["_iter_items"] = _iter_items
+        namespace["items"] = items
+        namespace["values"] = values
+        namespace["set"] = set
+        namespace["delete"] = delete
+        namespace["__repr__"] = __repr__
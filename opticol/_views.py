@@ -0,0 +1,26 @@
+"""Mapping views which iterate the pairs of a mapping without looking up every key again."""
+
+from collections.abc import ItemsView, ValuesView
+
+
+class _SlotItemsView(ItemsView):
+    """ItemsView which iterates the (key, value) pairs directly from the slots of a mapping.
+
+    The ItemsView mixin looks up every key again through __getitem__, which is a linear search for
+    the generated mapping classes. The generated classes instead provide _iter_items.
+    """
+
+    __slots__ = ()
+
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class _SlotValuesView(ValuesView):
+    """ValuesView which iterates the values directly from the slots of a mapping."""
+
+    __slots__ = ()
+
+    def __iter__(self):
+        for _, v in self._mapping._iter_items():
+            yield v
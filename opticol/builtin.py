@@ -0,0 +1,103 @@
+"""Conversion of optimized collections back to builtin dicts, lists and sets.
+
+C accelerated libraries (such as ORMs, msgpack or re) often require real dict, list or set objects.
+Converting an optimized collection with dict(obj) or list(obj) iterates the generated __iter__ and
+__getitem__ methods one element at a time, and a nested graph needs a recursive walk on top.
+
+to_builtin instead reads the slots of every generated class in a single C level call (like
+opticol.encoder), and walks nested graphs iteratively, so deep graphs cannot exhaust the recursion
+limit:
+
+    >>> import opticol
+    >>> opticol.to_builtin(opticol.mapping({"a": opticol.seq([1, 2])}))
+    {'a': [1, 2]}
+
+Every Mapping becomes a dict, every Set a set and every Sequence (other than str and bytes types) a
+list, including builtin collections, which are copied. Mapping keys and set elements are left
+unchanged, since they must stay hashable. A collection referenced several times is converted once,
+so the result keeps the sharing of the original graph, and cycles are reproduced.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from opticol import _convert, _deep
+
+_CONVERTERS: dict[type, Callable[[Any], Any]] = {}
+"""
+The converter of every collection type converted so far, which reads its contents.
+"""
+
+
+def _itself(value: Any) -> Any:
+    """Read the contents of a collection without a converter, which the builtins then iterate."""
+    return value
+
+
+def _shallow(value: Any, kind: int) -> Any:
+    """Copy the contents of a collection into a new builtin collection of its kind."""
+    cls = type(value)
+    try:
+        contents = _CONVERTERS[cls]
+    except KeyError:
+        contents = _CONVERTERS[cls] = _convert.converter(cls) or _itself
+
+    if kind in _deep.MAPPING_KINDS:
+        return dict(contents(value))
+    if kind == _deep.SET:
+        return set(contents(value))
+    return list(contents(value))
+
+
+def to_builtin(obj: Any, /, deep: bool = True) -> Any:
+    """Convert a collection into the builtin dict, list or set of its kind.
+
+    Types of the collections module become their builtin base kind as well (a Counter, defaultdict
+    or OrderedDict becomes a dict, and a deque a list).
+
+    Args:
+        obj: The collection to convert.
+        deep: Flag if the collections nested in obj (as mapping values or sequence elements) should
+            be converted as well.
+
+    Returns:
+        A new builtin collection, or obj itself if it is not a collection.
+    """
+    kind = _deep.kind_of(obj)
+    if kind is None:
+        return obj
+    if not deep:
+        return _shallow(obj, kind)
+
+    # Maps the id of every original collection to its conversion. The originals are referenced by
+    # the graph during the whole walk, so ids stay unique.
+    memo: dict[int, Any] = {}
+    # Converted dicts and lists whose children have not been converted yet.
+    pending: list[Any] = []
+
+    def convert(value: Any, kind: int) -> Any:
+        key = id(value)
+        result = memo.get(key)
+        if result is None:
+            result = memo[key] = _shallow(value, kind)
+            if kind != _deep.SET:
+                pending.append(result)
+        return result
+
+    root = convert(obj, kind)
+    kind_of = _deep.kind_of
+    while pending:
+        container = pending.pop()
+        if type(container) is dict:
+            for k, v in container.items():
+                child_kind = kind_of(v)
+                if child_kind is not None:
+                    # Replacing the value of a key does not change the size of the dict.
+                    container[k] = convert(v, child_kind)
+        else:
+            for i, v in enumerate(container):
+                child_kind = kind_of(v)
+                if child_kind is not None:
+                    container[i] = convert(v, child_kind)
+
+    return root
@@ -0,0 +1,442 @@
+"""Parallel projection of large batches of records.
+
+Projecting a batch of millions of records is pure Python work which runs on a single core. The
+bulk_project function splits a batch into chunks and projects them in a pool of workers:
+
+* On free-threaded builds, a ThreadPoolExecutor projects the records directly and the results need
+  no transfer. With the GIL, threads cannot project in parallel, so the batch is projected serially
+  unless another executor is requested.
+* With executor="process", a ProcessPoolExecutor runs the workers. The optimized classes are
+  generated at runtime and cannot be pickled, so the instances are always created by the parent.
+  Workers load the records and send them back in a compact packed form: every collection becomes a
+  tagged tuple which tells the parent which projector method rebuilds it, so the parent never
+  classifies values itself. The parallel share of the work is therefore only the load function and
+  the walk, so processes pay off only when load is expensive.
+
+Records are typically produced in the workers as well, by passing a load function which turns each
+input item (such as a line of JSON or the path of a shard) into records:
+
+    >>> import json
+    >>> from functools import partial
+    >>> from opticol.bulk import bulk_project
+    >>> from opticol.projector import OptimizedCollectionProjector
+    >>> factory = partial(OptimizedCollectionProjector, 0, 3, True)
+    >>> records = bulk_project(lines, factory, load=json.loads, workers=8)
+
+The load function must be picklable (a module level function, class, or a partial of them) when
+processes are used.
+
+Every optimized instance is tracked by the cyclic garbage collector, so a heap of millions of them
+is scanned again by every full collection, and in forked workers those scans write to every page
+holding an instance, which ends copy-on-write sharing. The bulk_load context manager pauses the
+collector while a dataset is loaded and then freezes everything allocated so far, which moves it out
+of the reach of later collections:
+
+    >>> from opticol.bulk import bulk_load
+    >>> with bulk_load() as load:
+    ...     records = projector.project(json.loads(payload))
+    >>> load.frozen
+    1200431
+
+Rows of a fixed width, such as a 2D array, the columns of a frame or a list of equal-length tuples,
+are built into sequences or mappings of one size class by build_seqs and build_mappings. They call
+the _make constructor of the class once per row from a single map over the columns, which skips the
+size dispatch and validation the projector methods pay for every row:
+
+    >>> from opticol.bulk import build_mappings, build_seqs
+    >>> points = build_seqs(array("d", coordinates), 3, layout="buffer")
+    >>> rows = build_mappings([ids, names], ("id", "name"), layout="columns")
+"""
+
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+import gc
+from itertools import batched, chain, repeat
+import sys
+import time
+from typing import Any, Literal, Optional
+
+from opticol import _deep
+from opticol.factory import (
+    create_mapping_class,
+    create_mut_mapping_class,
+    create_mut_seq_class,
+    create_seq_class,
+    create_str_mapping_class,
+    create_str_mut_mapping_class,
+)
+from opticol.projector import Projector
+
+
+def _pack(value: Any, memo: dict[int, Any]) -> Any:
+    """Convert a collection graph into nested tagged tuples.
+
+    A collection referenced several times is packed once, so pickle keeps the sharing. Mapping keys
+    and set elements are left as they are, matching deep projection. The graph is walked
+    iteratively, so deep graphs cannot exhaust the recursion limit.
+
+    Raises:
+        ValueError: If the graph contains a cycle, which deep projection rejects as well.
+    """
+    kind_of = _deep.kind_of
+    in_progress: set[int] = set()
+    stack: list[tuple[Any, int | None, bool]] = [(value, kind_of(value), False)]
+
+    while stack:
+        node, kind, expanded = stack.pop()
+        key = id(node)
+        if kind is None:
+            continue
+
+        if not expanded:
+            if key in memo:
+                continue
+            if key in in_progress:
+                raise ValueError("Cannot project a collection graph which contains a cycle.")
+
+            in_progress.add(key)
+            stack.append((node, kind, True))
+            stack.extend((child, kind_of(child), False) for child in _deep.children(node, kind))
+            continue
+
+        in_progress.discard(key)
+        extra = _deep.extra_of(node, kind)
+        if kind in _deep.MAPPING_KINDS:
+            values = tuple(memo.get(id(v), v) for v in node.values())
+            memo[key] = (kind, tuple(node), values, extra)
+        elif kind == _deep.SET:
+            memo[key] = (kind, tuple(node))
+        else:
+            memo[key] = (kind, tuple(memo.get(id(v), v) for v in node), extra)
+
+    return memo.get(id(value), value)
+
+
+def _unpack(packed: Any, projectors: tuple[Callable[[Any], Any], ...], memo: dict[int, Any]) -> Any:
+    """Rebuild a packed collection graph through the projection methods of every kind.
+
+    Like _pack, the graph is walked iteratively.
+    """
+    stack = [(packed, False)]
+    while stack:
+        node, expanded = stack.pop()
+        key = id(node)
+        if type(node) is not tuple or key in memo:
+            continue
+
+        kind = node[0]
+        if kind in _deep.MAPPING_KINDS:
+            children = node[2]
+        elif kind == _deep.SET:
+            children = ()
+        else:
+            children = node[1]
+
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+            continue
+
+        unpacked = [memo.get(id(v), v) for v in children]
+        if kind in _deep.MAPPING_KINDS:
+            value = _deep.rebuild(kind, dict(zip(node[1], unpacked)), node[3])
+        elif kind == _deep.SET:
+            value = _deep.rebuild(kind, node[1])
+        else:
+            value = _deep.rebuild(kind, unpacked, node[2])
+        memo[key] = projectors[kind](value)
+
+    return memo.get(id(packed), packed)
+
+
+def _load_chunk(load: Optional[Callable[[Any], Any]], chunk: Iterable[Any]) -> Iterable[Any]:
+    """Load the records of a chunk, or return the chunk if there is no load function."""
+    return chunk if load is None else map(load, chunk)
+
+
+def _project_chunk(
+    projector: Projector,
+    load: Optional[Callable[[Any], Any]],
+    mutable: bool,
+    chunk: Iterable[Any],
+) -> list[Any]:
+    """Load and project a chunk in the current process."""
+    return [projector.project(record, mutable=mutable) for record in _load_chunk(load, chunk)]
+
+
+def _pack_chunk(load: Optional[Callable[[Any], Any]], chunk: tuple) -> list[Any]:
+    """Load and pack a chunk in a worker process for the parent to project."""
+    # Materialized so that every record stays alive, and its id unique, until packing is done.
+    records = list(_load_chunk(load, chunk))
+    memo: dict[int, Any] = {}
+    return [_pack(record, memo) for record in records]
+
+
+def _unpack_chunk(projectors: tuple[Callable[[Any], Any], ...], chunk: list[Any]) -> list[Any]:
+    """Project a packed chunk in the parent process."""
+    memo: dict[int, Any] = {}
+    return [_unpack(packed, projectors, memo) for packed in chunk]
+
+
+def free_threaded() -> bool:
+    """Check if the interpreter runs without the GIL, so threads project in parallel."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def bulk_project(
+    items: Iterable[Any],
+    projector_factory: Callable[[], Projector],
+    *,
+    load: Optional[Callable[[Any], Any]] = None,
+    mutable: bool = False,
+    chunk_size: int = 1024,
+    workers: Optional[int] = None,
+    executor: Literal["auto", "serial", "thread", "process"] = "auto",
+) -> list[Any]:
+    """Deeply project a batch of records in parallel.
+
+    Args:
+        items: The records, or the inputs of load.
+        projector_factory: Callable creating the projector, which is called once.
+        load: Optional picklable callable run in the workers, which turns an item into a record.
+        mutable: Flag if the mutable projection methods should be used (see Projector.project).
+        chunk_size: The number of items sent to a worker at once.
+        workers: The number of workers, which defaults to the number of CPUs.
+        executor: The kind of pool. "auto" uses threads on free-threaded builds and projects
+            serially in the current thread otherwise, since threads cannot project in parallel
+            with the GIL. "process" uses a process pool, which only pays off when load is
+            expensive, since the parent still projects every record.
+
+    Returns:
+        The projected records, in the order of items.
+
+    Raises:
+        ValueError: If executor is not one of the kinds of pool.
+    """
+    if executor not in ("auto", "serial", "thread", "process"):
+        raise ValueError(f"{executor} is not a valid executor.")
+
+    projector = projector_factory()
+    if executor == "auto":
+        executor = "thread" if free_threaded() else "serial"
+    if executor == "serial":
+        return _project_chunk(projector, load, mutable, items)
+
+    chunks = batched(items, chunk_size)
+    if executor == "thread":
+        with ThreadPoolExecutor(workers) as pool:
+            results = pool.map(partial(_project_chunk, projector, load, mutable), chunks)
+            return [record for chunk in results for record in chunk]
+
+    with ProcessPoolExecutor(workers) as pool:
+        results = pool.map(partial(_pack_chunk, load), chunks)
+        unpack = partial(_unpack_chunk, _deep.projectors_of(projector, mutable))
+        return [record for chunk in results for record in unpack(chunk)]
+
+
+@dataclass(slots=True)
+class BulkLoad:
+    """Summary of a bulk_load block, filled in when the block exits.
+
+    Attributes:
+        elapsed_ms: The time spent in the block, during which the collector was paused.
+        frozen: The number of objects in the permanent generation after the block, which later
+            collections never scan (see gc.freeze).
+    """
+
+    elapsed_ms: float = 0.0
+    frozen: int = 0
+
+
+@contextmanager
+def bulk_load(*, freeze: bool = True) -> Iterator[BulkLoad]:
+    """Pause the cyclic garbage collector while loading a long-lived dataset, then freeze it.
+
+    Loading without the collector avoids the collections triggered by every allocation threshold,
+    which rescan the growing dataset and free the garbage of the load in between it, leaving holes
+    in the pages of the dataset. Freezing moves every object allocated so far, including the
+    dataset, to the permanent generation, so full collections stop scanning it and forked workers
+    keep sharing its pages. Frozen objects are only freed by gc.unfreeze, so the block should only
+    load data which lives until the process exits.
+
+    The collector is enabled again on exit if it was enabled on entry, so blocks may be nested. If
+    the block raises, nothing is frozen, since the partial dataset is usually dropped.
+
+    Args:
+        freeze: Flag if everything allocated so far is frozen when the block exits normally. The
+            garbage left by the load is collected first, so that it is not frozen with the dataset.
+
+    Yields:
+        The summary of the block, which is filled in when the block exits normally.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    load = BulkLoad()
+    start = time.perf_counter()
+    try:
+        yield load
+        load.elapsed_ms = (time.perf_counter() - start) * 1000
+        if freeze:
+            gc.collect()
+            gc.freeze()
+        load.frozen = gc.get_freeze_count()
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def full_collection_ms() -> float:
+    """Measure the pause of a full (generation 2) collection of the current heap.
+
+    The pause grows with the number of tracked objects outside the permanent generation, so it is
+    the figure to compare against the pause budget of a service before and after a bulk_load.
+
+    Returns:
+        The duration of gc.collect() in milliseconds.
+    """
+    start = time.perf_counter()
+    gc.collect()
+    return (time.perf_counter() - start) * 1000
+
+
+def _columns(
+    data: Any, width: int, layout: Literal["rows", "columns", "buffer"]
+) -> list[Sequence[Any]]:
+    """Split rows of a fixed width into one column per position.
+
+    Args:
+        data: The rows, in the given layout.
+        width: The number of values in every row.
+        layout: "rows" for an iterable of equal-length sequences, "columns" for a sequence of width
+            equal-length columns, and "buffer" for an object supporting the buffer protocol, either
+            two-dimensional with rows of width values or flat with consecutive rows.
+
+    Returns:
+        The columns, which all have the same length.
+
+    Raises:
+        ValueError: If width is not positive, the layout is unknown, or the data does not consist of
+            rows of width values.
+    """
+    if width <= 0:
+        raise ValueError(f"{width} is not a valid row width.")
+
+    columns: list[Sequence[Any]]
+    if layout == "rows":
+        try:
+            columns = list(zip(*data, strict=True))
+        except ValueError as exc:
+            raise ValueError("Rows must all have the same width.") from exc
+    elif layout == "columns":
+        columns = list(data)
+    elif layout == "buffer":
+        view = memoryview(data)
+        shape = view.shape or ()
+        if len(shape) == 2 and shape[1] != width:
+            raise ValueError(f"Buffer rows have {shape[1]} values instead of {width}.")
+        if len(shape) > 2:
+            raise ValueError(f"Buffers with {len(shape)} dimensions cannot be split into rows.")
+
+        flat: list[Any] = view.tolist()
+        if len(shape) == 2:
+            flat = list(chain.from_iterable(flat))
+        if len(flat) % width:
+            raise ValueError(
+                f"A buffer of {len(flat)} values cannot be split into rows of {width}."
+            )
+        columns = [flat[i::width] for i in range(width)]
+    else:
+        raise ValueError(f"{layout} is not a valid row layout.")
+
+    if not columns:
+        # Without rows, the rows layout has no columns, and a columns layout may be empty as well.
+        return [()] * width
+    if len(columns) != width:
+        raise ValueError(f"Rows have {len(columns)} values instead of {width}.")
+    if any(len(column) != len(columns[0]) for column in columns):
+        raise ValueError("Columns must all have the same length.")
+    return columns
+
+
+def build_seqs(
+    data: Any,
+    width: int,
+    *,
+    layout: Literal["rows", "columns", "buffer"] = "rows",
+    mutable: bool = False,
+    project: Optional[Callable[[Sequence], Sequence]] = None,
+) -> list[Sequence[Any]]:
+    """Build one optimized sequence of a fixed size per row.
+
+    Args:
+        data: The rows, in the given layout.
+        width: The number of values in every row, which is the size of the sequence class.
+        layout: The layout of data (see _columns): "rows", "columns" or "buffer".
+        mutable: Flag if mutable sequences should be built.
+        project: Optional projection function of the sequence class (see create_seq_class). Passing
+            the seq or mut_seq method of a recursive OptimizedCollectionProjector builds instances
+            of the class the projector uses, unless it loads classes generated ahead of time.
+
+    Returns:
+        The sequences, in row order.
+
+    Raises:
+        ValueError: If the data does not consist of rows of width values.
+    """
+    columns = _columns(data, width, layout)
+    cls = create_mut_seq_class(width, project) if mutable else create_seq_class(width, project)
+    return list(map(cls._make, *columns))
+
+
+def build_mappings(
+    data: Any,
+    keys: Sequence[Any],
+    *,
+    layout: Literal["rows", "columns", "buffer"] = "rows",
+    mutable: bool = False,
+    intern_keys: bool = False,
+    project: Optional[Callable[[Mapping], Mapping]] = None,
+) -> list[Mapping[Any, Any]]:
+    """Build one optimized mapping of a fixed keyset per row.
+
+    Args:
+        data: The rows of values, in the given layout. The values of a row are in the order of keys.
+        keys: The distinct keys of every mapping. Its length is the row width.
+        layout: The layout of data (see _columns): "rows", "columns" or "buffer".
+        mutable: Flag if mutable mappings should be built.
+        intern_keys: Flag if the str keyed classes should be used (see
+            OptimizedCollectionProjector), which requires every key to be a str.
+        project: Optional projection function of an immutable mapping class (see
+            create_mapping_class). Mutable mapping classes take none.
+
+    Returns:
+        The mappings, in row order.
+
+    Raises:
+        ValueError: If keys repeats a key, intern_keys is set and a key is not a str, project is
+            given with mutable set, or the data does not consist of rows of len(keys) values.
+    """
+    keys = tuple(keys)
+    if len(set(keys)) != len(keys):
+        raise ValueError("Mapping keys must be distinct.")
+    if intern_keys:
+        invalid = next((k for k in keys if type(k) is not str), None)
+        if invalid is not None:
+            raise ValueError(f"{invalid!r} is not a str, so it cannot be an interned key.")
+    if mutable and project is not None:
+        raise ValueError("Mutable mapping classes do not take a projection function.")
+
+    columns = _columns(data, len(keys), layout)
+    size = len(keys)
+    if mutable:
+        cls = create_str_mut_mapping_class(size) if intern_keys else create_mut_mapping_class(size)
+    elif intern_keys:
+        cls = create_str_mapping_class(size, project)
+    else:
+        cls = create_mapping_class(size, project)
+    # Every key repeats alongside its column, so _make receives the interleaved keys and values.
+    return list(map(cls._make, *chain.from_iterable(zip(map(repeat, keys), columns))))
@@ -0,0 +1,303 @@
+"""Ahead-of-time generation of the classes of a projector into an importable module.
+
+OptimizedCollectionProjector generates its classes at runtime under unique names such as
+_Size2Sequence_3, which cannot be pickled by name and are hard to recognize in profiles and heap
+dumps. write_module instead writes a module with a class statement for every class of a projector
+configuration, under stable names (Size2Sequence, Size2MutableSequenceOverflow, TupleSet, etc.),
+followed by a projector instance which uses exactly those classes:
+
+    >>> from opticol.codegen import write_module
+    >>> write_module("myapp/collections.py", 0, 3, True)
+    >>> from myapp.collections import projector
+
+The class statements use the opticol metaclasses, so the generated classes behave exactly like the
+runtime ones and pick up fixes to opticol without being regenerated. The generated classes and their
+instances can be pickled, and their methods are named after them (e.g. Size2Sequence.__getitem__).
+The module should be regenerated whenever the configuration changes.
+"""
+
+from dataclasses import dataclass
+from os import PathLike
+from typing import Optional
+
+from opticol._collections import (
+    OptimizedCounterMeta,
+    OptimizedDefaultDictMeta,
+    OptimizedDequeMeta,
+    OptimizedOrderedDictMeta,
+)
+from opticol._mapping import (
+    OptimizedMappingMeta,
+    OptimizedMutableMappingMeta,
+    OptimizedStrMappingMeta,
+    OptimizedStrMutableMappingMeta,
+)
+from opticol._meta import constructor_source, OptimizedCollectionMeta
+from opticol._sequence import OptimizedMutableSequenceMeta, OptimizedSequenceMeta
+from opticol._set import OptimizedMutableSetMeta, OptimizedSetMeta
+from opticol._tuple import OptimizedTupleMappingMeta, OptimizedTupleSetMeta
+from opticol.factory import sized_cls_name
+
+_HEADER = '''"""Optimized collection classes generated by opticol.codegen. Do not edit.
+
+Configuration: {config}
+"""
+
+from collections.abc import Mapping, MutableMapping, MutableSequence, MutableSet, Sequence, Set
+
+from opticol._collections import (
+    OptimizedCounterMeta,
+    OptimizedDefaultDictMeta,
+    OptimizedDequeMeta,
+    OptimizedOrderedDictMeta,
+)
+from opticol._mapping import (
+    OptimizedMappingMeta,
+    OptimizedMutableMappingMeta,
+    OptimizedStrMappingMeta,
+    OptimizedStrMutableMappingMeta,
+)
+from opticol._sequence import OptimizedMutableSequenceMeta, OptimizedSequenceMeta
+from opticol._set import OptimizedMutableSetMeta, OptimizedSetMeta
+from opticol._meta import preload_constructor
+from opticol._tuple import OptimizedTupleMappingMeta, OptimizedTupleSetMeta
+from opticol.projector import OptimizedCollectionProjector
+
+_new = object.__new__
+'''
+
+_CONSTRUCTOR = """
+
+{source}
+
+
+preload_constructor(_make{convert_slots})
+"""
+
+_PROJECT_FUNCTION = """
+
+def _project_{method}(value):
+    return projector.{method}(value)
+"""
+
+_CLASS = """
+
+class {name}(
+    {base},
+    metaclass={meta},{keywords}
+):
+    pass
+"""
+
+_OVERFLOW = """
+{name}Overflow = {name}._overflow_cls
+"""
+
+_SHARED = """{name}Shared = {name}._shared_cls
+"""
+
+_PROJECTOR = """
+
+projector = OptimizedCollectionProjector(
+    {min_size},
+    {max_size},
+    {recursive},
+    intern_keys={intern_keys},
+    tuple_max_size={tuple_max_size},
+    mut_headroom={mut_headroom},
+    classes=globals(),
+    persistent={persistent},
+)
+\"\"\"
+The projector using the classes of this module.
+\"\"\"
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class _Kind:
+    """A kind of sized class generated for every size of a projector."""
+
+    name: str
+    base: str
+    meta: type[OptimizedCollectionMeta]
+    method: Optional[str] = None
+    overflows: bool = False
+    interns: bool = False
+    constructs: bool = True
+
+    @property
+    def shares(self) -> bool:
+        """Flag if the classes of the kind have a shared overflow class."""
+        return self.overflows and bool(self.meta.shared_mutators)
+
+
+_SIZED_KINDS = (
+    _Kind("Sequence", "Sequence", OptimizedSequenceMeta, "seq"),
+    _Kind("MutableSequence", "MutableSequence", OptimizedMutableSequenceMeta, "mut_seq", True),
+    _Kind("Set", "Set", OptimizedSetMeta, "set"),
+    _Kind("MutableSet", "MutableSet", OptimizedMutableSetMeta, "mut_set", True),
+)
+_MAPPING_KINDS = (
+    _Kind("Mapping", "Mapping", OptimizedMappingMeta, "mapping"),
+    _Kind("MutableMapping", "MutableMapping", OptimizedMutableMappingMeta, overflows=True),
+)
+_STR_MAPPING_KINDS = (
+    _Kind("StrMapping", "Mapping", OptimizedStrMappingMeta, "mapping", interns=True),
+    _Kind(
+        "StrMutableMapping",
+        "MutableMapping",
+        OptimizedStrMutableMappingMeta,
+        overflows=True,
+        interns=True,
+    ),
+)
+_COLLECTIONS_KINDS = (
+    _Kind("Counter", "MutableMapping", OptimizedCounterMeta, overflows=True),
+    _Kind(
+        "DefaultDict", "MutableMapping", OptimizedDefaultDictMeta, overflows=True, constructs=False
+    ),
+    _Kind("OrderedDict", "MutableMapping", OptimizedOrderedDictMeta, overflows=True),
+    _Kind("Deque", "MutableSequence", OptimizedDequeMeta, overflows=True, constructs=False),
+)
+_TUPLE_KINDS = (
+    _Kind("TupleSet", "Set", OptimizedTupleSetMeta, "set"),
+    _Kind("TupleMapping", "Mapping", OptimizedTupleMappingMeta, "mapping"),
+)
+
+
+def _constructor_source(slots: tuple[str, ...], convert_slots: tuple[str, ...]) -> str:
+    """Render the definition and registration of a _make constructor of the generated classes."""
+    rendered = f", {convert_slots!r}" if convert_slots else ""
+    return _CONSTRUCTOR.format(
+        source=constructor_source(slots, convert_slots).rstrip(), convert_slots=rendered
+    )
+
+
+def _class_source(name: str, base: str, meta: str, keywords: dict[str, object]) -> str:
+    """Render the class statement of a generated class."""
+    rendered = "".join(f"\n    {key}={value}," for key, value in keywords.items())
+    return _CLASS.format(name=name, base=base, meta=meta, keywords=rendered)
+
+
+def generate_module(
+    min_size: int,
+    max_size: int,
+    recursive: bool,
+    *,
+    intern_keys: bool = False,
+    tuple_max_size: Optional[int] = None,
+    mut_headroom: int = 0,
+    persistent: bool = False,
+) -> str:
+    """Generate the source of a module defining the classes of a projector configuration.
+
+    The arguments match those of OptimizedCollectionProjector, which the module instantiates as its
+    projector attribute.
+
+    Args:
+        min_size: Minimum collection size to optimize (inclusive).
+        max_size: Maximum collection size to optimize (inclusive).
+        recursive: Flag if collection instances created from runtime operations should also be
+            optimized via the projector of the module.
+        intern_keys: Flag if mappings should use the str keyed classes.
+        tuple_max_size: Optional maximum size (inclusive) of the tuple-backed tier.
+        mut_headroom: Number of free slots given to mutable collections.
+        persistent: Flag if large immutable sequences and mappings use the persistent classes.
+
+    Returns:
+        The source of the module.
+    """
+    config = (
+        f"min_size={min_size}, max_size={max_size}, recursive={recursive}, "
+        f"intern_keys={intern_keys}, tuple_max_size={tuple_max_size}, mut_headroom={mut_headroom}, "
+        f"persistent={persistent}"
+    )
+    parts = [_HEADER.format(config=config)]
+
+    def project(kind: _Kind) -> dict[str, object]:
+        if kind.method is None:
+            return {}
+        return {"project": f"_project_{kind.method}" if recursive else None}
+
+    mapping_kinds = _STR_MAPPING_KINDS if intern_keys else _MAPPING_KINDS
+    sized = [
+        (kind, size, sized_cls_name(size, kind.name))
+        for kind in _SIZED_KINDS + mapping_kinds + _COLLECTIONS_KINDS
+        for size in range(min_size, max_size + 1)
+    ]
+    sized.extend((kind, 0, kind.name) for kind in _TUPLE_KINDS)
+
+    # Every distinct constructor once, in order of first use.
+    constructors: dict[tuple[tuple[str, ...], tuple[str, ...]], None] = {}
+    for kind, size, _ in sized:
+        if not kind.constructs:
+            continue
+        slots = kind.meta.slot_names(size)
+        constructors[(slots, slots[0::2] if kind.interns else ())] = None
+    parts.extend(_constructor_source(*key) for key in constructors)
+    parts.append("\n\ndel _make\n")
+
+    if recursive:
+        methods = dict.fromkeys(kind.method for kind, _, _ in sized if kind.method is not None)
+        parts.extend(_PROJECT_FUNCTION.format(method=method) for method in methods)
+
+    for kind, size, name in sized:
+        keywords = project(kind)
+        if kind not in _TUPLE_KINDS:
+            keywords = {"internal_size": size, **keywords}
+        parts.append(_class_source(name, kind.base, kind.meta.__name__, keywords))
+        if kind.overflows:
+            parts.append(_OVERFLOW.format(name=name))
+        if kind.shares:
+            parts.append(_SHARED.format(name=name))
+
+    parts.append(
+        _PROJECTOR.format(
+            min_size=min_size,
+            max_size=max_size,
+            recursive=recursive,
+            intern_keys=intern_keys,
+            tuple_max_size=tuple_max_size,
+            mut_headroom=mut_headroom,
+            persistent=persistent,
+        )
+    )
+    return "".join(parts)
+
+
+def write_module(
+    path: str | PathLike[str],
+    min_size: int,
+    max_size: int,
+    recursive: bool,
+    *,
+    intern_keys: bool = False,
+    tuple_max_size: Optional[int] = None,
+    mut_headroom: int = 0,
+    persistent: bool = False,
+) -> None:
+    """Write a module defining the classes of a projector configuration (see generate_module).
+
+    Args:
+        path: The path of the module file, which is overwritten.
+        min_size: Minimum collection size to optimize (inclusive).
+        max_size: Maximum collection size to optimize (inclusive).
+        recursive: Flag if collection instances created from runtime operations should also be
+            optimized via the projector of the module.
+        intern_keys: Flag if mappings should use the str keyed classes.
+        tuple_max_size: Optional maximum size (inclusive) of the tuple-backed tier.
+        mut_headroom: Number of free slots given to mutable collections.
+        persistent: Flag if large immutable sequences and mappings use the persistent classes.
+    """
+    source = generate_module(
+        min_size,
+        max_size,
+        recursive,
+        intern_keys=intern_keys,
+        tuple_max_size=tuple_max_size,
+        mut_headroom=mut_headroom,
+        persistent=persistent,
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(source)
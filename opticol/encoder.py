@@ -0,0 +1,97 @@
+"""JSON encoding of optimized collections straight from their slots.
+
+The json module only encodes builtin dicts, lists and tuples natively, and hands every other object
+to the default hook of the encoder. The usual hook for optimized collections converts them with
+dict(obj) or list(obj), which iterates the generated __iter__ and __getitem__ methods one element at
+a time in Python.
+
+OptimizedJSONEncoder instead reads the slots of an instance in a single C level call, so a sequence
+or set is handed to the encoder as the tuple of its slot values and a mapping as a dict zipped from
+its interleaved key and value slots. Overflowed mutable collections hand over the builtin collection
+they already hold, and the tuple-backed set its internal tuple, without any copy. The encoder itself
+stays the C accelerated one of the json module, and encoding streams through iterencode as usual:
+
+    >>> import opticol
+    >>> from opticol.encoder import dumps, iterencode
+    >>> dumps(opticol.mapping({"a": opticol.seq([1, 2])}))
+    '{"a": [1, 2]}'
+    >>> for chunk in iterencode(records):
+    ...     out.write(chunk)
+
+Sets are encoded as JSON arrays. Any other Mapping is encoded through its items, and any other Set
+or Sequence through iteration.
+"""
+
+from collections.abc import Callable, Iterator
+import json
+from typing import Any, IO, Optional
+
+from opticol import _convert
+
+_CONVERTERS: dict[type, Optional[Callable[[Any], Any]]] = {}
+"""
+The converter of every type handed to the default hook so far, or None if it is not encoded.
+"""
+
+
+class OptimizedJSONEncoder(json.JSONEncoder):
+    """JSONEncoder which encodes optimized and other collections directly from their storage.
+
+    The constructor arguments are the ones of json.JSONEncoder. A default function passed to it is
+    still called for objects which are not collections.
+    """
+
+    def __init__(self, *, default: Optional[Callable[[Any], Any]] = None, **kwargs: Any) -> None:
+        # The default argument of JSONEncoder would replace the default method.
+        super().__init__(**kwargs)
+        self._fallback = default
+
+    def default(self, o: Any) -> Any:
+        cls = type(o)
+        try:
+            converter = _CONVERTERS[cls]
+        except KeyError:
+            converter = _CONVERTERS[cls] = _convert.converter(cls)
+
+        if converter is None:
+            if self._fallback is not None:
+                return self._fallback(o)
+            return super().default(o)
+        return converter(o)
+
+
+def iterencode(obj: Any, **kwargs: Any) -> Iterator[str]:
+    """Encode a value as JSON, yielding the encoding in chunks.
+
+    Args:
+        obj: The value to encode.
+        **kwargs: Keyword arguments of json.JSONEncoder.
+
+    Returns:
+        An iterator over the chunks of the encoding.
+    """
+    return OptimizedJSONEncoder(**kwargs).iterencode(obj)
+
+
+def dumps(obj: Any, **kwargs: Any) -> str:
+    """Encode a value as a JSON str (see json.dumps).
+
+    Args:
+        obj: The value to encode.
+        **kwargs: Keyword arguments of json.dumps other than cls.
+
+    Returns:
+        The JSON encoding of the value.
+    """
+    return json.dumps(obj, cls=OptimizedJSONEncoder, **kwargs)
+
+
+def dump(obj: Any, fp: IO[str], **kwargs: Any) -> None:
+    """Encode a value as JSON into a text file, writing the encoding in chunks (see json.dump).
+
+    Args:
+        obj: The value to encode.
+        fp: The file to write to.
+        **kwargs: Keyword arguments of json.dump other than cls.
+    """
+    json.dump(obj, fp, cls=OptimizedJSONEncoder, **kwargs)
@@ -27,12 +27,26 @@ from collections.abc import (
     Sequence,
     Set,
 )
+from enum import Enum
 import functools
 from typing import Optional
 
-from opticol._mapping import OptimizedMappingMeta, OptimizedMutableMappingMeta
+from opticol._collections import (
+    OptimizedCounterMeta,
+    OptimizedDefaultDictMeta,
+    OptimizedDequeMeta,
+    OptimizedOrderedDictMeta,
+)
+from opticol._enum import OptimizedEnumMappingMeta, OptimizedEnumMutableMappingMeta
+from opticol._mapping import (
+    OptimizedMappingMeta,
+    OptimizedMutableMappingMeta,
+    OptimizedStrMappingMeta,
+    OptimizedStrMutableMappingMeta,
+)
 from opticol._sequence import OptimizedMutableSequenceMeta, OptimizedSequenceMeta
 from opticol._set import OptimizedMutableSetMeta, OptimizedSetMeta
+from opticol._tuple import OptimizedTupleMappingMeta, OptimizedTupleSetMeta
 
 _cls_index: int = 0
 
@@ -52,6 +66,20 @@ def _unique_cls_name(name: str) -> str:
     return f"{name}_{_cls_index}"
 
 
+def sized_cls_name(size: int, kind: str) -> str:
+    """
+    Create the stable name of a sized class, as used by the modules written by opticol.codegen.
+
+    Args:
+        size: The number of elements the class stores in slots.
+        kind: The collection kind, such as "Sequence" or "StrMutableMapping".
+
+    Returns:
+        The class name, such as "Size2Sequence".
+    """
+    return f"Size{size}{kind}"
+
+
 def cached(func):
     """Cache function results based on arguments to avoid duplicate work.
 
@@ -97,7 +125,7 @@ def create_seq_class(size: int, project: Optional[Callable[[Sequence], Sequence]
     return OptimizedSequenceMeta(
         _unique_cls_name(f"_Size{size}Sequence"),
         (Sequence,),
-        {},
+        {"__module__": __name__},
         internal_size=size,
         project=project,
     )
@@ -122,7 +150,7 @@ def create_mut_seq_class(
     return OptimizedMutableSequenceMeta(
         _unique_cls_name(f"_Size{size}MutableSequence"),
         (MutableSequence,),
-        {},
+        {"__module__": __name__},
         internal_size=size,
         project=project,
     )
@@ -140,7 +168,11 @@ def create_set_class(size: int, project: Optional[Callable[[Set], Set]] = None)
         A Set class optimized for exactly 'size' elements.
     """
     return OptimizedSetMeta(
-        _unique_cls_name(f"_Size{size}Set"), (Set,), {}, internal_size=size, project=project
+        _unique_cls_name(f"_Size{size}Set"),
+        (Set,),
+        {"__module__": __name__},
+        internal_size=size,
+        project=project,
     )
 
 
@@ -163,24 +195,29 @@ def create_mut_set_class(
     return OptimizedMutableSetMeta(
         _unique_cls_name(f"_Size{size}MutableSet"),
         (MutableSet,),
-        {},
+        {"__module__": __name__},
         internal_size=size,
         project=project,
     )
 
 
 @cached
-def create_mapping_class(size: int) -> type:
+def create_mapping_class(size: int, project: Optional[Callable[[Mapping], Mapping]] = None) -> type:
     """Create an optimized immutable Mapping class for the specified size.
 
     Args:
         size: Number of key-value pairs the mapping will hold.
+        project: Optional function for optimizing the results of persistent updates.
 
     Returns:
         A Mapping class optimized for exactly 'size' key-value pairs.
     """
     return OptimizedMappingMeta(
-        _unique_cls_name(f"_Size{size}Mapping"), (Mapping,), {}, internal_size=size
+        _unique_cls_name(f"_Size{size}Mapping"),
+        (Mapping,),
+        {"__module__": __name__},
+        internal_size=size,
+        project=project,
     )
 
 
@@ -200,6 +237,211 @@ def create_mut_mapping_class(size: int) -> type:
     return OptimizedMutableMappingMeta(
         _unique_cls_name(f"_Size{size}MutableMapping"),
         (MutableMapping,),
-        {},
+        {"__module__": __name__},
+        internal_size=size,
+    )
+
+
+@cached
+def create_str_mapping_class(
+    size: int, project: Optional[Callable[[Mapping], Mapping]] = None
+) -> type:
+    """Create an optimized immutable Mapping class for the specified size with str keys.
+
+    The str keys of the created class are interned at construction, so equal keys are shared across
+    instances and lookups with interned keys match by identity. Keys of other types remain
+    supported.
+
+    Args:
+        size: Number of key-value pairs the mapping will hold.
+        project: Optional function for optimizing the results of persistent updates.
+
+    Returns:
+        A Mapping class optimized for exactly 'size' key-value pairs.
+    """
+    return OptimizedStrMappingMeta(
+        _unique_cls_name(f"_Size{size}StrMapping"),
+        (Mapping,),
+        {"__module__": __name__},
+        internal_size=size,
+        project=project,
+    )
+
+
+@cached
+def create_str_mut_mapping_class(size: int) -> type:
+    """Create an optimized MutableMapping class for the specified size with str keys.
+
+    The created class interns str keys as they are written to slots and supports overflow to
+    standard dict when key-value pairs exceed the allocated slot count.
+
+    Args:
+        size: Number of slots to allocate for key-value pairs.
+
+    Returns:
+        A MutableMapping class optimized for up to 'size' key-value pairs.
+    """
+    return OptimizedStrMutableMappingMeta(
+        _unique_cls_name(f"_Size{size}StrMutableMapping"),
+        (MutableMapping,),
+        {"__module__": __name__},
+        internal_size=size,
+    )
+
+
+@cached
+def create_tuple_set_class(project: Optional[Callable[[Set], Set]] = None) -> type:
+    """Create a tuple-backed immutable Set class for mid-size sets.
+
+    A single class serves every size up to TUPLE_SET_MAX_SIZE elements.
+
+    Args:
+        project: Optional function for recursively optimizing nested sets.
+
+    Returns:
+        A Set class storing its elements in one tuple with a compact hash index.
+    """
+    return OptimizedTupleSetMeta(
+        _unique_cls_name("_TupleSet"), (Set,), {"__module__": __name__}, project=project
+    )
+
+
+@cached
+def create_tuple_mapping_class(project: Optional[Callable[[Mapping], Mapping]] = None) -> type:
+    """Create a tuple-backed immutable Mapping class for mid-size mappings.
+
+    A single class serves every size.
+
+    Args:
+        project: Optional function for optimizing the results of persistent updates.
+
+    Returns:
+        A Mapping class storing its keys and values in two parallel tuples.
+    """
+    return OptimizedTupleMappingMeta(
+        _unique_cls_name("_TupleMapping"), (Mapping,), {"__module__": __name__}, project=project
+    )
+
+
+@cached
+def create_enum_mapping_class(key_type: type[Enum]) -> type:
+    """Create an optimized immutable Mapping class keyed by members of an Enum type.
+
+    Args:
+        key_type: The Enum type whose members may be used as keys.
+
+    Returns:
+        A Mapping class with one slot for each member of 'key_type'.
+    """
+    return OptimizedEnumMappingMeta(
+        _unique_cls_name(f"_{key_type.__name__}Mapping"),
+        (Mapping,),
+        {"__module__": __name__},
+        key_type=key_type,
+    )
+
+
+@cached
+def create_enum_mut_mapping_class(key_type: type[Enum]) -> type:
+    """Create an optimized MutableMapping class keyed by members of an Enum type.
+
+    The created class never overflows since every possible key already owns a slot.
+
+    Args:
+        key_type: The Enum type whose members may be used as keys.
+
+    Returns:
+        A MutableMapping class with one slot for each member of 'key_type'.
+    """
+    return OptimizedEnumMutableMappingMeta(
+        _unique_cls_name(f"_{key_type.__name__}MutableMapping"),
+        (MutableMapping,),
+        {"__module__": __name__},
+        key_type=key_type,
+    )
+
+
+@cached
+def create_counter_class(size: int) -> type:
+    """Create an optimized Counter class for the specified size.
+
+    The created class supports overflow to a builtin Counter when the counted keys exceed the
+    allocated slot count.
+
+    Args:
+        size: Number of slots to allocate for keys and their counts.
+
+    Returns:
+        A MutableMapping class with the Counter API, optimized for up to 'size' keys.
+    """
+    return OptimizedCounterMeta(
+        _unique_cls_name(f"_Size{size}Counter"),
+        (MutableMapping,),
+        {"__module__": __name__},
+        internal_size=size,
+    )
+
+
+@cached
+def create_default_dict_class(size: int) -> type:
+    """Create an optimized defaultdict class for the specified size.
+
+    The created class takes the default factory as second constructor argument, defaulting to the
+    default_factory of the mapping it is created from, and supports overflow to a builtin
+    defaultdict when key-value pairs exceed the allocated slot count.
+
+    Args:
+        size: Number of slots to allocate for key-value pairs.
+
+    Returns:
+        A MutableMapping class with the defaultdict API, optimized for up to 'size' key-value pairs.
+    """
+    return OptimizedDefaultDictMeta(
+        _unique_cls_name(f"_Size{size}DefaultDict"),
+        (MutableMapping,),
+        {"__module__": __name__},
+        internal_size=size,
+    )
+
+
+@cached
+def create_ordered_dict_class(size: int) -> type:
+    """Create an optimized OrderedDict class for the specified size.
+
+    The created class supports overflow to a builtin OrderedDict when key-value pairs exceed the
+    allocated slot count.
+
+    Args:
+        size: Number of slots to allocate for key-value pairs.
+
+    Returns:
+        A MutableMapping class with the OrderedDict API, optimized for up to 'size' key-value pairs.
+    """
+    return OptimizedOrderedDictMeta(
+        _unique_cls_name(f"_Size{size}OrderedDict"),
+        (MutableMapping,),
+        {"__module__": __name__},
+        internal_size=size,
+    )
+
+
+@cached
+def create_deque_class(size: int) -> type:
+    """Create an optimized deque class for the specified size.
+
+    The created class takes maxlen as second constructor argument, defaulting to the maxlen of the
+    iterable it is created from, and supports overflow to a builtin deque when elements exceed the
+    allocated slot count.
+
+    Args:
+        size: Number of slots to allocate for elements.
+
+    Returns:
+        A MutableSequence class with the deque API, optimized for up to 'size' elements.
+    """
+    return OptimizedDequeMeta(
+        _unique_cls_name(f"_Size{size}Deque"),
+        (MutableSequence,),
+        {"__module__": __name__},
         internal_size=size,
     )
@@ -0,0 +1,151 @@
+"""Class decorator which projects collection fields on construction.
+
+Data model classes often hold small collections in fields annotated with the collection ABCs.
+Rather than calling a projector by hand in every __post_init__, such classes can be decorated with
+projected(), which inspects the field annotations once at class creation and generates an __init__
+that projects every collection field with the given Projector right after the original __init__
+(including any __post_init__) has run:
+
+    >>> from dataclasses import dataclass
+    >>> from collections.abc import Mapping, Sequence
+    >>> import opticol
+    >>> @opticol.projected(opticol.default)
+    ... @dataclass(slots=True)
+    ... class Record:
+    ...     tags: Sequence[str]
+    ...     attributes: Mapping[str, int] | None = None
+
+The decorator must be applied on top of @dataclass, since the dataclass decorator replaces
+__init__. Fields are mapped by the origin of their annotation:
+
+* Sequence -> Projector.seq, MutableSequence -> Projector.mut_seq
+* Set -> Projector.set, MutableSet -> Projector.mut_set
+* Mapping -> Projector.mapping, MutableMapping -> Projector.mut_mapping
+
+Optional annotations (X | None) are projected only when the value is not None. Fields annotated with
+builtin types such as list or dict are left untouched, since the optimized classes are not
+instances of those types.
+"""
+
+from collections.abc import (
+    Callable,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    MutableSet,
+    Sequence,
+    Set,
+)
+import dataclasses
+import functools
+import types
+import typing
+from typing import Any
+
+from opticol.projector import Projector
+
+# Ordered from the most to the least specific ABC, since every mutable ABC is also a subclass of its
+# immutable counterpart.
+_METHOD_NAMES: tuple[tuple[type, str], ...] = (
+    (MutableSequence, "mut_seq"),
+    (MutableSet, "mut_set"),
+    (MutableMapping, "mut_mapping"),
+    (Sequence, "seq"),
+    (Set, "set"),
+    (Mapping, "mapping"),
+)
+
+
+def _resolve(annotation: Any) -> tuple[str, bool] | None:
+    """Find the projector method for a field annotation.
+
+    Args:
+        annotation: The resolved type annotation of the field.
+
+    Returns:
+        The name of the projector method and a flag if the field may be None, or None if the field
+        is not a projectable collection.
+    """
+    optional = False
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return None
+        optional = True
+        annotation = args[0]
+
+    origin = typing.get_origin(annotation) or annotation
+    for abc, name in _METHOD_NAMES:
+        if origin is abc:
+            return name, optional
+    return None
+
+
+def _field_names(cls: type) -> list[str]:
+    """List the names of the instance fields of a class.
+
+    Args:
+        cls: A dataclass or a class with annotated instance attributes.
+
+    Returns:
+        The field names in definition order.
+    """
+    if dataclasses.is_dataclass(cls):
+        return [f.name for f in dataclasses.fields(cls)]
+
+    return [
+        name
+        for name, annotation in typing.get_type_hints(cls).items()
+        if typing.get_origin(annotation) is not typing.ClassVar
+    ]
+
+
+def projected[T: type](projector: Projector) -> Callable[[T], T]:
+    """Create a class decorator which projects the collection fields of each new instance.
+
+    The annotations are resolved once when the decorator is applied. The generated __init__ calls
+    the original __init__ and then assigns each projected field with straight-line code, so no
+    reflection happens per instance. Frozen dataclasses are supported.
+
+    Args:
+        projector: The projector used to project the collection fields.
+
+    Returns:
+        A decorator which replaces the __init__ of the decorated class and returns the class.
+    """
+
+    def decorator(cls: T) -> T:
+        hints = typing.get_type_hints(cls)
+        frozen = dataclasses.is_dataclass(cls) and cls.__dataclass_params__.frozen  # type: ignore
+        # Read and replaced through getattr and setattr, since cls is typed as an instance of type.
+        original = getattr(cls, "__init__")
+
+        env: dict[str, Any] = {"__opticol_init": original, "__opticol_set": object.__setattr__}
+        lines = [
+            "def __init__(self, *args, **kwargs):",
+            "    __opticol_init(self, *args, **kwargs)",
+        ]
+        for i, name in enumerate(_field_names(cls)):
+            resolved = _resolve(hints.get(name))
+            if resolved is None:
+                continue
+
+            method_name, optional = resolved
+            env[f"__opticol_p{i}"] = getattr(projector, method_name)
+            value = f"__opticol_p{i}(self.{name})"
+            assign = (
+                f"__opticol_set(self, {name!r}, {value})" if frozen else f"self.{name} = {value}"
+            )
+            if optional:
+                lines.append(f"    if self.{name} is not None:")
+                lines.append(f"        {assign}")
+            else:
+                lines.append(f"    {assign}")
+
+        exec("\n".join(lines), env)  # pylint: disable=exec-used
+        # Copies the name, docstring and annotations, and sets __wrapped__, so inspect.signature
+        # reports the parameters of the original __init__.
+        setattr(cls, "__init__", functools.update_wrapper(env["__init__"], original))
+        return cls
+
+    return decorator
@@ -0,0 +1,148 @@
+"""Bounded interning of the leaf values stored by projected collections.
+
+Projected collections store their elements in slots, but the elements themselves are usually
+duplicated across instances: every record of a decoded JSON payload holds its own copy of a repeated
+status string or float. An InternTable maps every value to a canonical equal object, so passing it
+as the interner of OptimizedCollectionProjector makes equal leaf values (and mapping keys) share one
+object across every projected collection:
+
+    >>> from opticol.interning import InternTable
+    >>> from opticol.projector import OptimizedCollectionProjector
+    >>> table = InternTable(max_entries=100_000)
+    >>> projector = OptimizedCollectionProjector(0, 5, True, interner=table)
+    >>> records = projector.project(payload)
+    >>> table.stats()[str].dedups
+    48211
+
+Only values of exact types known to be immutable are interned, and only where equality implies
+interchangeability: floats equal to zero (0.0 and -0.0 are equal) and NaN are left alone, and tuples
+are interned only if they consist of str, bytes, int, bool and None values, keyed by the types of
+their elements since (1,) == (True,) == (1.0,).
+"""
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+import sys
+from typing import Any, Optional
+
+_TUPLE_ELEMENT_TYPES = frozenset((str, bytes, int, bool, type(None)))
+
+DEFAULT_TYPES = (str, bytes, float, tuple)
+"""
+The types interned by an InternTable unless configured otherwise. Ints are left out, since CPython
+already shares the small ones and large ones tend to be unique identifiers, which fill the table.
+"""
+
+
+def _float_key(value: float) -> Optional[float]:
+    """Key a float, or None for the zeros and NaN, which cannot be interned safely."""
+    return value if value and value == value else None
+
+
+def _tuple_key(value: tuple) -> Optional[tuple]:
+    """Key a tuple of scalars by its elements and their types, or None for other tuples."""
+    types = tuple(map(type, value))
+    if not _TUPLE_ELEMENT_TYPES.issuperset(types):
+        return None
+    return (value, types)
+
+
+_KEYS: dict[type, Callable[[Any], Any]] = {float: _float_key, tuple: _tuple_key}
+"""
+Key functions of the types for which the value itself is not a safe key.
+"""
+
+
+@dataclass(slots=True)
+class InternStats:
+    """Deduplication statistics of the values of one type.
+
+    Attributes:
+        lookups: The number of values looked up in the table.
+        dedups: The number of values replaced by an equal, distinct object of the table.
+        saved_bytes: The total size (sys.getsizeof) of the replaced values, which can be freed once
+            nothing else references them.
+        entries: The number of canonical values of the type held by the table.
+    """
+
+    lookups: int = 0
+    dedups: int = 0
+    saved_bytes: int = 0
+    entries: int = 0
+
+
+class InternTable:
+    """Bounded table mapping hashable immutable values to canonical equal objects.
+
+    Once the table holds max_entries values it stops growing, and values which are not in it are
+    returned unchanged. The values seen first, which for repeated values are the most frequent ones,
+    therefore stay canonical.
+
+    Attributes:
+        max_entries: The maximum number of canonical values held by the table.
+    """
+
+    def __init__(self, max_entries: int = 65536, types: Iterable[type] = DEFAULT_TYPES) -> None:
+        """Create an empty table.
+
+        Args:
+            max_entries: The maximum number of canonical values held by the table.
+            types: The exact types of the values which are interned. Values of types without a
+                dedicated key function are keyed by themselves, so equal values of such a type must
+                be interchangeable.
+        """
+        self.max_entries = max_entries
+        self._entries = 0
+        self._kinds: dict[type, tuple[dict[Any, Any], InternStats, Optional[Callable]]] = {
+            cls: ({}, InternStats(), _KEYS.get(cls)) for cls in types
+        }
+
+    def __call__[T](self, value: T, /) -> T:
+        """Return the canonical object equal to a value, adding the value if it has none.
+
+        Args:
+            value: The value to intern.
+
+        Returns:
+            The canonical equal object, or value itself.
+        """
+        kind = self._kinds.get(type(value))
+        if kind is None:
+            return value
+
+        table, stats, key_of = kind
+        key = value if key_of is None else key_of(value)
+        if key is None:
+            return value
+
+        stats.lookups += 1
+        canonical = table.get(key)
+        if canonical is None:
+            if self._entries < self.max_entries:
+                table[key] = value
+                self._entries += 1
+                stats.entries += 1
+            return value
+
+        if canonical is not value:
+            stats.dedups += 1
+            stats.saved_bytes += sys.getsizeof(value)
+        return canonical
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def stats(self) -> dict[type, InternStats]:
+        """Snapshot the deduplication statistics of every interned type.
+
+        Returns:
+            A copy of the statistics of every type the table was configured with.
+        """
+        return {cls: replace(stats) for cls, (_, stats, _) in self._kinds.items()}
+
+    def clear(self) -> None:
+        """Drop every canonical value and reset the statistics."""
+        self._entries = 0
+        for cls, (table, _, key_of) in self._kinds.items():
+            table.clear()
+            self._kinds[cls] = (table, InternStats(), key_of)
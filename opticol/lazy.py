@@ -0,0 +1,356 @@
+"""Lazy projection of nested collections which are rarely read.
+
+Deep projection rebuilds and projects every collection of a payload up front, although in many
+payloads most nested collections are never read. LazyProjector wraps another projector and returns
+small proxy objects instead, which implement the collection ABC of the value they wrap and project
+it through the wrapped projector on first access. The proxy then drops the original and delegates
+to the projected collection:
+
+    >>> from opticol.lazy import LazyProjector
+    >>> lazy = LazyProjector(opticol.default)
+    >>> payload = lazy.project(json.loads(body))   # Only wraps the root
+    >>> payload["user"]["name"]                     # Projects the root and payload["user"]
+    >>> lazy.stats().materialized_fraction
+    0.02
+
+When project materializes a collection, every nested collection it holds is wrapped in a proxy of
+its own, so only the collections on the path to the values read are ever projected. Any access
+materializes a proxy, including len, iteration and equality. Proxies cost a small object each and
+add one call to every access, so lazy projection trades steady-state memory and access time for
+ingest time.
+
+Materialization is not synchronized: two threads materializing the same proxy at once may both
+project it, and one of the projections is kept.
+"""
+
+from collections.abc import (
+    Callable,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    MutableSet,
+    Sequence,
+    Set,
+)
+from dataclasses import dataclass
+from typing import Any, ClassVar, Optional
+
+from opticol import _deep
+from opticol.projector import Projector
+
+
+@dataclass(slots=True)
+class LazyStats:
+    """Materialization statistics of the proxies created by a LazyProjector.
+
+    Attributes:
+        proxies: The number of proxies created.
+        materialized: The number of proxies which were accessed, and projected their value.
+    """
+
+    proxies: int = 0
+    materialized: int = 0
+
+    @property
+    def materialized_fraction(self) -> float:
+        """The fraction of the proxies which were materialized, or 0.0 if there are none."""
+        return self.materialized / self.proxies if self.proxies else 0.0
+
+
+class _Materializer:
+    """Projects the values of the proxies which share one projection configuration."""
+
+    __slots__ = ("projectors", "stats", "deep", "proxies")
+
+    def __init__(
+        self,
+        projectors: tuple[Callable[[Any], Any], ...],
+        stats: LazyStats,
+        deep: bool,
+        mutable: bool,
+    ) -> None:
+        self.projectors = projectors
+        self.stats = stats
+        self.deep = deep
+        self.proxies = _MUTABLE_PROXIES if mutable else _PROXIES
+
+    def wrap(self, value: Any) -> Any:
+        """Wrap a collection in a proxy, returning other values unchanged."""
+        if isinstance(value, _LazyProxy):
+            return value
+
+        kind = _deep.kind_of(value)
+        if kind is None:
+            return value
+        if kind >= len(self.proxies):
+            # There are no proxies for the types of the collections module, which are projected
+            # eagerly instead.
+            if self.deep:
+                return _deep.run(_deep.project_steps(self.projectors, value))
+            return self.projectors[kind](value)
+
+        self.stats.proxies += 1
+        return self.proxies[kind](value, self)
+
+    def __call__(self, value: Any, kind: int) -> Any:
+        self.stats.materialized += 1
+        if self.deep:
+            # Mapping keys and set elements stay unchanged, as in deep projection.
+            wrap = self.wrap
+            if kind == _deep.MAPPING:
+                value = {k: wrap(v) for k, v in value.items()}
+            elif kind == _deep.SEQUENCE:
+                value = [wrap(v) for v in value]
+            else:
+                value = set(value)
+        return self.projectors[kind](value)
+
+
+class _LazyProxy:
+    """Base of the proxies, holding the original value until it is first accessed."""
+
+    __slots__ = ("_value", "_materializer")
+    _kind: ClassVar[int]
+
+    def __init__(self, value: Any, materializer: _Materializer) -> None:
+        self._value = value
+        self._materializer: Optional[_Materializer] = materializer
+
+    def _target(self) -> Any:
+        materializer = self._materializer
+        if materializer is None:
+            return self._value
+
+        value = self._value = materializer(self._value, self._kind)
+        self._materializer = None
+        return value
+
+    @property
+    def materialized(self) -> bool:
+        """Flag if the proxy has projected its value."""
+        return self._materializer is None
+
+    def __len__(self) -> int:
+        return len(self._target())
+
+    def __iter__(self):
+        return iter(self._target())
+
+    def __contains__(self, value: Any) -> bool:
+        return value in self._target()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, _LazyProxy):
+            other = other._target()
+        return self._target() == other
+
+    def __hash__(self) -> int:
+        return hash(self._target())
+
+    def __repr__(self) -> str:
+        return repr(self._target())
+
+
+class _LazySequence(_LazyProxy, Sequence):
+    __slots__ = ()
+    _kind = _deep.SEQUENCE
+
+    def __getitem__(self, index):
+        return self._target()[index]
+
+    def __reversed__(self):
+        return reversed(self._target())
+
+    def index(self, value, *args):
+        return self._target().index(value, *args)
+
+    def count(self, value):
+        return self._target().count(value)
+
+
+class _LazySet(_LazyProxy, Set):
+    __slots__ = ()
+    _kind = _deep.SET
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return frozenset(it)
+
+
+class _LazyMapping(_LazyProxy, Mapping):
+    __slots__ = ()
+    _kind = _deep.MAPPING
+
+    def __getitem__(self, key):
+        return self._target()[key]
+
+    def get(self, key, default=None):
+        return self._target().get(key, default)
+
+    def keys(self):
+        return self._target().keys()
+
+    def items(self):
+        return self._target().items()
+
+    def values(self):
+        return self._target().values()
+
+
+class _LazyMutableSequence(_LazySequence, MutableSequence):
+    __slots__ = ()
+
+    def __setitem__(self, index, value):
+        self._target()[index] = value
+
+    def __delitem__(self, index):
+        del self._target()[index]
+
+    def insert(self, index, value):
+        self._target().insert(index, value)
+
+    def append(self, value):
+        self._target().append(value)
+
+    def extend(self, values):
+        self._target().extend(values)
+
+    def pop(self, index=-1):
+        return self._target().pop(index)
+
+    def clear(self):
+        self._target().clear()
+
+
+class _LazyMutableSet(_LazySet, MutableSet):
+    __slots__ = ()
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return set(it)
+
+    def add(self, value):
+        self._target().add(value)
+
+    def discard(self, value):
+        self._target().discard(value)
+
+    def remove(self, value):
+        self._target().remove(value)
+
+    def pop(self):
+        return self._target().pop()
+
+    def clear(self):
+        self._target().clear()
+
+
+class _LazyMutableMapping(_LazyMapping, MutableMapping):
+    __slots__ = ()
+
+    def __setitem__(self, key, value):
+        self._target()[key] = value
+
+    def __delitem__(self, key):
+        del self._target()[key]
+
+    def pop(self, key, *default):
+        return self._target().pop(key, *default)
+
+    def clear(self):
+        self._target().clear()
+
+
+# The proxy classes of every kind, indexed by the kinds of _deep.
+_PROXIES = (_LazyMapping, _LazySet, _LazySequence)
+_MUTABLE_PROXIES = (_LazyMutableMapping, _LazyMutableSet, _LazyMutableSequence)
+
+
+class LazyProjector(Projector):
+    """Projector returning proxies which project their collection through another projector on
+    first access.
+
+    The projection methods (such as seq) return a proxy of the collection, which is projected by
+    the same method of the wrapped projector when it is first accessed. project and aproject only
+    wrap the root, and nested collections are wrapped when their parent is materialized.
+    """
+
+    def __init__(self, projector: Projector) -> None:
+        """Create a lazy projector.
+
+        Args:
+            projector: The projector applied to the collections when they are first accessed.
+        """
+        self._projector = projector
+        self._stats = LazyStats()
+        deep = _deep.projectors_of(projector, False)
+        mut_deep = _deep.projectors_of(projector, True)
+        self._shallow = _Materializer(deep, self._stats, False, False)
+        self._mut_shallow = _Materializer(mut_deep, self._stats, False, True)
+        self._deep = _Materializer(deep, self._stats, True, False)
+        self._mut_deep = _Materializer(mut_deep, self._stats, True, True)
+
+    def seq[T](self, seq: Sequence[T], /) -> Sequence[T]:
+        return _LazySequence(seq, self._count(self._shallow))
+
+    def mut_seq[T](self, mut_seq: MutableSequence[T], /) -> MutableSequence[T]:
+        return _LazyMutableSequence(mut_seq, self._count(self._mut_shallow))
+
+    def set[T](self, s: Set[T], /) -> Set[T]:
+        return _LazySet(s, self._count(self._shallow))
+
+    def mut_set[T](self, mut_set: MutableSet[T], /) -> MutableSet[T]:
+        return _LazyMutableSet(mut_set, self._count(self._mut_shallow))
+
+    def mapping[K, V](self, mapping: Mapping[K, V], /) -> Mapping[K, V]:
+        return _LazyMapping(mapping, self._count(self._shallow))
+
+    def mut_mapping[K, V](self, mut_mapping: MutableMapping[K, V], /) -> MutableMapping[K, V]:
+        return _LazyMutableMapping(mut_mapping, self._count(self._mut_shallow))
+
+    def project(self, value: Any, /, *, mutable: bool = False) -> Any:
+        """Wrap the root of a graph of nested collections in a proxy, which projects lazily.
+
+        Unlike deep projection, cycles are not detected, and a collection referenced several times
+        is wrapped and projected once per reference.
+
+        Args:
+            value: The root of the graph.
+            mutable: Flag if the mutable projection methods should be used.
+
+        Returns:
+            A proxy of the root, or value itself if it is not a collection.
+        """
+        return (self._mut_deep if mutable else self._deep).wrap(value)
+
+    async def aproject(
+        self, value: Any, /, *, mutable: bool = False, budget_ms: float = 5.0
+    ) -> Any:
+        """Wrap the root of a graph of nested collections, which never blocks (see project).
+
+        Args:
+            value: The root of the graph.
+            mutable: Flag if the mutable projection methods should be used.
+            budget_ms: Unused, since wrapping the root takes constant time.
+
+        Returns:
+            A proxy of the root, or value itself if it is not a collection.
+        """
+        return self.project(value, mutable=mutable)
+
+    def stats(self) -> LazyStats:
+        """Snapshot the materialization statistics of every proxy created so far.
+
+        Returns:
+            A copy of the statistics.
+        """
+        return LazyStats(self._stats.proxies, self._stats.materialized)
+
+    def reset(self) -> None:
+        """Reset the statistics. Proxies created before still count when they are materialized."""
+        self._stats.proxies = 0
+        self._stats.materialized = 0
+
+    def _count(self, materializer: _Materializer) -> _Materializer:
+        self._stats.proxies += 1
+        return materializer
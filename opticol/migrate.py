@@ -0,0 +1,265 @@
+"""In-place migration of an existing object graph to optimized collections.
+
+Adopting opticol in a long running process would otherwise require rebuilding every cache from
+scratch. migrate() walks the object graph reachable from a set of roots and replaces every list,
+dict and set value stored in a list, a dict or the attributes of an object with the output of a
+projector:
+
+    >>> import opticol
+    >>> from opticol.migrate import migrate
+    >>> cache = {"a": [1, 2], "b": {"x": 1}}
+    >>> report = migrate(opticol.default, [cache])
+    >>> report.replaced
+    2
+
+The walk is iterative and memoized by identity, so a collection referenced from several places is
+replaced by the same projected instance everywhere and shared references stay shared. Collections
+which contain themselves (directly or through descendants) are left in place, since they cannot be
+copied before they are projected, and so are collections held by a tuple or set, since those cannot
+be rewritten. Roots are never replaced, only their contents, and exact builtin types are the only
+candidates: subclasses of list, dict and set may carry behavior the optimized classes lack.
+
+The attributes (in __dict__ or __slots__) of an object are only walked if the walk_attributes
+predicate selects it, which by default selects the instances of the classes of the roots. The
+internals of other objects, such as those of the standard library or third-party packages, are
+never rewritten. Modules, classes, functions and collections are never walked through attributes.
+
+The roots can be gathered with instances_of(), which searches the objects tracked by the garbage
+collector, e.g. to migrate every instance of a cache entry class at once.
+"""
+
+from collections.abc import Callable, Iterable, Mapping, Sequence, Set
+from dataclasses import dataclass
+import gc
+import sys
+import types
+from typing import Any, Optional
+
+from opticol.projector import Projector
+
+_OPAQUE_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    # Collections (such as the optimized classes, which use __slots__) are walked as containers
+    # when they are builtins, and never through their attributes.
+    Mapping,
+    Set,
+    Sequence,
+)
+
+_CONTAINER_TYPES = (list, dict, tuple, set, frozenset)
+
+_UNSET = object()
+
+
+@dataclass(slots=True)
+class MigrationReport:
+    """Summary of a migration.
+
+    Attributes:
+        visited: The number of distinct containers and objects walked.
+        replaced: The number of distinct collections replaced by projected instances.
+        skipped: The number of distinct collections left in place because they are roots, part of a
+            cycle or held by a tuple or set.
+        shallow_bytes_before: The total shallow size (sys.getsizeof) of the replaced collections.
+            Their elements are not included, but every replaced nested collection is counted on its
+            own.
+        shallow_bytes_after: The total shallow size of the projected replacements. The builtin
+            collection held by an overflowed instance is not included.
+    """
+
+    visited: int = 0
+    replaced: int = 0
+    skipped: int = 0
+    shallow_bytes_before: int = 0
+    shallow_bytes_after: int = 0
+
+    @property
+    def shallow_bytes_reclaimed(self) -> int:
+        """The shallow size saved, which is released once nothing else references the originals."""
+        return self.shallow_bytes_before - self.shallow_bytes_after
+
+
+def instances_of(*classes: type) -> list[Any]:
+    """Find every object tracked by the garbage collector which is an instance of the given classes.
+
+    Args:
+        classes: The classes to search for.
+
+    Returns:
+        The instances, suitable as roots of migrate().
+    """
+    return [obj for obj in gc.get_objects() if isinstance(obj, classes)]
+
+
+def migrate(
+    projector: Projector,
+    roots: Iterable[Any],
+    *,
+    mutable: bool = True,
+    walk_attributes: Optional[Callable[[Any], bool]] = None,
+) -> MigrationReport:
+    """Replace the list, dict and set values reachable from roots with projected collections.
+
+    The graph is walked first, then collections are projected children first, so a projected
+    collection already holds projected children. References from outside the walked graph still see
+    the original collections, so every holder of a shared collection should be reachable from roots.
+
+    Args:
+        projector: The projector creating the replacements.
+        roots: Containers or objects whose contents are migrated. They are not replaced themselves.
+        mutable: Flag if collections are projected with the mutable projector methods. Only pass
+            False if the migrated collections are never modified after the migration.
+        walk_attributes: Optional predicate selecting the objects whose attributes are walked and
+            rewritten. Defaults to selecting the instances of the exact classes of the roots, so a
+            dict root holding cache entries needs e.g. lambda obj: isinstance(obj, CacheEntry).
+
+    Returns:
+        A report of the replaced collections and the memory reclaimed.
+    """
+    projections: dict[type, Callable[[Any], Any]]
+    if mutable:
+        projections = {list: projector.mut_seq, dict: projector.mut_mapping, set: projector.mut_set}
+    else:
+        projections = {list: projector.seq, dict: projector.mapping, set: projector.set}
+
+    report = MigrationReport()
+    # Every walked object by id, which also keeps the originals alive so that ids stay unique.
+    walked: dict[int, Any] = {}
+    order: list[Any] = []
+    # Collections which must stay in place: the roots, members of cycles and collections held by
+    # containers which cannot be rewritten (tuples and sets).
+    pinned: set[int] = set()
+    in_progress: set[int] = set()
+
+    stack: list[tuple[Any, bool]] = []
+    for root in roots:
+        pinned.add(id(root))
+        stack.append((root, False))
+    if walk_attributes is None:
+        root_classes = {type(root) for root, _ in stack}
+
+        def walk_attributes(obj: Any) -> bool:
+            return type(obj) in root_classes
+
+    def walkable(obj: Any) -> bool:
+        return isinstance(obj, _CONTAINER_TYPES) or _has_attributes(obj, walk_attributes)
+
+    while stack:
+        obj, expanded = stack.pop()
+        key = id(obj)
+        if expanded:
+            in_progress.discard(key)
+            order.append(obj)
+            continue
+        if key in walked:
+            continue
+
+        walked[key] = obj
+        in_progress.add(key)
+        stack.append((obj, True))
+        frozen = isinstance(obj, (tuple, set, frozenset))
+        for child in _children(obj, walk_attributes):
+            child_key = id(child)
+            if frozen or child_key in in_progress:
+                pinned.add(child_key)
+            if child_key not in walked and walkable(child):
+                stack.append((child, False))
+
+    replacements: dict[int, Any] = {}
+    for obj in order:
+        _replace_children(obj, replacements, walk_attributes)
+
+        projection = projections.get(type(obj))
+        if projection is None:
+            continue
+        if id(obj) in pinned:
+            report.skipped += 1
+            continue
+
+        new = projection(obj)
+        if new is not obj:
+            replacements[id(obj)] = new
+            report.replaced += 1
+            report.shallow_bytes_before += sys.getsizeof(obj)
+            report.shallow_bytes_after += sys.getsizeof(new)
+
+    report.visited = len(order)
+    return report
+
+
+def _has_attributes(obj: Any, walk_attributes: Callable[[Any], bool]) -> bool:
+    """Check if an object is an instance whose attributes are walked."""
+    return not isinstance(obj, _OPAQUE_TYPES) and walk_attributes(obj)
+
+
+def _slot_names(cls: type) -> tuple[str, ...]:
+    """List the names of the __slots__ attributes declared by a class and its bases."""
+    names: list[str] = []
+    for base in cls.__mro__:
+        slots = base.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name in ("__dict__", "__weakref__"):
+                continue
+            # Private names are mangled with the name of the declaring class.
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{base.__name__.lstrip('_')}{name}"
+            names.append(name)
+    return tuple(names)
+
+
+def _attributes(obj: Any) -> dict[str, Any]:
+    """Read the attributes of an object, from its __dict__ and its __slots__."""
+    attributes = {}
+    for name in _slot_names(type(obj)):
+        value = getattr(obj, name, _UNSET)
+        if value is not _UNSET:
+            attributes[name] = value
+    instance_dict = getattr(obj, "__dict__", None)
+    if instance_dict is not None:
+        attributes.update(instance_dict)
+    return attributes
+
+
+def _children(obj: Any, walk_attributes: Callable[[Any], bool]) -> Iterable[Any]:
+    """List the objects referenced by a walked object."""
+    match obj:
+        case dict():
+            return obj.values()
+        case list() | tuple() | set() | frozenset():
+            return obj
+        case _ if _has_attributes(obj, walk_attributes):
+            return _attributes(obj).values()
+        case _:
+            return ()
+
+
+def _replace_children(
+    obj: Any, replacements: dict[int, Any], walk_attributes: Callable[[Any], bool]
+) -> None:
+    """Rewrite the references of a list, dict or object attributes to replaced collections."""
+    match obj:
+        case list():
+            for i, child in enumerate(obj):
+                new = replacements.get(id(child))
+                if new is not None:
+                    obj[i] = new
+        case dict():
+            for key, child in list(obj.items()):
+                new = replacements.get(id(child))
+                if new is not None:
+                    obj[key] = new
+        case _ if _has_attributes(obj, walk_attributes):
+            instance_dict = getattr(obj, "__dict__", None)
+            for name, child in _attributes(obj).items():
+                new = replacements.get(id(child))
+                if new is None:
+                    continue
+                # Written past __setattr__, so frozen dataclasses are migrated as well.
+                if instance_dict is not None and name in instance_dict:
+                    instance_dict[name] = new
+                else:
+                    object.__setattr__(obj, name, new)
@@ -0,0 +1,518 @@
+"""Persistent immutable collections with structural sharing.
+
+The immutable opticol classes support persistent updates (Mapping.set and Mapping.delete, Sequence
+set and append), which return a new projected instance and leave the original unchanged. Small
+results are stored into the slot classes directly, which copies at most a handful of references.
+Large collections would need an O(n) copy per update though, so projectors created with
+persistent=True store large immutable mappings and sequences in the classes of this module instead:
+
+* PersistentMapping is a hash array mapped trie (HAMT). Every node holds up to 32 entries selected
+  by 5 bits of the key hash, so an update copies one small node per level, O(log32 n), and shares
+  the rest of the trie with the original.
+* PersistentSequence is a 32-way trie of leaf tuples with a separate tail tuple, so appending
+  usually copies only the tail and assigning an index copies one node per level.
+
+    >>> from opticol.persistent import PersistentMapping
+    >>> base = PersistentMapping({f"k{i}": i for i in range(1000)})
+    >>> overlay = base.set("k1", -1).delete("k2")
+    >>> base["k1"], overlay["k1"], "k2" in overlay
+    (1, -1, False)
+
+Lookups and indexing walk the trie in Python, which takes around a microsecond instead of the tens
+of nanoseconds of a dict or list. That is the price of cheap updates.
+
+Persistent updates of the slot and tuple-backed classes store any result which their projection
+leaves as a builtin dict or list in these classes as well, so updates can always be chained.
+"""
+
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from typing import Any, Optional
+
+from opticol._views import _SlotItemsView, _SlotValuesView
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+_NODE = object()
+"""Key marker of an entry of a bitmap node whose value is a child node."""
+
+
+def _hash(key: Any) -> int:
+    return hash(key) & _HASH_MASK
+
+
+class _BitmapNode:
+    """HAMT node whose entries are the flattened pairs of the set bits of bitmap.
+
+    An entry is either a (key, value) pair, or (_NODE, child) for a subtrie.
+    """
+
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap: int, entries: tuple) -> None:
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _CollisionNode:
+    """HAMT node holding the flattened pairs of keys whose hashes are equal."""
+
+    __slots__ = ("hash", "entries")
+
+    def __init__(self, key_hash: int, entries: tuple) -> None:
+        self.hash = key_hash
+        self.entries = entries
+
+
+_EMPTY_NODE = _BitmapNode(0, ())
+
+
+def _build(pairs: list[tuple[int, Any, Any]], shift: int) -> _BitmapNode | _CollisionNode:
+    """Build a trie from (hash, key, value) triples with distinct keys in one pass."""
+    first_hash = pairs[0][0]
+    if shift >= _HASH_BITS or all(h == first_hash for h, _, _ in pairs):
+        if len(pairs) > 1:
+            return _CollisionNode(first_hash, tuple(x for _, k, v in pairs for x in (k, v)))
+
+    buckets: dict[int, list[tuple[int, Any, Any]]] = {}
+    for triple in pairs:
+        buckets.setdefault((triple[0] >> shift) & _MASK, []).append(triple)
+
+    bitmap = 0
+    entries: list[Any] = []
+    for index in sorted(buckets):
+        bitmap |= 1 << index
+        bucket = buckets[index]
+        if len(bucket) == 1:
+            entries += bucket[0][1:]
+        else:
+            entries += (_NODE, _build(bucket, shift + _BITS))
+    return _BitmapNode(bitmap, tuple(entries))
+
+
+def _pair_node(shift: int, hash1: int, key1: Any, value1: Any, hash2: int, key2: Any, value2: Any):
+    """Create the smallest subtrie holding two entries with different keys."""
+    if shift >= _HASH_BITS or hash1 == hash2:
+        return _CollisionNode(hash1, (key1, value1, key2, value2))
+
+    index1 = (hash1 >> shift) & _MASK
+    index2 = (hash2 >> shift) & _MASK
+    if index1 == index2:
+        child = _pair_node(shift + _BITS, hash1, key1, value1, hash2, key2, value2)
+        return _BitmapNode(1 << index1, (_NODE, child))
+    if index1 < index2:
+        return _BitmapNode((1 << index1) | (1 << index2), (key1, value1, key2, value2))
+    return _BitmapNode((1 << index1) | (1 << index2), (key2, value2, key1, value1))
+
+
+def _lookup(node: _BitmapNode | _CollisionNode, key_hash: int, key: Any, default: Any) -> Any:
+    # The hash is consumed 5 bits per level, which saves tracking the shift of the level.
+    while type(node) is _BitmapNode:
+        bitmap = node.bitmap
+        bit = 1 << (key_hash & _MASK)
+        if not bitmap & bit:
+            return default
+
+        entries = node.entries
+        i = 2 * (bitmap & (bit - 1)).bit_count()
+        k = entries[i]
+        if k is not _NODE:
+            return entries[i + 1] if k is key or k == key else default
+        node = entries[i + 1]
+        key_hash >>= _BITS
+
+    entries = node.entries
+    for i in range(0, len(entries), 2):
+        k = entries[i]
+        if k is key or k == key:
+            return entries[i + 1]
+    return default
+
+
+def _assoc(
+    node: _BitmapNode | _CollisionNode, shift: int, key_hash: int, key: Any, value: Any
+) -> tuple[_BitmapNode | _CollisionNode, bool]:
+    """Set a key in a subtrie, returning the new subtrie and if the key was added."""
+    if isinstance(node, _CollisionNode):
+        entries = node.entries
+        if key_hash != node.hash:
+            # The key only shares a prefix of the hash, so the collision node moves one level down.
+            wrapper = _BitmapNode(1 << ((node.hash >> shift) & _MASK), (_NODE, node))
+            return _assoc(wrapper, shift, key_hash, key, value)
+
+        for i in range(0, len(entries), 2):
+            k = entries[i]
+            if k is key or k == key:
+                if entries[i + 1] is value:
+                    return node, False
+                return (
+                    _CollisionNode(key_hash, entries[: i + 1] + (value,) + entries[i + 2 :]),
+                    False,
+                )
+        return _CollisionNode(key_hash, entries + (key, value)), True
+
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    i = 2 * (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+    if not node.bitmap & bit:
+        return _BitmapNode(node.bitmap | bit, entries[:i] + (key, value) + entries[i:]), True
+
+    k = entries[i]
+    v = entries[i + 1]
+    if k is _NODE:
+        child, added = _assoc(v, shift + _BITS, key_hash, key, value)
+        if child is v:
+            return node, False
+        return _BitmapNode(node.bitmap, entries[: i + 1] + (child,) + entries[i + 2 :]), added
+
+    if k is key or k == key:
+        if v is value:
+            return node, False
+        return _BitmapNode(node.bitmap, entries[: i + 1] + (value,) + entries[i + 2 :]), False
+
+    child = _pair_node(shift + _BITS, _hash(k), k, v, key_hash, key, value)
+    return _BitmapNode(node.bitmap, entries[:i] + (_NODE, child) + entries[i + 2 :]), True
+
+
+def _dissoc(
+    node: _BitmapNode | _CollisionNode, shift: int, key_hash: int, key: Any
+) -> Optional[_BitmapNode | _CollisionNode]:
+    """Remove a key from a subtrie.
+
+    Returns:
+        The node itself if the key is absent, None if the subtrie became empty, and otherwise the
+        new subtrie. A subtrie left with a single pair is returned as a one entry bitmap node, which
+        the parent inlines.
+    """
+    if isinstance(node, _CollisionNode):
+        entries = node.entries
+        for i in range(0, len(entries), 2):
+            k = entries[i]
+            if k is key or k == key:
+                remaining = entries[:i] + entries[i + 2 :]
+                if len(remaining) == 2:
+                    return _BitmapNode(1 << ((key_hash >> shift) & _MASK), remaining)
+                return _CollisionNode(node.hash, remaining)
+        return node
+
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return node
+
+    i = 2 * (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+    k = entries[i]
+    if k is _NODE:
+        child = _dissoc(entries[i + 1], shift + _BITS, key_hash, key)
+        if child is entries[i + 1]:
+            return node
+        if child is None:
+            replacement: tuple = ()
+        elif (
+            type(child) is _BitmapNode and len(child.entries) == 2 and child.entries[0] is not _NODE
+        ):
+            replacement = child.entries
+        else:
+            replacement = (_NODE, child)
+    elif k is key or k == key:
+        replacement = ()
+    else:
+        return node
+
+    if replacement:
+        return _BitmapNode(node.bitmap, entries[:i] + replacement + entries[i + 2 :])
+    if node.bitmap == bit:
+        return None
+    return _BitmapNode(node.bitmap & ~bit, entries[:i] + entries[i + 2 :])
+
+
+def _iter_pairs(node: _BitmapNode | _CollisionNode) -> Iterator[tuple[Any, Any]]:
+    entries = node.entries
+    for i in range(0, len(entries), 2):
+        k = entries[i]
+        if k is _NODE:
+            yield from _iter_pairs(entries[i + 1])
+        else:
+            yield (k, entries[i + 1])
+
+
+class PersistentMapping(Mapping):
+    """Immutable Mapping stored in a hash array mapped trie, with O(log32 n) persistent updates.
+
+    Iteration follows the order of the key hashes rather than the insertion order.
+    """
+
+    __slots__ = ("_root", "_len")
+
+    def __init__(self, mapping: Optional[Mapping] = None) -> None:
+        """Create a mapping holding the pairs of another mapping.
+
+        Args:
+            mapping: Optional mapping to copy, which is built into the trie in a single pass.
+        """
+        self._len = 0 if mapping is None else len(mapping)
+        if mapping is None or self._len == 0:
+            self._root: _BitmapNode | _CollisionNode = _EMPTY_NODE
+        else:
+            self._root = _build([(_hash(k), k, v) for k, v in mapping.items()], 0)
+
+    @classmethod
+    def _from_root(cls, root: _BitmapNode | _CollisionNode, length: int) -> "PersistentMapping":
+        inst = object.__new__(cls)
+        inst._root = root
+        inst._len = length
+        return inst
+
+    def set(self, key: Any, value: Any) -> "PersistentMapping":
+        """Return a mapping which maps key to value and otherwise equals this one.
+
+        Args:
+            key: The key to set.
+            value: The value of key.
+
+        Returns:
+            The new mapping, which shares every unchanged node with this one.
+        """
+        root, added = _assoc(self._root, 0, _hash(key), key, value)
+        if root is self._root:
+            return self
+        return self._from_root(root, self._len + added)
+
+    def delete(self, key: Any) -> "PersistentMapping":
+        """Return a mapping without key which otherwise equals this one.
+
+        Args:
+            key: The key to remove.
+
+        Returns:
+            The new mapping, which shares every unchanged node with this one.
+
+        Raises:
+            KeyError: If key is not in the mapping.
+        """
+        root = _dissoc(self._root, 0, _hash(key), key)
+        if root is self._root:
+            raise KeyError(key)
+        return self._from_root(_EMPTY_NODE if root is None else root, self._len - 1)
+
+    def __getitem__(self, key):
+        value = _lookup(self._root, _hash(key), key, _NODE)
+        if value is _NODE:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        return _lookup(self._root, _hash(key), key, default)
+
+    def __contains__(self, key) -> bool:
+        return _lookup(self._root, _hash(key), key, _NODE) is not _NODE
+
+    def __iter__(self) -> Iterator:
+        for k, _ in _iter_pairs(self._root):
+            yield k
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _iter_items(self) -> Iterator[tuple[Any, Any]]:
+        return _iter_pairs(self._root)
+
+    def items(self):
+        return _SlotItemsView(self)
+
+    def values(self):
+        return _SlotValuesView(self)
+
+    def __repr__(self) -> str:
+        items = [f"{repr(k)}: {repr(v)}" for k, v in _iter_pairs(self._root)]
+        return f"{{{", ".join(items)}}}"
+
+    def __reduce__(self) -> tuple:
+        # The trie holds the _NODE marker and depends on hash values, which differ between
+        # processes for str keys, so copies and pickles are rebuilt from the pairs.
+        return (type(self), (dict(_iter_pairs(self._root)),))
+
+
+def _tail_offset(length: int) -> int:
+    """The number of elements stored in the trie rather than in the tail."""
+    return 0 if length < _WIDTH else ((length - 1) >> _BITS) << _BITS
+
+
+def _new_path(level: int, node: tuple) -> tuple:
+    while level > 0:
+        node = (node,)
+        level -= _BITS
+    return node
+
+
+def _push_tail(length: int, level: int, parent: tuple, tail: tuple) -> tuple:
+    """Copy the path to the last leaf of a trie of length elements, adding tail as a leaf."""
+    index = ((length - 1) >> level) & _MASK
+    if level == _BITS:
+        child = tail
+    elif index < len(parent):
+        child = _push_tail(length, level - _BITS, parent[index], tail)
+    else:
+        child = _new_path(level - _BITS, tail)
+    return parent[:index] + (child,) + parent[index + 1 :]
+
+
+def _assoc_index(level: int, node: tuple, index: int, value: Any) -> tuple:
+    i = (index >> level) & _MASK
+    child = value if level == 0 else _assoc_index(level - _BITS, node[i], index, value)
+    return node[:i] + (child,) + node[i + 1 :]
+
+
+def _iter_leaves(level: int, node: tuple) -> Iterator:
+    if level == 0:
+        yield from node
+        return
+    for child in node:
+        yield from _iter_leaves(level - _BITS, child)
+
+
+class PersistentSequence(Sequence):
+    """Immutable Sequence stored in a 32-way trie, with cheap persistent appends and assignments."""
+
+    __slots__ = ("_len", "_shift", "_root", "_tail")
+
+    def __init__(self, seq: Iterable = ()) -> None:
+        """Create a sequence holding the elements of another sequence.
+
+        Args:
+            seq: The elements, which are chunked into the leaves of the trie in a single pass.
+        """
+        values = seq if isinstance(seq, (list, tuple)) else list(seq)
+        self._len = len(values)
+        offset = _tail_offset(self._len)
+        nodes = [tuple(values[i : i + _WIDTH]) for i in range(0, offset, _WIDTH)]
+        shift = _BITS
+        while len(nodes) > _WIDTH:
+            nodes = [tuple(nodes[i : i + _WIDTH]) for i in range(0, len(nodes), _WIDTH)]
+            shift += _BITS
+        self._shift = shift
+        self._root = tuple(nodes)
+        self._tail = tuple(values[offset:])
+
+    @classmethod
+    def _from_parts(cls, length: int, shift: int, root: tuple, tail: tuple) -> "PersistentSequence":
+        inst = object.__new__(cls)
+        inst._len = length
+        inst._shift = shift
+        inst._root = root
+        inst._tail = tail
+        return inst
+
+    def append(self, value: Any) -> "PersistentSequence":
+        """Return a sequence with value appended, leaving this one unchanged.
+
+        Args:
+            value: The element to append.
+
+        Returns:
+            The new sequence, which shares every full leaf with this one.
+        """
+        length = self._len
+        if length - _tail_offset(length) < _WIDTH:
+            return self._from_parts(length + 1, self._shift, self._root, self._tail + (value,))
+
+        shift = self._shift
+        if (length >> _BITS) > (1 << shift):
+            root = (self._root, _new_path(shift, self._tail))
+            shift += _BITS
+        else:
+            root = _push_tail(length, shift, self._root, self._tail)
+        return self._from_parts(length + 1, shift, root, (value,))
+
+    def set(self, index: int, value: Any) -> "PersistentSequence":
+        """Return a sequence with the element at index replaced, leaving this one unchanged.
+
+        Args:
+            index: The index to assign, which may be negative.
+            value: The new element.
+
+        Returns:
+            The new sequence, which shares every unchanged node with this one.
+
+        Raises:
+            IndexError: If index is out of bounds.
+        """
+        index = self._adjust(index)
+        offset = _tail_offset(self._len)
+        if index >= offset:
+            i = index - offset
+            tail = self._tail[:i] + (value,) + self._tail[i + 1 :]
+            return self._from_parts(self._len, self._shift, self._root, tail)
+
+        root = _assoc_index(self._shift, self._root, index, value)
+        return self._from_parts(self._len, self._shift, root, self._tail)
+
+    def _adjust(self, index: int) -> int:
+        adjusted = index if index >= 0 else self._len + index
+        if adjusted < 0 or adjusted >= self._len:
+            raise IndexError(f"{index} is outside of the expected bounds.")
+        return adjusted
+
+    def __getitem__(self, key):
+        match key:
+            case int():
+                index = self._adjust(key)
+                offset = _tail_offset(self._len)
+                if index >= offset:
+                    return self._tail[index - offset]
+
+                node = self._root
+                for level in range(self._shift, 0, -_BITS):
+                    node = node[(index >> level) & _MASK]
+                return node[index & _MASK]
+            case slice():
+                return PersistentSequence(list(self)[key])
+            case _:
+                raise TypeError(f"Sequence accessors must be integers or slices, not {type(key)}")
+
+    def __iter__(self) -> Iterator:
+        for child in self._root:
+            yield from _iter_leaves(self._shift - _BITS, child)
+        yield from self._tail
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"[{", ".join(repr(v) for v in self)}]"
+
+    def __reduce__(self) -> tuple:
+        return (type(self), (tuple(self),))
+
+
+def updated_mapping(mapping: dict, project: Optional[Callable[[Mapping], Mapping]]) -> Mapping:
+    """Project the result of a persistent update of an immutable mapping.
+
+    Args:
+        mapping: The updated pairs.
+        project: Optional projection of the result.
+
+    Returns:
+        The projected result. A result left as a dict (such as every result without a projection)
+        is stored in a PersistentMapping instead, so that updates can be chained on any result.
+    """
+    result = mapping if project is None else project(mapping)
+    return PersistentMapping(mapping) if type(result) is dict else result
+
+
+def updated_sequence(seq: list, project: Optional[Callable[[Sequence], Sequence]]) -> Sequence:
+    """Project the result of a persistent update of an immutable sequence.
+
+    Args:
+        seq: The updated elements.
+        project: Optional projection of the result.
+
+    Returns:
+        The projected result. A result left as a list (such as every result without a projection)
+        is stored in a PersistentSequence instead, so that updates can be chained on any result.
+    """
+    result = seq if project is None else project(seq)
+    return PersistentSequence(seq) if type(result) is list else result
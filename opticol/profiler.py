@@ -0,0 +1,265 @@
+"""Method level profiling of the optimized collection classes through sys.monitoring.
+
+A slow service built on opticol usually spends its time either in the generated methods (such as
+__getitem__ or __len__) or in the collections.abc mixin methods the generated classes inherit (such
+as Sequence.__iter__ or Mapping.items), which are implemented on top of the generated methods one
+element at a time. MethodProfiler times both, per class and method:
+
+    >>> from opticol.profiler import MethodProfiler
+    >>> with MethodProfiler() as profiler:
+    ...     handle_requests()
+    >>> print(profiler.report())
+    calls      total ms   ns/call  method
+    120000       31.204       260  _Size3Mapping_7.__getitem__
+     40000       29.871       747  _Size3Mapping_7.items (mixin)
+    ...
+
+Events are only enabled for the code objects of the profiled methods, and only while the profiler
+runs, so it costs nothing when it is not running. While it runs, every profiled call pays for a
+Python callback on entry and exit, which inflates the absolute times. Classes generated after the
+profiler has started are not profiled.
+
+Times are cumulative, so the time of a mixin method includes the generated methods it calls. The
+time of a generator method (such as __iter__) is the time spent running it between yields.
+"""
+
+from collections.abc import Iterable, Mapping, Sequence, Set
+from dataclasses import dataclass
+import sys
+import threading
+import time
+from types import CodeType, FunctionType, ModuleType
+from typing import Any, Optional
+
+from opticol._meta import OptimizedCollectionMeta
+
+# Looked up through vars, since pylint models sys.monitoring as a module without members.
+_monitoring: ModuleType = vars(sys)["monitoring"]
+_LOCAL_EVENTS = (
+    _monitoring.events.PY_START
+    | _monitoring.events.PY_RESUME
+    | _monitoring.events.PY_RETURN
+    | _monitoring.events.PY_YIELD
+)
+# Unwinding and throwing into a generator cannot be enabled per code object.
+_GLOBAL_EVENTS = _monitoring.events.PY_UNWIND | _monitoring.events.PY_THROW
+_CALLBACK_EVENTS = (
+    _monitoring.events.PY_START,
+    _monitoring.events.PY_RESUME,
+    _monitoring.events.PY_THROW,
+    _monitoring.events.PY_RETURN,
+    _monitoring.events.PY_YIELD,
+    _monitoring.events.PY_UNWIND,
+)
+
+
+@dataclass(slots=True)
+class MethodStats:
+    """Timing of one method of one class.
+
+    Attributes:
+        calls: The number of calls of the method.
+        total_ns: The cumulative time spent in the method, in nanoseconds.
+        mixin: Flag if the method is a collections.abc mixin method inherited by the class, rather
+            than a method generated for it.
+    """
+
+    calls: int = 0
+    total_ns: int = 0
+    mixin: bool = False
+
+
+def generated_classes() -> list[type]:
+    """List every optimized collection class which currently exists.
+
+    Returns:
+        The classes created through the opticol metaclasses, including overflow classes.
+    """
+    seen: dict[type, None] = {}
+    pending: list[type] = [Sequence, Set, Mapping]
+    sub: type
+    while pending:
+        for sub in pending.pop().__subclasses__():
+            if sub not in seen:
+                seen[sub] = None
+                pending.append(sub)
+
+    return [cls for cls in seen if isinstance(cls, OptimizedCollectionMeta)]
+
+
+def _method_codes(cls: type) -> dict[CodeType, bool]:
+    """Map the code of every method of a class to a flag if it is a collections.abc mixin."""
+    codes: dict[CodeType, bool] = {}
+    for name in dir(cls):
+        owner = next((klass for klass in cls.__mro__ if name in klass.__dict__), None)
+        if owner is None:
+            continue
+
+        attr = owner.__dict__[name]
+        attr = getattr(attr, "__func__", attr)
+        if not isinstance(attr, FunctionType):
+            continue
+
+        if owner.__module__ == "collections.abc":
+            codes[attr.__code__] = True
+        elif isinstance(owner, OptimizedCollectionMeta):
+            codes[attr.__code__] = False
+
+    return codes
+
+
+def _free_tool_id() -> int:
+    """Find a sys.monitoring tool id which is not in use, preferring PROFILER_ID."""
+    for tool_id in (_monitoring.PROFILER_ID, *range(6)):
+        if _monitoring.get_tool(tool_id) is None:
+            return tool_id
+    raise RuntimeError("Every sys.monitoring tool id is in use.")
+
+
+class MethodProfiler:
+    """Profiler timing the calls of the methods of optimized collection classes.
+
+    The profiler is started and stopped with start and stop, or by using it as a context manager.
+    Statistics accumulate over every run until reset is called.
+    """
+
+    def __init__(self, classes: Optional[Iterable[type]] = None) -> None:
+        """Create a stopped profiler.
+
+        Args:
+            classes: The classes to profile, which default to every class returned by
+                generated_classes when the profiler starts.
+        """
+        self._classes = None if classes is None else tuple(classes)
+        self._profiled: set[type] = set()
+        self._codes: dict[CodeType, bool] = {}
+        self._stats: dict[tuple[type, str], MethodStats] = {}
+        self._local = threading.local()
+        self._tool_id: Optional[int] = None
+
+    def __enter__(self) -> "MethodProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Enable the monitoring events of the profiled methods.
+
+        Raises:
+            RuntimeError: If the profiler is running, or no sys.monitoring tool id is free.
+        """
+        if self._tool_id is not None:
+            raise RuntimeError("The profiler is already running.")
+
+        classes = generated_classes() if self._classes is None else self._classes
+        self._profiled = set(classes)
+        self._codes = {}
+        for cls in classes:
+            self._codes.update(_method_codes(cls))
+
+        tool_id = _free_tool_id()
+        _monitoring.use_tool_id(tool_id, "opticol")
+        self._tool_id = tool_id
+        events = _monitoring.events
+        _monitoring.register_callback(tool_id, events.PY_START, self._on_start)
+        _monitoring.register_callback(tool_id, events.PY_RESUME, self._on_resume)
+        _monitoring.register_callback(tool_id, events.PY_THROW, self._on_throw)
+        _monitoring.register_callback(tool_id, events.PY_RETURN, self._on_exit)
+        _monitoring.register_callback(tool_id, events.PY_YIELD, self._on_exit)
+        _monitoring.register_callback(tool_id, events.PY_UNWIND, self._on_exit)
+        for code in self._codes:
+            _monitoring.set_local_events(tool_id, code, _LOCAL_EVENTS)
+        _monitoring.set_events(tool_id, _GLOBAL_EVENTS)
+
+    def stop(self) -> None:
+        """Disable every monitoring event of the profiler, which then costs nothing."""
+        tool_id = self._tool_id
+        if tool_id is None:
+            return
+
+        events = _monitoring.events
+        _monitoring.set_events(tool_id, events.NO_EVENTS)
+        for code in self._codes:
+            _monitoring.set_local_events(tool_id, code, events.NO_EVENTS)
+        for event in _CALLBACK_EVENTS:
+            _monitoring.register_callback(tool_id, event, None)
+        _monitoring.free_tool_id(tool_id)
+        self._tool_id = None
+        self._local = threading.local()
+
+    def reset(self) -> None:
+        """Drop the statistics collected so far."""
+        self._stats = {}
+
+    def stats(self) -> dict[tuple[type, str], MethodStats]:
+        """Snapshot the statistics of every method called so far.
+
+        Returns:
+            The statistics keyed by class and method name.
+        """
+        return {key: MethodStats(s.calls, s.total_ns, s.mixin) for key, s in self._stats.items()}
+
+    def report(self, limit: int = 20) -> str:
+        """Format the methods with the largest cumulative time as a table.
+
+        Args:
+            limit: The maximum number of methods listed.
+
+        Returns:
+            The table, with mixin methods marked as such.
+        """
+        ranked = sorted(self._stats.items(), key=lambda item: item[1].total_ns, reverse=True)
+        lines = [f"{'calls':>10} {'total ms':>12} {'ns/call':>9}  method"]
+        for (cls, name), s in ranked[:limit]:
+            suffix = " (mixin)" if s.mixin else ""
+            lines.append(
+                f"{s.calls:>10} {s.total_ns / 1e6:>12.3f} {s.total_ns // max(s.calls, 1):>9}  "
+                f"{cls.__qualname__}.{name}{suffix}"
+            )
+        return "\n".join(lines)
+
+    def _stack(self) -> list[tuple[Optional[MethodStats], int]]:
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+            return stack
+
+    def _enter(self, code: CodeType, count: bool) -> None:
+        # Every entry pushes, so that exits stay balanced even for receivers which are not profiled.
+        stats = None
+        frame = sys._getframe(2)  # pylint: disable=protected-access
+        if code.co_argcount > 0:
+            receiver = frame.f_locals[code.co_varnames[0]]
+            cls = receiver if isinstance(receiver, type) else type(receiver)
+            if cls in self._profiled:
+                key = (cls, code.co_name)
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = MethodStats(mixin=self._codes[code])
+                if count:
+                    stats.calls += 1
+
+        self._stack().append((stats, time.perf_counter_ns()))
+
+    def _on_start(self, code: CodeType, _: int) -> None:
+        self._enter(code, True)
+
+    def _on_resume(self, code: CodeType, _: int) -> None:
+        self._enter(code, False)
+
+    def _on_throw(self, code: CodeType, _: int, __: BaseException) -> None:
+        if code in self._codes:
+            self._enter(code, False)
+
+    def _on_exit(self, code: CodeType, _: int, __: Any) -> None:
+        if code not in self._codes:
+            return
+
+        stack = self._stack()
+        if stack:
+            stats, start = stack.pop()
+            if stats is not None:
+                stats.total_ns += time.perf_counter_ns() - start
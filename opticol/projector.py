@@ -22,8 +22,10 @@ different optimization schedules can be applied or removed.
 """
 
 from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict, defaultdict, deque
 from collections.abc import (
     Callable,
+    Iterable,
     Sized,
     Mapping,
     MutableMapping,
@@ -32,15 +34,31 @@ from collections.abc import (
     Sequence,
     Set,
 )
+from itertools import chain
+from typing import Any, Literal, Optional
 
+from opticol import _deep
+from opticol._meta import OptimizedCollectionMeta
+from opticol._sentinel import END
+from opticol._tuple import TUPLE_SET_MAX_SIZE
 from opticol.factory import (
+    create_counter_class,
+    create_default_dict_class,
+    create_deque_class,
     create_mapping_class,
     create_mut_mapping_class,
     create_mut_seq_class,
     create_mut_set_class,
+    create_ordered_dict_class,
     create_seq_class,
     create_set_class,
+    create_str_mapping_class,
+    create_str_mut_mapping_class,
+    create_tuple_mapping_class,
+    create_tuple_set_class,
+    sized_cls_name,
 )
+from opticol.persistent import PersistentMapping, PersistentSequence
 
 
 class Projector(ABC):
@@ -48,7 +66,11 @@ class Projector(ABC):
 
     Projectors define how collections are transformed or optimized. Each projector must implement
     six methods, one for each collection type (immutable and mutable variants of sequences, sets,
-    and mappings).
+    and mappings). The project and aproject methods build on them to project nested collections.
+
+    The counter, default_dict, ordered_dict and deque methods project the types of the collections
+    module, and return their input unchanged unless a projector overrides them. Deep projection
+    routes those types to them.
     """
 
     @abstractmethod
@@ -117,6 +139,93 @@ class Projector(ABC):
             A projected mutable mapping.
         """
 
+    def counter[K](self, counter: Counter[K], /) -> MutableMapping[K, int]:
+        """Project a Counter, which is returned unchanged unless the projector overrides this.
+
+        Args:
+            counter: The Counter to project/optimize.
+
+        Returns:
+            A projected mutable mapping with the Counter API.
+        """
+        return counter
+
+    def default_dict[K, V](self, default_dict: defaultdict[K, V], /) -> MutableMapping[K, V]:
+        """Project a defaultdict, which is returned unchanged unless the projector overrides this.
+
+        Args:
+            default_dict: The defaultdict to project/optimize.
+
+        Returns:
+            A projected mutable mapping with the defaultdict API.
+        """
+        return default_dict
+
+    def ordered_dict[K, V](self, ordered_dict: OrderedDict[K, V], /) -> MutableMapping[K, V]:
+        """Project an OrderedDict, which is returned unchanged unless the projector overrides this.
+
+        Args:
+            ordered_dict: The OrderedDict to project/optimize.
+
+        Returns:
+            A projected mutable mapping with the OrderedDict API.
+        """
+        return ordered_dict
+
+    # Defined after the other methods, whose annotations would otherwise refer to this method.
+    def deque[T](self, dq: deque[T], /) -> MutableSequence[T]:
+        """Project a deque, which is returned unchanged unless the projector overrides this.
+
+        Args:
+            dq: The deque to project/optimize.
+
+        Returns:
+            A projected mutable sequence with the deque API.
+        """
+        return dq
+
+    def project(self, value: Any, /, *, mutable: bool = False) -> Any:
+        """Deeply project a graph of nested collections, such as a decoded JSON payload.
+
+        Every Mapping, Set and Sequence in the graph (other than str and bytes types) is projected,
+        children first. Counter, defaultdict, OrderedDict and deque instances (and subclasses) are
+        projected by the counter, default_dict, ordered_dict and deque methods. Mapping keys and set
+        elements are left unchanged, and a collection referenced several times is projected once.
+
+        Args:
+            value: The root of the graph.
+            mutable: Flag if the mutable projection methods should be used.
+
+        Returns:
+            The projected root, or value itself if it is not a collection.
+
+        Raises:
+            ValueError: If the graph contains a cycle.
+        """
+        return _deep.run(_deep.project_steps(_deep.projectors_of(self, mutable), value))
+
+    async def aproject(
+        self, value: Any, /, *, mutable: bool = False, budget_ms: float = 5.0
+    ) -> Any:
+        """Deeply project a graph of nested collections without blocking the event loop.
+
+        The result is the same as the result of project, but the work is split into chunks and the
+        coroutine yields to the event loop whenever it has worked for budget_ms without yielding.
+
+        Args:
+            value: The root of the graph.
+            mutable: Flag if the mutable projection methods should be used.
+            budget_ms: The longest time in milliseconds to work without yielding to the event loop.
+
+        Returns:
+            The projected root, or value itself if it is not a collection.
+
+        Raises:
+            ValueError: If the graph contains a cycle.
+        """
+        steps = _deep.project_steps(_deep.projectors_of(self, mutable), value)
+        return await _deep.arun(steps, budget_ms)
+
 
 class PassThroughProjector(Projector):
     """Projector that returns all collections unchanged.
@@ -157,6 +266,16 @@ class OptimizedCollectionProjector(Projector):
     it to the appropriate size-specific class. If the collection is too large or too small, it's
     returned unchanged.
 
+    Optionally, immutable sets and mappings which are too large for the slot-based classes can be
+    routed to a tuple-backed tier (see tuple_max_size), which uses one class for every size and
+    still costs far less than the builtin types. Immutable sequences and mappings above every other
+    class can be stored in persistent, structurally shared classes instead (see persistent).
+
+    Counter, defaultdict, OrderedDict and deque instances are routed to slot-based classes with the
+    API of their type, which overflow to an instance of the type, also during deep projection. The
+    interner and mut_ownership options do not apply to them, and large instances are returned
+    unchanged.
+
     The projector also supports recursive optimization: when slicing or using set operations on
     optimized collections, the results are automatically routed back through the projector,
     maintaining optimization for nested structures.
@@ -164,7 +283,17 @@ class OptimizedCollectionProjector(Projector):
 
     @staticmethod
     def _create_sized_router[C: Sized](
-        min_size: int, max_size: int, cls_factory: Callable[[int], type]
+        min_size: int,
+        max_size: int,
+        cls_factory: Callable[[int], type],
+        tier_cls: Optional[type] = None,
+        tier_max_size: int = -1,
+        make_types: tuple[type, ...] = (),
+        make_pairs: bool = False,
+        headroom: int = 0,
+        large_cls: Optional[type] = None,
+        intern: Optional[Callable[[Any], Any]] = None,
+        overflow: Optional[Callable[[Any], Any]] = None,
     ) -> Callable[[C], C]:
         """Create a routing function that dispatches collections to size-specific classes.
 
@@ -172,24 +301,74 @@ class OptimizedCollectionProjector(Projector):
             min_size: Minimum collection size to optimize.
             max_size: Maximum collection size to optimize.
             cls_factory: Factory function that creates optimized classes for a given size.
+            tier_cls: Optional class which serves every size above max_size up to tier_max_size.
+            tier_max_size: Maximum collection size routed to tier_cls (inclusive).
+            make_types: Exact input types whose elements are passed straight to the _make
+                constructor of the sized classes instead of going through __init__.
+            make_pairs: Flag if the sized classes are mappings, whose _make constructor takes the
+                interleaved keys and values of the input.
+            headroom: Number of free slots given to each collection (up to the class of max_size),
+                for mutable collections which may grow without overflowing.
+            large_cls: Optional class which serves every size above max_size and tier_max_size.
+                Its instances are returned unchanged, since they are never copied on update.
+            intern: Optional function rebuilding a collection with interned elements (and keys),
+                which is applied to every collection stored in one of the classes.
+            overflow: Optional function storing every collection above max_size in an overflowed
+                instance of a mutable class.
 
         Returns:
             A router function that takes a collection and returns either an optimized
             instance or the original collection if outside the size range.
         """
-        classes = [cls_factory(size) for size in range(min_size, max_size + 1)]
+        # Typed as Any, since the factories return generated classes which define _make.
+        classes: list[Any] = [
+            cls_factory(min(size + headroom, max_size)) for size in range(min_size, max_size + 1)
+        ]
+        makers = [klass._make for klass in classes] if make_types else []
 
-        def router(collection: C) -> C:
+        def router(collection: Any) -> Any:
             l = len(collection)
             if l < min_size or l > max_size:
+                if tier_cls is not None and max_size < l <= tier_max_size:
+                    return tier_cls(collection if intern is None else intern(collection))
+                if overflow is not None and l > max_size:
+                    return overflow(collection)
+                if large_cls is not None and l > max_size:
+                    if type(collection) is large_cls:
+                        return collection
+                    return large_cls(collection if intern is None else intern(collection))
                 return collection
 
-            klass = classes[len(collection) - min_size]
+            trusted = type(collection) in make_types
+            if intern is not None:
+                # The rebuilt collection is a builtin, but only trusted inputs skip validation.
+                collection = intern(collection)
+
+            if trusted:
+                if make_pairs:
+                    return makers[l - min_size](*chain.from_iterable(collection.items()))
+                return makers[l - min_size](*collection)
+
+            klass = classes[l - min_size]
             return klass(collection)
 
         return router
 
-    def __init__(self, min_size: int, max_size: int, recursive: bool) -> None:
+    def __init__(
+        self,
+        min_size: int,
+        max_size: int,
+        recursive: bool,
+        *,
+        intern_keys: bool = False,
+        tuple_max_size: Optional[int] = None,
+        mut_headroom: int = 0,
+        trusted_types: Iterable[type] = (),
+        classes: Optional[Mapping[str, type]] = None,
+        persistent: bool = False,
+        interner: Optional[Callable[[Any], Any]] = None,
+        mut_ownership: Optional[Literal["take", "copy", "copy_on_write"]] = None,
+    ) -> None:
         """Initialize the projector with a continuous size range for optimization.
 
         Sensible ranges for optimization are between 0 and 5.
@@ -199,28 +378,215 @@ class OptimizedCollectionProjector(Projector):
             max_size: Maximum collection size to optimize (inclusive).
             recursive: Flag if collection instances created from runtime operations should also be
                 optimized via the same projector.
+            intern_keys: Flag if mappings should use the str keyed classes, which intern str keys
+                as they are stored. Best suited to mappings keyed by attribute-like names.
+            tuple_max_size: Optional maximum size (inclusive) of the tuple-backed tier. Immutable
+                sets and mappings larger than max_size but no larger than this are stored in a
+                single tuple-backed class instead of falling back to the builtin type. Sets are
+                limited to 254 elements, and 64 is a sensible value.
+            mut_headroom: Number of free slots given to mutable collections, so that they can grow
+                by that many elements before overflowing. Slots are never allocated beyond the
+                class of max_size, and a collection keeps its class until it overflows, since
+                CPython cannot move an instance to a class with a different number of slots.
+            trusted_types: Additional exact input types whose instances are stored through the
+                _make constructor of the generated classes, which skips validation. Exact list,
+                tuple, set, frozenset and dict inputs always are. A trusted type must report its
+                len consistently with its iteration, and sets and mappings must not repeat
+                elements or keys, which makes the optimized classes themselves safe to trust.
+            classes: Optional namespace of classes generated ahead of time by opticol.codegen,
+                keyed by their stable names (see opticol.factory.sized_cls_name). Classes found in
+                it are used instead of generating classes at runtime, so it must have been written
+                for the same configuration.
+            persistent: Flag if immutable sequences and mappings too large for the other classes
+                are stored in the persistent classes of opticol.persistent instead of being
+                returned unchanged. Their persistent updates (such as Mapping.set) share structure
+                instead of copying, while the persistent updates of the slot and tuple-backed
+                classes copy their contents. Persistent mappings iterate in hash order.
+            interner: Optional function mapping a value to a canonical equal object, such as an
+                opticol.interning.InternTable. When given, every element, mapping key and mapping
+                value stored by the optimized classes is passed through it first, so equal leaf
+                values share one object across collections. Collections returned unchanged are not
+                interned.
+            mut_ownership: Optional ownership of the mutable collections too large for the slots.
+                By default they are returned unchanged, so the result is the input itself. "take"
+                stores an exact list, set or dict input in an overflowed instance which owns it, so
+                the caller must not use it afterwards. "copy" stores a copy instead. "copy_on_write"
+                shares the input until the first write through the instance, which then copies it.
+                The caller must not write to the input while it is shared. Inputs of other types
+                are always copied into a builtin collection.
+
+        Raises:
+            ValueError: If tuple_max_size exceeds the limit of the tuple-backed set, or
+                mut_ownership is not one of the modes.
         """
+        if tuple_max_size is not None and tuple_max_size > TUPLE_SET_MAX_SIZE:
+            raise ValueError(
+                f"{tuple_max_size} exceeds the maximum tuple-backed set size of "
+                f"{TUPLE_SET_MAX_SIZE}."
+            )
+        tier_max_size = -1 if tuple_max_size is None else tuple_max_size
+        if mut_ownership not in (None, "take", "copy", "copy_on_write"):
+            raise ValueError(f"{mut_ownership} is not a valid ownership mode.")
+
         # Will be either True (if recursive is True) or None (if recursive if False). When *anding*
         # with the possible project function, the result will either be the second argument or None
         # respectively.
         project_guard = recursive or None
 
-        self._seq = self._create_sized_router(
-            min_size, max_size, lambda i: create_seq_class(i, project_guard and self.seq)
+        trusted_types = tuple(trusted_types)
+        seq_types: tuple[type, ...] = (
+            list,
+            tuple,
+            *(t for t in trusted_types if issubclass(t, Sequence)),
         )
-        self._mut_seq = self._create_sized_router(
-            min_size, max_size, lambda i: create_mut_seq_class(i, project_guard and self.mut_seq)
+        set_types: tuple[type, ...] = (
+            set,
+            frozenset,
+            *(t for t in trusted_types if issubclass(t, Set)),
+        )
+        mapping_types: tuple[type, ...] = (
+            dict,
+            *(t for t in trusted_types if issubclass(t, Mapping)),
         )
 
-        self._set = self._create_sized_router(
-            min_size, max_size, lambda i: create_set_class(i, project_guard and self.set)
+        classes = classes or {}
+
+        if interner is None:
+            intern_seq = intern_set = intern_mapping = None
+        else:
+
+            def intern_seq(seq: Sequence) -> list:
+                return list(map(interner, seq))
+
+            def intern_set(s: Set) -> set:
+                return set(map(interner, s))
+
+            def intern_mapping(mapping: Mapping) -> dict:
+                return dict(zip(map(interner, mapping), map(interner, mapping.values())))
+
+        def load(name: str, factory: Callable[[], type]) -> type:
+            return classes.get(name) or factory()
+
+        def sized(kind: str, factory: Callable[[int], type]) -> Callable[[int], type]:
+            return lambda i: load(sized_cls_name(i, kind), lambda: factory(i))
+
+        def overflow(
+            factory: Callable[[int], Any],
+            builtin: Callable[[Any], Any],
+            intern: Optional[Callable[[Any], Any]],
+        ) -> Optional[Callable[[Any], Any]]:
+            if mut_ownership is None:
+                return None
+
+            largest = factory(max_size)
+
+            def store(collection: Any) -> Any:
+                shared = False
+                if intern is not None:
+                    data = intern(collection)
+                elif type(collection) is not builtin:
+                    data = builtin(collection)
+                elif mut_ownership == "copy":
+                    data = collection.copy()
+                else:
+                    data = collection
+                    shared = mut_ownership == "copy_on_write"
+                return OptimizedCollectionMeta._new_overflow(largest, data, END, shared)
+
+            return store
+
+        self._seq: Callable[[Sequence], Sequence] = self._create_sized_router(
+            min_size,
+            max_size,
+            sized("Sequence", lambda i: create_seq_class(i, project_guard and self.seq)),
+            make_types=seq_types,
+            large_cls=PersistentSequence if persistent else None,
+            intern=intern_seq,
+        )
+        mut_seq_factory = sized(
+            "MutableSequence", lambda i: create_mut_seq_class(i, project_guard and self.mut_seq)
         )
-        self._mut_set = self._create_sized_router(
-            min_size, max_size, lambda i: create_mut_set_class(i, project_guard and self.mut_set)
+        self._mut_seq: Callable[[MutableSequence], MutableSequence] = self._create_sized_router(
+            min_size,
+            max_size,
+            mut_seq_factory,
+            make_types=seq_types,
+            headroom=mut_headroom,
+            intern=intern_seq,
+            overflow=overflow(mut_seq_factory, list, intern_seq),
         )
 
-        self._mapping = self._create_sized_router(min_size, max_size, create_mapping_class)
-        self._mut_mapping = self._create_sized_router(min_size, max_size, create_mut_mapping_class)
+        self._set: Callable[[Set], Set] = self._create_sized_router(
+            min_size,
+            max_size,
+            sized("Set", lambda i: create_set_class(i, project_guard and self.set)),
+            load("TupleSet", lambda: create_tuple_set_class(project_guard and self.set)),
+            tier_max_size,
+            make_types=set_types,
+            intern=intern_set,
+        )
+        mut_set_factory = sized(
+            "MutableSet", lambda i: create_mut_set_class(i, project_guard and self.mut_set)
+        )
+        self._mut_set: Callable[[MutableSet], MutableSet] = self._create_sized_router(
+            min_size,
+            max_size,
+            mut_set_factory,
+            make_types=set_types,
+            headroom=mut_headroom,
+            intern=intern_set,
+            overflow=overflow(mut_set_factory, set, intern_set),
+        )
+
+        mapping_project = project_guard and self.mapping
+        if intern_keys:
+            mapping_factory = sized(
+                "StrMapping", lambda i: create_str_mapping_class(i, mapping_project)
+            )
+            mut_mapping_factory = sized("StrMutableMapping", create_str_mut_mapping_class)
+        else:
+            mapping_factory = sized("Mapping", lambda i: create_mapping_class(i, mapping_project))
+            mut_mapping_factory = sized("MutableMapping", create_mut_mapping_class)
+        self._mapping: Callable[[Mapping], Mapping] = self._create_sized_router(
+            min_size,
+            max_size,
+            mapping_factory,
+            load("TupleMapping", lambda: create_tuple_mapping_class(mapping_project)),
+            tier_max_size,
+            make_types=mapping_types,
+            make_pairs=True,
+            large_cls=PersistentMapping if persistent else None,
+            intern=intern_mapping,
+        )
+        self._mut_mapping: Callable[[MutableMapping], MutableMapping] = self._create_sized_router(
+            min_size,
+            max_size,
+            mut_mapping_factory,
+            make_types=mapping_types,
+            make_pairs=True,
+            headroom=mut_headroom,
+            intern=intern_mapping,
+            overflow=overflow(mut_mapping_factory, dict, intern_mapping),
+        )
+
+        self._counter: Callable[[Counter], MutableMapping] = self._create_sized_router(
+            min_size, max_size, sized("Counter", create_counter_class), headroom=mut_headroom
+        )
+        self._default_dict: Callable[[defaultdict], MutableMapping] = self._create_sized_router(
+            min_size,
+            max_size,
+            sized("DefaultDict", create_default_dict_class),
+            headroom=mut_headroom,
+        )
+        self._ordered_dict: Callable[[OrderedDict], MutableMapping] = self._create_sized_router(
+            min_size,
+            max_size,
+            sized("OrderedDict", create_ordered_dict_class),
+            headroom=mut_headroom,
+        )
+        self._deque: Callable[[deque], MutableSequence] = self._create_sized_router(
+            min_size, max_size, sized("Deque", create_deque_class), headroom=mut_headroom
+        )
 
     def seq[T](self, seq: Sequence[T], /) -> Sequence[T]:
         return self._seq(seq)
@@ -239,3 +605,15 @@ class OptimizedCollectionProjector(Projector):
 
     def mut_mapping[K, V](self, mut_mapping: MutableMapping[K, V], /) -> MutableMapping[K, V]:
         return self._mut_mapping(mut_mapping)
+
+    def counter[K](self, counter: Counter[K], /) -> MutableMapping[K, int]:
+        return self._counter(counter)
+
+    def default_dict[K, V](self, default_dict: defaultdict[K, V], /) -> MutableMapping[K, V]:
+        return self._default_dict(default_dict)
+
+    def ordered_dict[K, V](self, ordered_dict: OrderedDict[K, V], /) -> MutableMapping[K, V]:
+        return self._ordered_dict(ordered_dict)
+
+    def deque[T](self, dq: deque[T], /) -> MutableSequence[T]:
+        return self._deque(dq)
@@ -0,0 +1,211 @@
+"""Read-only collections stored in shared memory for multi-process workers.
+
+Worker pools that read a large reference dataset of small collections suffer from copy-on-write:
+even reading a Python object writes its reference count, so every page holding the dataset is
+eventually duplicated in every forked worker. This module stores such a dataset in a single
+multiprocessing.shared_memory block using the compact encoding of opticol._codec, and exposes it
+through views implementing the immutable Sequence, Set and Mapping ABCs. Views decode elements
+lazily and directly from the block, so the payload exists once no matter how many workers read it.
+
+Example:
+    >>> from opticol.shared import SharedBlock
+    >>> block = SharedBlock.create({"a": [1, 2], "b": [3]})
+    >>> block.root["a"][1]
+    2
+    >>> # In another process: SharedBlock.attach(block.name).root
+
+Views read from the block, so they must not be used after the block has been closed. The
+SharedMemoryProjector offers the same storage through the Projector API.
+"""
+
+from collections.abc import (
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    MutableSet,
+    Sequence,
+    Set,
+)
+from multiprocessing import shared_memory
+import sys
+from typing import Any, Optional
+
+from opticol import _codec, _deep
+from opticol.projector import PassThroughProjector, Projector
+
+
+class SharedBlock:
+    """An encoded collection graph stored in a shared memory block.
+
+    Attributes:
+        shm: The underlying shared memory block.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory) -> None:
+        """Wrap an existing shared memory block which holds an encoded collection graph.
+
+        Prefer the create and attach constructors.
+
+        Args:
+            shm: The shared memory block.
+        """
+        self.shm = shm
+        self._root: Any = None
+        self._opened = False
+
+    @classmethod
+    def create(cls, value: Any, name: Optional[str] = None) -> "SharedBlock":
+        """Encode a collection graph into a new shared memory block.
+
+        Args:
+            value: The root of the graph. See opticol._codec.encode for the supported types.
+            name: Optional name of the shared memory block. A unique name is chosen if omitted.
+
+        Returns:
+            The block owning the new shared memory.
+        """
+        encoded = _codec.encode(value)
+        block = cls(shared_memory.SharedMemory(name=name, create=True, size=len(encoded)))
+        block._buffer()[: len(encoded)] = encoded
+        return block
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedBlock":
+        """Attach to a block created by another process.
+
+        Args:
+            name: The name of the block (see the name attribute of the creating block).
+
+        Returns:
+            The attached block. It must be closed, but only the creator should unlink it.
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm)
+
+    @property
+    def name(self) -> str:
+        """The system wide name of the shared memory block."""
+        return self.shm.name
+
+    @property
+    def root(self) -> Any:
+        """The root of the stored graph, which is a view for collections."""
+        if not self._opened:
+            self._root = _codec.decode(self._buffer())
+            self._opened = True
+        return self._root
+
+    def _buffer(self) -> memoryview:
+        buf = self.shm.buf
+        if buf is None:
+            raise ValueError("The shared memory block is closed.")
+        return buf
+
+    def close(self) -> None:
+        """Close this process' access to the block.
+
+        Views created from this block raise ValueError once it is closed.
+        """
+        self._root = None
+        self._opened = False
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """Request destruction of the block once every process has closed it."""
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedBlock":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+class SharedMemoryProjector(Projector):
+    """Projector which stores immutable collections in shared memory blocks.
+
+    Each projected Sequence, Set or Mapping is deeply encoded into its own block and replaced by a
+    read-only view, so this projector should be applied to the roots of large datasets rather than
+    to individual small collections. project encodes a whole graph into a single block, instead of
+    one block per nested collection. Mutable collections are delegated to a fallback projector.
+    """
+
+    def __init__(self, fallback: Optional[Projector] = None) -> None:
+        """Initialize the projector.
+
+        Args:
+            fallback: Projector for mutable collections. Defaults to a PassThroughProjector.
+        """
+        self._fallback = fallback or PassThroughProjector()
+        self.blocks: list[SharedBlock] = []
+
+    def _share(self, collection: Any) -> Any:
+        block = SharedBlock.create(collection)
+        self.blocks.append(block)
+        return block.root
+
+    def seq[T](self, seq: Sequence[T], /) -> Sequence[T]:
+        return self._share(seq)
+
+    def mut_seq[T](self, mut_seq: MutableSequence[T], /) -> MutableSequence[T]:
+        return self._fallback.mut_seq(mut_seq)
+
+    def set[T](self, s: Set[T], /) -> Set[T]:
+        return self._share(s)
+
+    def mut_set[T](self, mut_set: MutableSet[T], /) -> MutableSet[T]:
+        return self._fallback.mut_set(mut_set)
+
+    def mapping[K, V](self, mapping: Mapping[K, V], /) -> Mapping[K, V]:
+        return self._share(mapping)
+
+    def mut_mapping[K, V](self, mut_mapping: MutableMapping[K, V], /) -> MutableMapping[K, V]:
+        return self._fallback.mut_mapping(mut_mapping)
+
+    def project(self, value: Any, /, *, mutable: bool = False) -> Any:
+        """Encode a graph of nested collections into a single shared memory block.
+
+        Args:
+            value: The root of the graph. See opticol._codec.encode for the supported types.
+            mutable: Flag if the graph should be projected by the fallback projector instead.
+
+        Returns:
+            A view of the root, or value itself if it is not a collection.
+        """
+        if mutable:
+            return self._fallback.project(value, mutable=True)
+        if _deep.kind_of(value) is None:
+            return value
+        return self._share(value)
+
+    async def aproject(
+        self, value: Any, /, *, mutable: bool = False, budget_ms: float = 5.0
+    ) -> Any:
+        """Encode a graph of nested collections into a single block (see project).
+
+        Args:
+            value: The root of the graph.
+            mutable: Flag if the graph should be projected by the fallback projector instead.
+            budget_ms: The time budget of the fallback projector. Encoding does not yield.
+
+        Returns:
+            A view of the root, or value itself if it is not a collection.
+        """
+        if mutable:
+            return await self._fallback.aproject(value, mutable=True, budget_ms=budget_ms)
+        return self.project(value)
+
+    def close(self, unlink: bool = True) -> None:
+        """Close (and by default unlink) every block created by this projector.
+
+        Args:
+            unlink: Flag if the blocks should also be destroyed.
+        """
+        for block in self.blocks:
+            block.close()
+            if unlink:
+                block.unlink()
+        self.blocks.clear()
@@ -0,0 +1,104 @@
+"""Binary snapshot files of collection graphs, reopened lazily through mmap.
+
+Rebuilding a large graph of optimized collections from source data at every start of a process can
+take a long time. This module writes such a graph once to a file in the compact encoding of
+opticol._codec, and reopens the file with mmap. Opening a snapshot only validates its header: the
+views returned by the root property implement the immutable Sequence, Set and Mapping ABCs and
+decode elements only on access, so the pages of the file are read by the operating system only
+when they are used, and are shared between every process which maps the same file.
+
+Example:
+    >>> from opticol import snapshot
+    >>> size = snapshot.dump({"a": [1, 2], "b": [3]}, "data.optc")
+    >>> with snapshot.load("data.optc") as snap:
+    ...     snap.root["a"][1]
+    2
+
+Views read from the mapped file, so they must not be used after the snapshot has been closed.
+"""
+
+import mmap
+import os
+from typing import Any
+
+from opticol import _codec
+
+
+def dump(value: Any, path: str | os.PathLike) -> int:
+    """Write a graph of collections and primitive values to a snapshot file.
+
+    Every value is encoded in Python, so writing takes longer than pickling the same graph, while
+    loading takes constant time instead of rebuilding every collection.
+
+    Args:
+        value: The root of the graph. See opticol._codec.encode for the supported types.
+        path: The path of the file, which is replaced if it exists.
+
+    Returns:
+        The number of bytes written.
+    """
+    encoded = _codec.encode(value)
+    with open(path, "wb") as f:
+        f.write(encoded)
+    return len(encoded)
+
+
+def load(path: str | os.PathLike) -> "Snapshot":
+    """Open a snapshot file written by dump.
+
+    Args:
+        path: The path of the file.
+
+    Returns:
+        The opened snapshot, which should be closed (or used as a context manager).
+
+    Raises:
+        ValueError: If the file is not a snapshot.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        return Snapshot(mapped)
+    except ValueError:
+        mapped.close()
+        raise
+
+
+class Snapshot:
+    """A snapshot file mapped into memory.
+
+    Attributes:
+        root: The root of the stored graph, which is a view for collections.
+    """
+
+    def __init__(self, mapped: mmap.mmap) -> None:
+        """Open the graph stored in a memory mapped snapshot file.
+
+        Prefer the load function.
+
+        Args:
+            mapped: The mapped file.
+
+        Raises:
+            ValueError: If the mapped file is not a snapshot.
+        """
+        self._mmap = mapped
+        self._buf = memoryview(mapped)
+        try:
+            self.root: Any = _codec.decode(self._buf)
+        except ValueError:
+            self._buf.release()
+            raise
+
+    def close(self) -> None:
+        """Unmap the file. Views created from this snapshot raise ValueError once it is closed."""
+        self.root = None
+        self._buf.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
@@ -0,0 +1,246 @@
+"""Columnar storage for large numbers of mappings which share the same keys.
+
+Even the optimized mapping classes cost one Python object per row, which adds up for tables of
+millions of rows. A RecordTable stores rows sharing a keyset as one column per key instead, and
+hands out RecordView rows which implement Mapping on top of the columns. Columns are lists by
+default, or array.array instances for keys given a typecode, which additionally avoids one object
+per cell.
+
+Bulk appends, column scans and filters work on the columns directly and never create row objects:
+
+    >>> import opticol
+    >>> from opticol.table import RecordTable
+    >>> table = RecordTable(opticol.default, ("id", "name"), typecodes={"id": "q"})
+    >>> table.extend([{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+    >>> table.filter("id", lambda v: v > 1)[0]["name"]
+    'b'
+
+Row views are read-only and only as large as the smallest optimized mapping. The projector of the
+table is used to materialize a row into an independent mapping.
+"""
+
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from itertools import compress
+from operator import itemgetter
+from typing import Any, Optional
+
+from opticol.projector import Projector
+
+
+class RecordView(Mapping):
+    """Read-only Mapping view of a single row of a RecordTable."""
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: dict[str, Any], index: int) -> None:
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._columns[key][self._index]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __contains__(self, key) -> bool:
+        return key in self._columns
+
+    def __repr__(self) -> str:
+        i = self._index
+        items = [f"{repr(k)}: {repr(c[i])}" for k, c in self._columns.items()]
+        return f"{{{", ".join(items)}}}"
+
+
+class RecordTable(Sequence[Mapping]):
+    """Sequence of same-keyed rows stored as one column per key.
+
+    Attributes:
+        projector: The projector used to materialize rows.
+    """
+
+    __slots__ = ("projector", "_columns", "_typecodes")
+
+    def __init__(
+        self,
+        projector: Projector,
+        keys: Iterable[str],
+        *,
+        typecodes: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """Create an empty table.
+
+        Args:
+            projector: The projector used to materialize rows.
+            keys: The keys shared by every row, in iteration order of the row views.
+            typecodes: Optional array typecodes for columns of numeric values, keyed by column.
+
+        Raises:
+            ValueError: If a typecode is given for a key which is not a column.
+        """
+        self.projector = projector
+        self._typecodes = dict(typecodes or {})
+        self._columns: dict[str, Any] = {
+            key: array(self._typecodes[key]) if key in self._typecodes else [] for key in keys
+        }
+        unknown = self._typecodes.keys() - self._columns.keys()
+        if unknown:
+            raise ValueError(f"Typecodes were given for unknown columns {sorted(unknown)}.")
+
+    @property
+    def keys(self) -> tuple[str, ...]:
+        """The keys of every row."""
+        return tuple(self._columns)
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        """Append a single row.
+
+        Args:
+            row: A mapping with exactly the keys of the table.
+
+        Raises:
+            ValueError: If the keys of the row differ from the keys of the table.
+        """
+        self.extend((row,))
+
+    def extend(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Append many rows, which are transposed into the columns in bulk.
+
+        The table is left unchanged if any row has different keys.
+
+        Args:
+            rows: Mappings with exactly the keys of the table.
+
+        Raises:
+            ValueError: If the keys of a row differ from the keys of the table.
+        """
+        rows = rows if isinstance(rows, Sequence) else list(rows)
+        keys = self._columns.keys()
+        for row in rows:
+            if len(row) != len(keys) or row.keys() != keys:
+                raise ValueError(f"Expected a row with the keys {list(keys)} but got {list(row)}.")
+
+        self.extend_columns({key: [row[key] for row in rows] for key in keys})
+
+    def extend_columns(self, columns: Mapping[str, Iterable[Any]]) -> None:
+        """Append rows given as one iterable of values per column.
+
+        Args:
+            columns: The new values of every column of the table, all of the same length.
+
+        Raises:
+            ValueError: If the columns differ from the columns of the table or in length.
+        """
+        if columns.keys() != self._columns.keys():
+            raise ValueError(f"Expected the columns {list(self._columns)} but got {list(columns)}.")
+
+        converted = {
+            key: array(self._typecodes[key], values) if key in self._typecodes else list(values)
+            for key, values in columns.items()
+        }
+        lengths = {len(values) for values in converted.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Expected columns of equal length but got lengths {sorted(lengths)}.")
+
+        for key, values in converted.items():
+            self._columns[key] += values
+
+    def column(self, key: str) -> Sequence[Any]:
+        """Access the values of a column without creating row objects.
+
+        Args:
+            key: The key of the column.
+
+        Returns:
+            The column, which must not be modified. It is a list, or an array for typed columns.
+        """
+        return self._columns[key]
+
+    def where(self, key: str, predicate: Callable[[Any], bool]) -> list[int]:
+        """Find the rows whose value in a column satisfies a predicate.
+
+        Args:
+            key: The key of the column.
+            predicate: Called once per value of the column.
+
+        Returns:
+            The indices of the matching rows in ascending order.
+        """
+        column = self._columns[key]
+        return list(compress(range(len(column)), map(predicate, column)))
+
+    def select(self, indices: Iterable[int]) -> "RecordTable":
+        """Copy a subset of the rows into a new table.
+
+        Args:
+            indices: The indices of the rows to copy, in the order of the new table.
+
+        Returns:
+            A new table with the same keys, typecodes and projector.
+        """
+        indices = list(indices)
+        table = RecordTable(self.projector, self._columns, typecodes=self._typecodes)
+        if not indices:
+            return table
+
+        getter = itemgetter(*indices)
+        single = len(indices) == 1
+        table.extend_columns(
+            {
+                key: (getter(column),) if single else getter(column)
+                for key, column in self._columns.items()
+            }
+        )
+        return table
+
+    def filter(self, key: str, predicate: Callable[[Any], bool]) -> "RecordTable":
+        """Copy the rows whose value in a column satisfies a predicate into a new table.
+
+        Args:
+            key: The key of the column.
+            predicate: Called once per value of the column.
+
+        Returns:
+            A new table with the matching rows.
+        """
+        return self.select(self.where(key, predicate))
+
+    def materialize(self, index: int) -> Mapping[str, Any]:
+        """Copy a row into an independent mapping created by the projector of the table.
+
+        Args:
+            index: The index of the row.
+
+        Returns:
+            The projected mapping.
+        """
+        i = self[index]._index
+        return self.projector.mapping({key: column[i] for key, column in self._columns.items()})
+
+    def __getitem__(self, key):
+        match key:
+            case int():
+                adjusted = key if key >= 0 else len(self) + key
+                if adjusted < 0 or adjusted >= len(self):
+                    raise IndexError(f"{key} is outside of the expected bounds.")
+                return RecordView(self._columns, adjusted)
+            case slice():
+                return self.select(range(*key.indices(len(self))))
+            case _:
+                raise TypeError(f"Sequence accessors must be integers or slices, not {type(key)}")
+
+    def __iter__(self) -> Iterator[Mapping]:
+        columns = self._columns
+        for i in range(len(self)):
+            yield RecordView(columns, i)
+
+    def __len__(self) -> int:
+        for column in self._columns.values():
+            return len(column)
+        return 0
+
+    def __repr__(self) -> str:
+        return f"RecordTable(keys={self.keys!r}, rows={len(self)})"
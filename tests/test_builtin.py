@@ -0,0 +1,87 @@
+from collections import Counter, OrderedDict, deque
+import sys
+import unittest
+
+from opticol import to_builtin
+from opticol.projector import OptimizedCollectionProjector
+
+
+class ToBuiltinTest(unittest.TestCase):
+    def setUp(self):
+        self.projector = OptimizedCollectionProjector(0, 4, True, tuple_max_size=8)
+
+    def test_converts_kinds(self):
+        value = self.projector.project(
+            {"seq": (1, 2), "set": {3}, "map": {"a": [4, {"b": 5}]}, "wide": list(range(6))}
+        )
+        result = to_builtin(value)
+        self.assertIs(type(result), dict)
+        self.assertEqual(
+            result,
+            {"seq": [1, 2], "set": {3}, "map": {"a": [4, {"b": 5}]}, "wide": list(range(6))},
+        )
+        self.assertIs(type(result["seq"]), list)
+        self.assertIs(type(result["set"]), set)
+        self.assertIs(type(result["map"]["a"][1]), dict)
+
+    def test_collections_types(self):
+        result = to_builtin({"c": Counter("aab"), "od": OrderedDict(x=1), "dq": deque([1, 2])})
+        self.assertEqual(result, {"c": {"a": 2, "b": 1}, "od": {"x": 1}, "dq": [1, 2]})
+        self.assertIs(type(result["c"]), dict)
+        self.assertIs(type(result["od"]), dict)
+        self.assertIs(type(result["dq"]), list)
+
+    def test_keeps_keys_and_scalars(self):
+        key = (1, 2)
+        result = to_builtin(self.projector.project({key: "text", "bytes": b"raw"}))
+        self.assertIs(next(iter(result)), key)
+        self.assertEqual(result["bytes"], b"raw")
+        self.assertEqual(to_builtin(5), 5)
+        self.assertEqual(to_builtin("text"), "text")
+
+    def test_copies_builtins(self):
+        original = {"a": [1]}
+        result = to_builtin(original)
+        self.assertEqual(result, original)
+        self.assertIsNot(result, original)
+        self.assertIsNot(result["a"], original["a"])
+
+    def test_shallow(self):
+        inner = self.projector.seq([1, 2])
+        result = to_builtin(self.projector.mapping({"a": inner}), deep=False)
+        self.assertIs(type(result), dict)
+        self.assertIs(result["a"], inner)
+
+    def test_shared_references(self):
+        shared = self.projector.mapping({"x": 1})
+        result = to_builtin(self.projector.seq([shared, shared, {"y": shared}]))
+        self.assertIs(result[0], result[1])
+        self.assertIs(result[2]["y"], result[0])
+
+    def test_cycles(self):
+        loop = []
+        loop.append(loop)
+        result = to_builtin(loop)
+        self.assertIsNot(result, loop)
+        self.assertIs(result[0], result)
+
+        node = self.projector.mut_mapping({"name": "node"})
+        node["self"] = node
+        node["children"] = self.projector.mut_seq([node])
+        result = to_builtin(node)
+        self.assertIs(type(result), dict)
+        self.assertIs(result["self"], result)
+        self.assertIs(result["children"][0], result)
+
+    def test_deep_graph(self):
+        value = leaf = []
+        for _ in range(sys.getrecursionlimit() * 2):
+            value = [value]
+        result = to_builtin(value)
+        for _ in range(sys.getrecursionlimit() * 2):
+            result = result[0]
+        self.assertEqual(result, leaf)
+
+
+if __name__ == "__main__":
+    unittest.main()
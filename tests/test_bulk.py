@@ -0,0 +1,110 @@
+from functools import partial
+import gc
+import sys
+import unittest
+
+from opticol.bulk import _pack, _unpack, build_mappings, build_seqs, bulk_load, bulk_project
+from opticol import _deep
+from opticol.projector import OptimizedCollectionProjector, PassThroughProjector
+
+
+class BulkLoadTest(unittest.TestCase):
+    def tearDown(self):
+        gc.unfreeze()
+        gc.enable()
+
+    def test_freezes_on_normal_exit(self):
+        gc.unfreeze()
+        with bulk_load() as load:
+            self.assertFalse(gc.isenabled())
+            data = [[i] for i in range(100)]
+        self.assertTrue(gc.isenabled())
+        self.assertGreater(load.frozen, 0)
+        self.assertEqual(len(data), 100)
+
+    def test_exception_only_restores_the_collector(self):
+        gc.unfreeze()
+        with self.assertRaises(RuntimeError):
+            with bulk_load():
+                raise RuntimeError()
+        self.assertTrue(gc.isenabled())
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_disabled_collector_stays_disabled(self):
+        gc.disable()
+        with bulk_load(freeze=False) as load:
+            pass
+        self.assertFalse(gc.isenabled())
+
+
+class PackTest(unittest.TestCase):
+    def setUp(self):
+        self.projectors = _deep.projectors_of(PassThroughProjector(), False)
+
+    def test_round_trip_keeps_sharing(self):
+        shared = [1, 2]
+        record = {"a": shared, "b": (shared, {3, 4}), "c": "text"}
+        result = _unpack(_pack(record, {}), self.projectors, {})
+        self.assertEqual(result, {"a": [1, 2], "b": [[1, 2], {3, 4}], "c": "text"})
+        self.assertIs(result["a"], result["b"][0])
+
+    def test_deep_graph(self):
+        record = []
+        node = record
+        for _ in range(10 * sys.getrecursionlimit()):
+            node.append([])
+            node = node[0]
+        result = _unpack(_pack(record, {}), self.projectors, {})
+        depth = 0
+        while result:
+            result = result[0]
+            depth += 1
+        self.assertEqual(depth, 10 * sys.getrecursionlimit())
+
+    def test_cycle(self):
+        record = [1]
+        record.append(record)
+        with self.assertRaises(ValueError):
+            _pack(record, {})
+
+
+class BulkProjectTest(unittest.TestCase):
+    def test_executors(self):
+        factory = partial(OptimizedCollectionProjector, 0, 3, True)
+        items = [{"a": [i, i + 1]} for i in range(10)]
+        for executor in ("auto", "serial", "thread", "process"):
+            with self.subTest(executor=executor):
+                result = bulk_project(items, factory, executor=executor, chunk_size=3)
+                self.assertEqual([list(r["a"]) for r in result], [[i, i + 1] for i in range(10)])
+                self.assertNotIsInstance(result[0], dict)
+
+    def test_invalid_executor(self):
+        with self.assertRaises(ValueError):
+            bulk_project([], partial(OptimizedCollectionProjector, 0, 3, True), executor="pool")
+
+
+class BuildTest(unittest.TestCase):
+    def test_empty_data(self):
+        for layout in ("rows", "columns", "buffer"):
+            data = b"" if layout == "buffer" else []
+            with self.subTest(layout=layout):
+                self.assertEqual(build_seqs(data, 2, layout=layout), [])
+                self.assertEqual(build_mappings(data, ("a", "b"), layout=layout), [])
+
+    def test_columns(self):
+        rows = build_mappings([(1, 2), (3, 4)], ("a", "b"), layout="columns")
+        self.assertEqual([dict(row) for row in rows], [{"a": 1, "b": 3}, {"a": 2, "b": 4}])
+
+    def test_intern_keys_requires_str(self):
+        with self.assertRaises(ValueError):
+            build_mappings([(1, 2)], ("a", 1), intern_keys=True)
+        rows = build_mappings([(1, 2)], ("a", "b"), intern_keys=True)
+        self.assertEqual(dict(rows[0]), {"a": 1, "b": 2})
+
+    def test_mutable_rejects_project(self):
+        with self.assertRaises(ValueError):
+            build_mappings([(1, 2)], ("a", "b"), mutable=True, project=lambda m: m)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+
+from opticol import _codec
+from opticol.shared import SharedBlock, SharedMemoryProjector
+
+
+def _decode(value):
+    return _codec.decode(memoryview(_codec.encode(value)))
+
+
+class CodecTest(unittest.TestCase):
+    def test_round_trip(self):
+        value = {"a": [1, 2.5, None, True], "b": {"c": b"x"}, "d": {3, 4}, "e": 2**70}
+        decoded = _decode(value)
+        self.assertEqual(list(decoded["a"]), [1, 2.5, None, True])
+        self.assertEqual(decoded["b"], {"c": b"x"})
+        self.assertEqual(decoded["d"], {3, 4})
+        self.assertEqual(decoded["e"], 2**70)
+
+    def test_tuple_keys(self):
+        decoded = _decode({(1, "a"): 1, ((2,), 3): 2, frozenset((4,)): 3})
+        self.assertEqual(decoded[(1, "a")], 1)
+        self.assertEqual(decoded[((2,), 3)], 2)
+        self.assertEqual(decoded[frozenset((4,))], 3)
+        self.assertIs(type(next(iter(decoded))), tuple)
+        self.assertEqual(hash(next(iter(decoded))), hash((1, "a")))
+
+    def test_tuple_elements(self):
+        decoded = _decode({(1, 2), (3, (4,))})
+        self.assertIn((1, 2), decoded)
+        self.assertIn((3, (4,)), decoded)
+        self.assertEqual(decoded, {(1, 2), (3, (4,))})
+
+    def test_indexed_lookups(self):
+        mapping = {f"k{i}": i for i in range(100)}
+        decoded = _decode({"m": mapping, "s": set(range(100))})
+        for key, value in mapping.items():
+            self.assertEqual(decoded["m"][key], value)
+        self.assertNotIn("missing", decoded["m"])
+        with self.assertRaises(KeyError):
+            decoded["m"]["missing"]
+        self.assertIn(99, decoded["s"])
+        self.assertNotIn(100, decoded["s"])
+        self.assertEqual(decoded["s"], set(range(100)))
+
+    def test_index_shared_between_views(self):
+        decoded = _decode({"m": {f"k{i}": i for i in range(100)}, "s": set(range(100))})
+        decoded["m"]["k1"]
+        self.assertIn(99, decoded["s"])
+        indexes = decoded._indexes
+        self.assertEqual(len(indexes), 2)
+
+        # Views created by later accesses through the parent reuse the indexes.
+        self.assertEqual(decoded["m"]["k50"], 50)
+        self.assertIn(50, decoded["s"])
+        self.assertEqual(len(indexes), 2)
+        self.assertIs(decoded["m"]._indexes, indexes)
+
+    def test_small_lookups(self):
+        decoded = _decode({"a": 1, "b": 2})
+        self.assertEqual(decoded["b"], 2)
+        self.assertIsNone(decoded.get("c"))
+
+
+class SharedBlockTest(unittest.TestCase):
+    def test_close(self):
+        block = SharedBlock.create({"a": [1, 2]})
+        try:
+            view = block.root["a"]
+            self.assertEqual(view[1], 2)
+            block.close()
+            with self.assertRaises(ValueError):
+                view[0]
+            with self.assertRaises(ValueError):
+                block.root
+        finally:
+            block.unlink()
+
+
+class SharedMemoryProjectorTest(unittest.TestCase):
+    def test_project_uses_one_block(self):
+        projector = SharedMemoryProjector()
+        root = projector.project({"a": [1, 2], "b": {"c": (3,)}, "d": [{"e": 4}]})
+        try:
+            self.assertEqual(len(projector.blocks), 1)
+            self.assertEqual(root["d"][0]["e"], 4)
+            self.assertEqual(list(root["b"]["c"]), [3])
+        finally:
+            del root
+            projector.close()
+
+    def test_project_leaves(self):
+        projector = SharedMemoryProjector()
+        self.assertEqual(projector.project("text"), "text")
+        self.assertEqual(projector.blocks, [])
+
+    def test_project_mutable_uses_fallback(self):
+        projector = SharedMemoryProjector()
+        value = [[1]]
+        self.assertIs(projector.project(value, mutable=True), value)
+        self.assertEqual(projector.blocks, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+from collections import Counter, defaultdict, deque, OrderedDict
+import importlib
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+
+from opticol.codegen import generate_module, write_module
+
+
+class CodegenTest(unittest.TestCase):
+    def load(self, name, *args, **kwargs):
+        directory = tempfile.mkdtemp()
+        write_module(os.path.join(directory, f"{name}.py"), *args, **kwargs)
+        sys.path.insert(0, directory)
+        self.addCleanup(sys.path.remove, directory)
+        self.addCleanup(sys.modules.pop, name, None)
+        return importlib.import_module(name)
+
+    def test_stable_names(self):
+        module = self.load("_opticol_codegen_names", 0, 2, True)
+        p = module.projector
+
+        self.assertIs(type(p.seq([1, 2])), module.Size2Sequence)
+        self.assertIs(type(p.set({1})), module.Size1Set)
+        self.assertIs(type(p.mapping({"a": 1})), module.Size1Mapping)
+        self.assertIs(type(p.mut_seq([1])), module.Size1MutableSequence)
+        self.assertIs(type(p.mut_mapping({})), module.Size0MutableMapping)
+        self.assertEqual(module.Size2Sequence.__module__, "_opticol_codegen_names")
+        self.assertEqual(module.Size2Sequence.__getitem__.__qualname__, "Size2Sequence.__getitem__")
+        self.assertIs(
+            module.Size1MutableSequenceOverflow, module.Size1MutableSequence._overflow_cls
+        )
+
+    def test_collections_classes(self):
+        module = self.load("_opticol_codegen_collections", 0, 2, False)
+        p = module.projector
+
+        self.assertIs(type(p.counter(Counter("ab"))), module.Size2Counter)
+        self.assertIs(type(p.default_dict(defaultdict(list, a=[1]))), module.Size1DefaultDict)
+        self.assertIs(type(p.ordered_dict(OrderedDict(a=1))), module.Size1OrderedDict)
+        self.assertIs(type(p.deque(deque([1, 2]))), module.Size2Deque)
+
+        counter = p.counter(Counter("ab"))
+        counter.update("cde")
+        self.assertIs(type(counter), module.Size2CounterOverflow)
+        self.assertEqual(counter["c"], 1)
+
+    def test_intern_keys(self):
+        module = self.load("_opticol_codegen_intern", 1, 2, False, intern_keys=True)
+
+        self.assertIs(type(module.projector.mapping({"a": 1})), module.Size1StrMapping)
+        self.assertFalse(hasattr(module, "Size1Mapping"))
+
+    def test_pickle_by_name(self):
+        module = self.load("_opticol_codegen_pickle", 0, 3, True)
+        p = module.projector
+        values = [
+            p.seq([1, 2]),
+            p.set({1, 2, 3}),
+            p.mapping({"a": 1, "b": [1, 2]}),
+            p.mut_mapping({"a": 1}),
+            p.counter(Counter("aab")),
+        ]
+
+        for value in values:
+            with self.subTest(type=type(value).__name__):
+                data = pickle.dumps(value)
+                self.assertIn(type(value).__name__.encode(), data)
+                restored = pickle.loads(data)
+                self.assertIs(type(restored), type(value))
+                self.assertEqual(list(restored), list(value))
+
+    def test_source_is_deterministic(self):
+        self.assertEqual(generate_module(0, 3, True), generate_module(0, 3, True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+from collections import Counter, OrderedDict, defaultdict, deque
+import unittest
+
+from opticol import _deep, to_builtin
+from opticol.bulk import _pack, _unpack
+from opticol.lazy import LazyProjector
+from opticol.projector import OptimizedCollectionProjector
+
+
+class DeepProjectionTest(unittest.TestCase):
+    def setUp(self):
+        self.projector = OptimizedCollectionProjector(1, 4, True)
+        self.graph = {
+            "c": Counter("aab"),
+            "dd": defaultdict(list, {"k": [1, 2]}),
+            "od": OrderedDict(x=1, y=2),
+            "dq": deque([{"n": 1}, 2], maxlen=3),
+        }
+
+    def check(self, result):
+        self.assertNotIsInstance(result["c"], Counter)
+        self.assertEqual(result["c"]["a"], 2)
+        self.assertEqual(result["c"]["zz"], 0)
+
+        self.assertNotIsInstance(result["dd"], defaultdict)
+        self.assertIs(result["dd"].default_factory, list)
+        self.assertEqual(list(result["dd"]["k"]), [1, 2])
+        self.assertEqual(result["dd"]["new"], [])
+
+        self.assertNotIsInstance(result["od"], OrderedDict)
+        result["od"].move_to_end("x")
+        self.assertEqual(list(result["od"]), ["y", "x"])
+
+        self.assertNotIsInstance(result["dq"], deque)
+        self.assertEqual(result["dq"].maxlen, 3)
+        self.assertEqual(dict(result["dq"][0]), {"n": 1})
+        result["dq"].appendleft(0)
+        self.assertEqual(result["dq"][0], 0)
+
+    def test_project(self):
+        self.check(self.projector.project(self.graph))
+
+    def test_project_mutable(self):
+        self.check(self.projector.project(self.graph, mutable=True))
+
+    def test_lazy_project(self):
+        self.check(LazyProjector(self.projector).project(self.graph))
+
+    def test_bulk_unpack(self):
+        projectors = _deep.projectors_of(self.projector, False)
+        self.check(_unpack(_pack(self.graph, {}), projectors, {}))
+
+    def test_subclass(self):
+        class Tally(Counter):
+            pass
+
+        result = self.projector.project([Tally("ab")])
+        self.assertEqual(result[0]["zz"], 0)
+        self.assertNotIsInstance(result[0], Tally)
+
+    def test_to_builtin(self):
+        result = to_builtin(self.projector.project(self.graph))
+        self.assertEqual(result["c"], {"a": 2, "b": 1})
+        self.assertEqual(result["dq"], [{"n": 1}, 2])
+
+
+class CounterEqualityTest(unittest.TestCase):
+    def setUp(self):
+        self.projector = OptimizedCollectionProjector(1, 4, True)
+
+    def test_zero_counts(self):
+        counter = self.projector.counter(Counter(a=2, b=1, c=1))
+        self.assertEqual(counter, Counter(a=2, b=1, c=1, d=0))
+        self.assertEqual(Counter(a=2, b=1, c=1, d=0), counter)
+        self.assertEqual(counter, self.projector.counter(Counter(a=2, b=1, c=1, d=0)))
+        self.assertNotEqual(counter, Counter(a=2, b=1))
+
+    def test_overflow(self):
+        counter = self.projector.counter(Counter(a=1))
+        counter.update("bcdef")
+        self.assertEqual(counter, Counter(a=1, b=1, c=1, d=1, e=1, f=1, z=0))
+
+    def test_plain_mapping(self):
+        counter = self.projector.counter(Counter(a=1))
+        self.assertEqual(counter, {"a": 1})
+        self.assertNotEqual(counter, {"a": 1, "b": 0})
+
+
+class DequeSelfExtendTest(unittest.TestCase):
+    def setUp(self):
+        self.projector = OptimizedCollectionProjector(1, 4, True)
+
+    def check(self, extend):
+        for values in ([1, 2], [1, 2, 3, 4, 5]):
+            expected = deque(values)
+            d = self.projector.deque(deque(values))
+            d.append(6)
+            expected.append(6)
+            getattr(d, extend)(d)
+            getattr(expected, extend)(expected)
+            self.assertEqual(list(d), list(expected))
+
+    def test_extend(self):
+        self.check("extend")
+
+    def test_extendleft(self):
+        self.check("extendleft")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from opticol import _deep
+from opticol.projector import OptimizedCollectionProjector
+
+
+class KeepDeclinedTest(unittest.TestCase):
+    def setUp(self):
+        self.projector = OptimizedCollectionProjector(1, 2, True)
+
+    def test_declined_collections_are_kept(self):
+        big_list = [1, 2, 3, 4]
+        big_dict = {"a": 1, "b": 2, "c": 3}
+        big_set = {1, 2, 3}
+        for value in (big_list, big_dict, big_set):
+            self.assertIs(self.projector.project(value), value)
+            self.assertIs(self.projector.project(value, mutable=True), value)
+
+    def test_tuple_and_frozenset_keep_their_type(self):
+        big_tuple = (1, 2, 3, 4)
+        big_frozenset = frozenset((1, 2, 3))
+        self.assertIs(self.projector.project(big_tuple), big_tuple)
+        self.assertIs(self.projector.project(big_frozenset), big_frozenset)
+
+        result = self.projector.project((1, 2, [3, 4], 5))
+        self.assertIs(type(result), tuple)
+        self.assertEqual(list(result[2]), [3, 4])
+
+    def test_changed_children_rebuild(self):
+        value = [1, 2, [3], 4]
+        result = self.projector.project(value)
+        self.assertIsNot(result, value)
+        self.assertIs(type(result), list)
+        self.assertIsNot(type(result[2]), list)
+        self.assertEqual(value, [1, 2, [3], 4])
+
+    def test_kinds_cache_is_bounded(self):
+        for _ in range(_deep._MAX_KINDS + 10):
+            _deep.kind_of(type("Dynamic", (), {})())
+        self.assertLessEqual(len(_deep._KINDS), _deep._MAX_KINDS)
+        self.assertEqual(_deep.kind_of([]), _deep.SEQUENCE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import io
+import json
+import unittest
+
+from opticol.encoder import dump, dumps, iterencode
+from opticol.projector import OptimizedCollectionProjector
+
+
+class EncoderTest(unittest.TestCase):
+    def setUp(self):
+        self.projector = OptimizedCollectionProjector(0, 3, True, tuple_max_size=8)
+        self.original = {
+            "id": 7,
+            "name": "row",
+            "tags": ["a", "b"],
+            "empty": [],
+            "nested": {"x": [1, {"y": None}], "z": {}},
+            "wide": {f"k{i}": i for i in range(6)},
+            "long": list(range(6)),
+            "huge": list(range(20)),
+        }
+
+    def assertRoundTrip(self, value, expected):
+        self.assertEqual(json.loads(dumps(value)), expected)
+
+    def test_immutable(self):
+        projected = self.projector.project(self.original)
+        self.assertRoundTrip(projected, self.original)
+
+    def test_mutable(self):
+        projected = self.projector.project(self.original, mutable=True)
+        self.assertRoundTrip(projected, self.original)
+
+        # Overflow past the slots, then underflow back into them.
+        projected["tags"].extend(["c", "d", "e"])
+        projected["nested"]["w"] = 1
+        self.assertRoundTrip(projected["tags"], ["a", "b", "c", "d", "e"])
+        del projected["tags"][2:]
+        self.assertRoundTrip(projected["tags"], ["a", "b"])
+        self.assertRoundTrip(projected["nested"], {"x": [1, {"y": None}], "z": {}, "w": 1})
+
+    def test_copy_on_write(self):
+        projector = OptimizedCollectionProjector(0, 2, True, mut_ownership="copy_on_write")
+        shared = projector.mut_seq(list(range(5)))
+        self.assertRoundTrip(shared, [0, 1, 2, 3, 4])
+        shared.append(5)
+        self.assertRoundTrip(shared, [0, 1, 2, 3, 4, 5])
+
+    def test_sets(self):
+        for size in (2, 6):
+            values = set(range(size))
+            self.assertEqual(sorted(json.loads(dumps(self.projector.set(values)))), sorted(values))
+            mut = self.projector.mut_set(values)
+            mut.add(99)
+            self.assertEqual(sorted(json.loads(dumps(mut))), sorted(values | {99}))
+
+    def test_matches_json_dumps(self):
+        projected = self.projector.project(self.original)
+        self.assertEqual(
+            dumps(projected, sort_keys=True), json.dumps(self.original, sort_keys=True)
+        )
+
+    def test_streaming(self):
+        projected = self.projector.project(self.original)
+        out = io.StringIO()
+        dump(projected, out, indent=1)
+        self.assertEqual("".join(iterencode(projected, indent=1)), out.getvalue())
+        self.assertEqual(json.loads(out.getvalue()), self.original)
+
+    def test_default_fallback(self):
+        value = self.projector.project({"when": 1j, "items": [2j]})
+        self.assertEqual(json.loads(dumps(value, default=repr)), {"when": "1j", "items": ["2j"]})
+        with self.assertRaises(TypeError):
+            dumps(value)
+
+    def test_atomic_sequences(self):
+        with self.assertRaises(TypeError):
+            dumps(self.projector.seq([b"raw"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
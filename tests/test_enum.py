@@ -0,0 +1,80 @@
+from enum import Enum, IntEnum
+import unittest
+
+from opticol.factory import create_enum_mapping_class, create_enum_mut_mapping_class
+
+
+class Color(Enum):
+    RED = 1
+    GREEN = 2
+    BLUE = 3
+
+
+class Level(IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+class EnumMappingTest(unittest.TestCase):
+    def test_lookup(self):
+        m = create_enum_mapping_class(Color)({Color.BLUE: "b", Color.RED: "r"})
+        self.assertEqual(m[Color.RED], "r")
+        self.assertEqual(m[Color.BLUE], "b")
+        self.assertEqual(len(m), 2)
+        self.assertIn(Color.RED, m)
+        self.assertNotIn(Color.GREEN, m)
+        self.assertEqual(m.get(Color.GREEN, 0), 0)
+
+    def test_missing_and_foreign_keys(self):
+        m = create_enum_mapping_class(Level)({Level.LOW: 1})
+        for key in (Level.HIGH, 1, "LOW", Color.RED):
+            with self.assertRaises(KeyError):
+                m[key]
+            self.assertNotIn(key, m)
+
+    def test_rejects_non_member_keys(self):
+        cls = create_enum_mapping_class(Color)
+        with self.assertRaises(TypeError):
+            cls({"RED": 1})
+
+    def test_iterates_in_member_order(self):
+        m = create_enum_mapping_class(Color)({Color.BLUE: 3, Color.RED: 1})
+        self.assertEqual(list(m), [Color.RED, Color.BLUE])
+        self.assertEqual(dict(m), {Color.RED: 1, Color.BLUE: 3})
+
+    def test_classes_are_cached(self):
+        self.assertIs(create_enum_mapping_class(Color), create_enum_mapping_class(Color))
+        self.assertIsNot(create_enum_mapping_class(Color), create_enum_mut_mapping_class(Color))
+
+
+class EnumMutableMappingTest(unittest.TestCase):
+    def test_set_and_delete(self):
+        m = create_enum_mut_mapping_class(Color)({})
+        m[Color.GREEN] = 2
+        m[Color.RED] = 1
+        self.assertEqual(list(m.items()), [(Color.RED, 1), (Color.GREEN, 2)])
+
+        del m[Color.RED]
+        self.assertEqual(dict(m), {Color.GREEN: 2})
+        with self.assertRaises(KeyError):
+            del m[Color.RED]
+
+        m.clear()
+        self.assertEqual(len(m), 0)
+
+    def test_stores_none_values(self):
+        m = create_enum_mut_mapping_class(Color)({Color.RED: None})
+        self.assertIn(Color.RED, m)
+        self.assertIsNone(m[Color.RED])
+
+    def test_rejects_non_member_keys(self):
+        m = create_enum_mut_mapping_class(Level)({})
+        with self.assertRaises(TypeError):
+            m[1] = "low"
+        with self.assertRaises(KeyError):
+            del m[1]
+        self.assertEqual(len(m), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
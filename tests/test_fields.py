@@ -0,0 +1,48 @@
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+import inspect
+import unittest
+
+from opticol.fields import projected
+from opticol.projector import OptimizedCollectionProjector
+
+_PROJECTOR = OptimizedCollectionProjector(0, 3, True)
+
+
+@projected(_PROJECTOR)
+@dataclass(slots=True)
+class Record:
+    """A record with collection fields."""
+
+    tags: Sequence[str]
+    attributes: Mapping[str, int] | None = None
+
+
+@projected(_PROJECTOR)
+@dataclass(frozen=True)
+class FrozenRecord:
+    tags: Sequence[str]
+
+
+class ProjectedTest(unittest.TestCase):
+    def test_fields_are_projected(self):
+        record = Record(["a", "b"], {"x": 1})
+        self.assertNotIsInstance(record.tags, list)
+        self.assertEqual(list(record.tags), ["a", "b"])
+        self.assertNotIsInstance(record.attributes, dict)
+        self.assertIsNone(Record([]).attributes)
+
+    def test_frozen(self):
+        self.assertNotIsInstance(FrozenRecord(["a"]).tags, list)
+
+    def test_init_metadata(self):
+        init = Record.__init__
+        self.assertEqual(init.__qualname__, "Record.__init__")
+        self.assertEqual(init.__module__, __name__)
+        self.assertTrue(hasattr(init, "__wrapped__"))
+        self.assertEqual(list(inspect.signature(Record).parameters), ["tags", "attributes"])
+        self.assertEqual(list(inspect.signature(init).parameters), ["self", "tags", "attributes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
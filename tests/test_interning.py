@@ -0,0 +1,180 @@
+import math
+import sys
+import unittest
+
+from opticol.interning import DEFAULT_TYPES, InternStats, InternTable
+from opticol.projector import OptimizedCollectionProjector
+
+
+def fresh(value):
+    """Create an object equal to value but distinct from it."""
+    if isinstance(value, str):
+        return "".join(list(value))
+    if isinstance(value, bytes):
+        return bytes(bytearray(value))
+    if isinstance(value, float):
+        return float(repr(value))
+    return tuple(list(value))
+
+
+class InternTableTest(unittest.TestCase):
+    def test_returns_canonical_object(self):
+        table = InternTable()
+        for value in ("status-ok", b"payload", 2.5, ("a", 1, None)):
+            with self.subTest(value=value):
+                first = fresh(value)
+                second = fresh(value)
+                self.assertIsNot(first, second)
+                self.assertIs(table(first), first)
+                self.assertIs(table(second), first)
+
+    def test_bound(self):
+        table = InternTable(max_entries=2)
+        a, b, c = (fresh(s) for s in ("value-a", "value-b", "value-c"))
+        table(a)
+        table(b)
+        table(c)
+
+        self.assertEqual(len(table), 2)
+        self.assertIs(table(fresh("value-a")), a)
+        # The table is full, so c was never added.
+        other_c = fresh("value-c")
+        self.assertIs(table(other_c), other_c)
+        self.assertEqual(table.stats()[str].entries, 2)
+
+    def test_stats_per_type(self):
+        table = InternTable()
+        word = "repeated-word"
+        copy = fresh(word)
+        table(word)
+        table(copy)
+        table(1.5)
+
+        stats = table.stats()
+        self.assertEqual(set(stats), set(DEFAULT_TYPES))
+        self.assertEqual(stats[str].lookups, 2)
+        self.assertEqual(stats[str].dedups, 1)
+        self.assertEqual(stats[str].saved_bytes, sys.getsizeof(copy))
+        self.assertEqual(stats[str].entries, 1)
+        self.assertEqual(stats[float], InternStats(lookups=1, dedups=0, saved_bytes=0, entries=1))
+        self.assertEqual(stats[bytes], InternStats())
+
+        # The returned statistics are snapshots.
+        stats[str].dedups = 100
+        self.assertEqual(table.stats()[str].dedups, 1)
+
+    def test_same_object_is_not_a_dedup(self):
+        table = InternTable()
+        word = "the-same-word"
+        table(word)
+        table(word)
+
+        self.assertEqual(table.stats()[str].dedups, 0)
+
+    def test_skips_zeros_and_nan(self):
+        table = InternTable()
+        for value in (0.0, -0.0, math.nan):
+            with self.subTest(value=value):
+                self.assertIs(table(value), value)
+        # -0.0 == 0.0, so interning them would flip the sign of some zeros.
+        self.assertEqual(math.copysign(1.0, table(-0.0)), -1.0)
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.stats()[float].lookups, 0)
+
+    def test_skips_tuples_holding_other_types(self):
+        table = InternTable()
+        for value in ((1.0,), (1, [2]), (("a",),)):
+            with self.subTest(value=value):
+                first = fresh(value)
+                self.assertIs(table(first), first)
+                second = fresh(value)
+                self.assertIs(table(second), second)
+        self.assertEqual(len(table), 0)
+
+    def test_tuples_are_keyed_by_element_types(self):
+        table = InternTable()
+        ints = (1, 2)
+        bools = (True, 2)
+
+        self.assertIs(table(ints), ints)
+        self.assertIs(table(bools), bools)
+        self.assertIs(type(table(fresh(bools))[0]), bool)
+
+    def test_other_types_are_not_interned(self):
+        table = InternTable()
+        big = 10**30
+        other = int(str(big))
+        table(big)
+
+        self.assertIs(table(other), other)
+        self.assertEqual(table([1]), [1])
+        self.assertNotIn(int, table.stats())
+        self.assertEqual(len(table), 0)
+
+    def test_custom_types(self):
+        table = InternTable(types=(int,))
+        first = 10**30
+        second = int(str(first))
+
+        self.assertIs(table(first), first)
+        self.assertIs(table(second), first)
+        self.assertEqual(set(table.stats()), {int})
+
+    def test_clear(self):
+        table = InternTable()
+        table("some-word")
+        table.clear()
+
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.stats()[str], InternStats())
+
+
+class ProjectorInternerTest(unittest.TestCase):
+    def test_interns_elements_keys_and_values(self):
+        table = InternTable()
+        projector = OptimizedCollectionProjector(0, 3, True, interner=table)
+        key = fresh("status-key")
+        value = fresh("status-value")
+
+        records = [
+            projector.mapping({fresh("status-key"): fresh("status-value")}),
+            projector.mapping({key: value}),
+        ]
+        seq = projector.seq([fresh("status-value")])
+        s = projector.set({fresh("status-value")})
+
+        first_key, first_value = next(iter(records[0].items()))
+        second_key, second_value = next(iter(records[1].items()))
+        self.assertIs(first_key, second_key)
+        self.assertIs(first_value, second_value)
+        self.assertIs(seq[0], first_value)
+        self.assertIs(next(iter(s)), first_value)
+        self.assertEqual(table.stats()[str].dedups, 4)
+
+    def test_mutable_and_large_collections(self):
+        table = InternTable()
+        projector = OptimizedCollectionProjector(0, 2, True, interner=table, persistent=True)
+        word = fresh("shared-word")
+        table(word)
+
+        mut = projector.mut_seq([fresh("shared-word")])
+        large = projector.seq([fresh("shared-word")] * 5)
+
+        self.assertIs(mut[0], word)
+        self.assertTrue(all(element is word for element in large))
+
+    def test_unchanged_collections_are_left_alone(self):
+        table = InternTable()
+        projector = OptimizedCollectionProjector(1, 2, True, interner=table)
+        large = [fresh("left-alone")] * 5
+
+        self.assertIs(projector.seq(large), large)
+        self.assertEqual(table.stats()[str].lookups, 0)
+
+    def test_any_callable(self):
+        projector = OptimizedCollectionProjector(0, 2, True, interner=str.upper)
+        self.assertEqual(list(projector.seq(["a", "b"])), ["A", "B"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import sys
+import unittest
+
+from opticol.factory import (
+    create_mapping_class,
+    create_str_mapping_class,
+    create_str_mut_mapping_class,
+)
+from opticol.projector import OptimizedCollectionProjector
+
+
+def fresh(text):
+    """Build a str at runtime, so that it is not the interned copy of a literal."""
+    return "".join(list(text))
+
+
+class StrKey(str):
+    pass
+
+
+class StrMappingTest(unittest.TestCase):
+    def test_interns_keys(self):
+        key = fresh("status-key")
+        self.assertIsNot(key, sys.intern(fresh("status-key")))
+
+        m = create_str_mapping_class(2)({key: 1, fresh("other-key"): 2})
+        for k in m:
+            self.assertIs(k, sys.intern(k))
+        self.assertEqual(m[fresh("status-key")], 1)
+
+    def test_shares_keys_between_instances(self):
+        cls = create_str_mapping_class(1)
+        first, second = cls({fresh("shared"): 1}), cls({fresh("shared"): 2})
+        self.assertIs(next(iter(first)), next(iter(second)))
+
+    def test_keeps_other_keys(self):
+        sub = StrKey("sub")
+        m = create_str_mapping_class(3)({1: "int", (1, 2): "tuple", sub: "subclass"})
+        self.assertEqual(m[1], "int")
+        self.assertEqual(m[(1, 2)], "tuple")
+        self.assertIs(next(k for k in m if isinstance(k, StrKey)), sub)
+        self.assertNotIn("missing", m)
+
+    def test_equals_plain_mapping(self):
+        data = {fresh("a"): 1, fresh("b"): 2}
+        self.assertEqual(create_str_mapping_class(2)(data), create_mapping_class(2)(data))
+
+
+class StrMutableMappingTest(unittest.TestCase):
+    def test_interns_written_keys(self):
+        m = create_str_mut_mapping_class(2)({})
+        m[fresh("written")] = 1
+        (key,) = m
+        self.assertIs(key, sys.intern(fresh("written")))
+
+    def test_overflow_and_underflow(self):
+        m = create_str_mut_mapping_class(2)({fresh("a"): 1})
+        m[fresh("b")] = 2
+        m[fresh("c")] = 3
+        self.assertEqual(dict(m), {"a": 1, "b": 2, "c": 3})
+
+        del m["c"]
+        self.assertEqual(dict(m), {"a": 1, "b": 2})
+        for k in m:
+            self.assertIs(k, sys.intern(k))
+
+
+class ProjectorInternKeysTest(unittest.TestCase):
+    def test_routes_mappings_to_str_classes(self):
+        projector = OptimizedCollectionProjector(0, 4, True, intern_keys=True)
+        m = projector.mapping({fresh("row-key"): 1})
+        self.assertIs(type(m), create_str_mapping_class(1, projector.mapping))
+        self.assertIs(next(iter(m)), sys.intern(fresh("row-key")))
+
+        mut = projector.mut_mapping({fresh("row-key"): 1})
+        mut[fresh("added-key")] = 2
+        self.assertEqual(dict(mut), {"row-key": 1, "added-key": 2})
+        for k in mut:
+            self.assertIs(k, sys.intern(k))
+
+    def test_deep_projection(self):
+        projector = OptimizedCollectionProjector(0, 4, True, intern_keys=True)
+        rows = projector.project([{fresh("id"): i, fresh("name"): str(i)} for i in range(3)])
+        keys = [k for row in rows for k in row]
+        self.assertEqual(len({id(k) for k in keys}), 2)
+        self.assertEqual(dict(rows[2]), {"id": 2, "name": "2"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import asyncio
+from collections import Counter, deque
+from collections.abc import Mapping, MutableMapping, MutableSequence, MutableSet, Sequence, Set
+import unittest
+
+from opticol.lazy import LazyProjector, LazyStats
+from opticol.projector import OptimizedCollectionProjector
+
+
+class LazyProjectorTest(unittest.TestCase):
+    def setUp(self):
+        self.projector = OptimizedCollectionProjector(0, 3, True)
+        self.lazy = LazyProjector(self.projector)
+
+    def test_materializes_on_first_access(self):
+        proxy = self.lazy.mapping({"a": 1})
+
+        self.assertIsInstance(proxy, Mapping)
+        self.assertFalse(proxy.materialized)
+        self.assertEqual(self.lazy.stats(), LazyStats(proxies=1, materialized=0))
+
+        self.assertEqual(proxy["a"], 1)
+        self.assertTrue(proxy.materialized)
+        self.assertEqual(type(proxy._value), type(self.projector.mapping({"a": 1})))
+        self.assertEqual(self.lazy.stats(), LazyStats(proxies=1, materialized=1))
+
+        proxy["a"]
+        self.assertEqual(self.lazy.stats().materialized, 1)
+
+    def test_any_access_materializes(self):
+        for access in (len, list, repr, lambda proxy: 1 in proxy, lambda proxy: proxy == [1]):
+            with self.subTest(access=access):
+                proxy = self.lazy.seq([1])
+                access(proxy)
+                self.assertTrue(proxy.materialized)
+
+    def test_project_wraps_nested_collections_on_access(self):
+        payload = self.lazy.project({"user": {"name": "a"}, "tags": ["x", "y"], "ids": {1, 2}})
+
+        self.assertEqual(self.lazy.stats(), LazyStats(proxies=1, materialized=0))
+        self.assertEqual(payload["user"]["name"], "a")
+        # The root and user are materialized, tags and ids were only wrapped.
+        self.assertEqual(self.lazy.stats(), LazyStats(proxies=4, materialized=2))
+        self.assertFalse(payload["tags"].materialized)
+        self.assertIsInstance(payload["tags"], Sequence)
+        self.assertIsInstance(payload["ids"], Set)
+        self.assertEqual(self.lazy.stats().materialized_fraction, 0.5)
+
+    def test_materialized_fraction(self):
+        self.assertEqual(LazyStats().materialized_fraction, 0.0)
+        self.assertEqual(LazyStats(proxies=4, materialized=1).materialized_fraction, 0.25)
+
+        proxies = [self.lazy.seq([i]) for i in range(4)]
+        proxies[0][0]
+        self.assertEqual(self.lazy.stats().materialized_fraction, 0.25)
+
+        self.lazy.reset()
+        self.assertEqual(self.lazy.stats().materialized_fraction, 0.0)
+
+    def test_mutable_proxies(self):
+        payload = self.lazy.project({"items": [1, 2], "ids": {1}}, mutable=True)
+
+        self.assertIsInstance(payload, MutableMapping)
+        payload["items"].append(3)
+        payload["ids"].add(2)
+        payload["new"] = 1
+        del payload["new"]
+
+        self.assertIsInstance(payload["items"], MutableSequence)
+        self.assertIsInstance(payload["ids"], MutableSet)
+        self.assertEqual(list(payload["items"]), [1, 2, 3])
+        self.assertEqual(set(payload["ids"]), {1, 2})
+        self.assertEqual(sorted(payload), ["ids", "items"])
+
+    def test_mutable_projection_methods(self):
+        seq = self.lazy.mut_seq([1, 2])
+        seq.extend([3, 4])
+        self.assertEqual(seq.pop(), 4)
+        self.assertEqual(list(seq), [1, 2, 3])
+
+        s = self.lazy.mut_set({1})
+        s.discard(1)
+        self.assertEqual(len(s), 0)
+        self.assertEqual(type(s | {2}), set)
+
+        mapping = self.lazy.mut_mapping({"a": 1})
+        self.assertEqual(mapping.pop("a"), 1)
+        self.assertEqual(mapping.pop("a", None), None)
+
+    def test_collections_types_are_projected_eagerly(self):
+        counter = Counter("aab")
+        dq = deque([1, 2])
+        payload = self.lazy.project({"counts": counter, "queue": dq})
+        payload["counts"]
+
+        self.assertEqual(self.lazy.stats(), LazyStats(proxies=1, materialized=1))
+        self.assertEqual(type(payload["counts"]), type(self.projector.counter(counter)))
+        self.assertEqual(type(payload["queue"]), type(self.projector.deque(dq)))
+        self.assertEqual(payload["counts"]["a"], 2)
+
+        self.assertEqual(type(self.lazy.project(counter)), type(self.projector.counter(counter)))
+
+    def test_non_collections_are_returned_unchanged(self):
+        self.assertEqual(self.lazy.project(1), 1)
+        self.assertEqual(self.lazy.project("abc"), "abc")
+        self.assertEqual(self.lazy.stats(), LazyStats())
+
+    def test_proxies_are_not_wrapped_again(self):
+        proxy = self.lazy.project([1, [2]])
+        self.assertIs(self.lazy.project(proxy), proxy)
+
+    def test_aproject(self):
+        proxy = asyncio.run(self.lazy.aproject({"a": [1]}))
+        self.assertEqual(proxy["a"][0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+from collections import UserDict, UserList
+from itertools import chain
+import unittest
+from unittest import mock
+
+from opticol._convert import converter
+from opticol.factory import (
+    create_mapping_class,
+    create_mut_mapping_class,
+    create_mut_seq_class,
+    create_mut_set_class,
+    create_seq_class,
+    create_set_class,
+    create_str_mapping_class,
+    create_str_mut_mapping_class,
+    create_tuple_mapping_class,
+    create_tuple_set_class,
+)
+from opticol.projector import OptimizedCollectionProjector
+
+
+class MakeTest(unittest.TestCase):
+    def check(self, cls, source, *values):
+        made = cls._make(*values)
+        built = cls(source)
+        self.assertIs(type(made), type(built))
+        # Sequences have no __eq__, so the contents are compared as read from the slots.
+        self.assertEqual(converter(type(made))(made), converter(type(built))(built))
+        return made
+
+    def test_sequences(self):
+        self.check(create_seq_class(3), [1, 2, 3], 1, 2, 3)
+        made = self.check(create_mut_seq_class(3, None), [1, 2], 1, 2)
+        made.append(3)
+        made.append(4)
+        self.assertEqual(list(made), [1, 2, 3, 4])
+
+    def test_sets(self):
+        self.check(create_set_class(2), {1, 2}, 1, 2)
+        made = self.check(create_mut_set_class(3, None), {1, 2}, 1, 2)
+        made.add(3)
+        self.assertEqual(made, {1, 2, 3})
+
+    def test_mappings(self):
+        pairs = {"a": 1, "b": 2}
+        interleaved = chain.from_iterable(pairs.items())
+        self.check(create_mapping_class(2), pairs, *interleaved)
+        made = self.check(create_mut_mapping_class(3), pairs, "a", 1, "b", 2)
+        made["c"] = 3
+        self.assertEqual(dict(made), {"a": 1, "b": 2, "c": 3})
+
+    def test_str_mappings_intern(self):
+        key = "".join(["ke", "y"])
+        for cls in (create_str_mapping_class(1), create_str_mut_mapping_class(1)):
+            made = self.check(cls, {key: 1}, key, 1)
+            self.assertIs(next(iter(made)), "key")
+
+    def test_tuple_classes(self):
+        s = create_tuple_set_class()(set(range(10)))
+        self.assertEqual(type(s)._make(s._items, s._index), s)
+        m = create_tuple_mapping_class()({i: -i for i in range(10)})
+        self.assertEqual(type(m)._make(m._keys, m._values), m)
+
+
+class TrustedRoutingTest(unittest.TestCase):
+    def assertInit(self, projector, method, collection, expected):
+        result = getattr(projector, method)(collection)
+        cls = type(result)
+        with mock.patch.object(cls, "__init__", autospec=True, side_effect=cls.__init__) as init:
+            result = getattr(projector, method)(collection)
+        self.assertEqual(init.called, expected)
+        self.assertIs(type(result), cls)
+        return result
+
+    def test_builtin_inputs_skip_init(self):
+        projector = OptimizedCollectionProjector(0, 4, True)
+        self.assertInit(projector, "seq", [1, 2], False)
+        self.assertInit(projector, "seq", (1, 2), False)
+        self.assertInit(projector, "mut_seq", [1, 2], False)
+        self.assertInit(projector, "set", frozenset((1, 2)), False)
+        self.assertInit(projector, "mut_set", {1, 2}, False)
+        self.assertInit(projector, "mapping", {"a": 1}, False)
+        self.assertInit(projector, "mut_mapping", {"a": 1}, False)
+
+    def test_untrusted_inputs_use_init(self):
+        projector = OptimizedCollectionProjector(0, 4, True)
+
+        class Row(dict):
+            pass
+
+        self.assertInit(projector, "seq", UserList([1, 2]), True)
+        self.assertInit(projector, "mapping", UserDict(a=1), True)
+        self.assertInit(projector, "mapping", Row(a=1), True)
+        self.assertInit(projector, "mut_mapping", Row(a=1), True)
+
+    def test_trusted_types(self):
+        projector = OptimizedCollectionProjector(0, 4, True, trusted_types=(UserList, UserDict))
+        self.assertEqual(list(self.assertInit(projector, "seq", UserList([1, 2]), False)), [1, 2])
+        self.assertEqual(
+            dict(self.assertInit(projector, "mapping", UserDict(a=1), False)), {"a": 1}
+        )
+
+    def test_interned_inputs(self):
+        projector = OptimizedCollectionProjector(0, 4, True, interner=lambda v: v)
+        self.assertInit(projector, "seq", [1, 2], False)
+        self.assertInit(projector, "seq", UserList([1, 2]), True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+from collections.abc import ItemsView, ValuesView
+import unittest
+
+from opticol._mapping import END
+from opticol.factory import (
+    create_mapping_class,
+    create_mut_mapping_class,
+    create_str_mapping_class,
+    create_str_mut_mapping_class,
+)
+
+
+def slot_values(instance):
+    return [getattr(instance, name) for name in type(instance).__slots__]
+
+
+class PairSlotsTest(unittest.TestCase):
+    def test_slot_names(self):
+        self.assertEqual(create_mapping_class(0).__slots__, ())
+        self.assertEqual(create_mapping_class(2).__slots__, ("_key0", "_val0", "_key1", "_val1"))
+        self.assertEqual(create_mut_mapping_class(1).__slots__, ("_key0", "_val0"))
+        self.assertEqual(create_str_mapping_class(1).__slots__, ("_key0", "_val0"))
+        self.assertEqual(create_str_mut_mapping_class(1).__slots__, ("_key0", "_val0"))
+
+    def test_pairs_are_stored_in_insertion_order(self):
+        mapping = create_mapping_class(2)({"x": 1, "y": [2]})
+
+        self.assertEqual(slot_values(mapping), ["x", 1, "y", [2]])
+        self.assertEqual(list(mapping), ["x", "y"])
+        self.assertEqual(list(mapping.items()), [("x", 1), ("y", [2])])
+        self.assertEqual(list(mapping.values()), [1, [2]])
+
+    def test_none_keys_and_values(self):
+        mapping = create_mapping_class(2)({None: None, "a": None})
+
+        self.assertEqual(mapping[None], None)
+        self.assertIn(None, mapping)
+        self.assertEqual(list(mapping.items()), [(None, None), ("a", None)])
+
+    def test_views(self):
+        mapping = create_mapping_class(2)({"x": 1, "y": 2})
+
+        self.assertIsInstance(mapping.items(), ItemsView)
+        self.assertIsInstance(mapping.values(), ValuesView)
+        self.assertIn(("x", 1), mapping.items())
+        self.assertNotIn(("x", 2), mapping.items())
+        self.assertEqual(mapping.items(), {("x", 1), ("y", 2)})
+        self.assertIn(2, mapping.values())
+        self.assertEqual(len(mapping.values()), 2)
+
+    def test_make_takes_interleaved_pairs(self):
+        cls = create_mapping_class(2)
+        mapping = cls._make("x", 1, "y", 2)
+
+        self.assertEqual(slot_values(mapping), ["x", 1, "y", 2])
+        self.assertEqual(mapping, {"x": 1, "y": 2})
+
+    def test_mutable_unused_pairs_hold_end(self):
+        mapping = create_mut_mapping_class(3)({"a": 1})
+
+        self.assertEqual(slot_values(mapping), ["a", 1, END, END, END, END])
+        self.assertEqual(len(mapping), 1)
+
+    def test_mutable_assignment_in_place(self):
+        cls = create_mut_mapping_class(3)
+        mapping = cls({"a": 1, "b": 2})
+
+        mapping["a"] = 10
+        self.assertEqual(slot_values(mapping), ["a", 10, "b", 2, END, END])
+
+        mapping[None] = None
+        self.assertIs(type(mapping), cls)
+        self.assertEqual(slot_values(mapping), ["a", 10, "b", 2, None, None])
+        self.assertEqual(mapping[None], None)
+
+    def test_mutable_delete_compacts_pairs(self):
+        cls = create_mut_mapping_class(3)
+        mapping = cls({"a": 1, "b": 2, "c": 3})
+
+        del mapping["a"]
+        self.assertIs(type(mapping), cls)
+        self.assertEqual(slot_values(mapping), ["b", 2, "c", 3, END, END])
+
+        mapping["d"] = 4
+        self.assertEqual(list(mapping.items()), [("b", 2), ("c", 3), ("d", 4)])
+
+        with self.assertRaises(KeyError):
+            del mapping["a"]
+
+    def test_mutable_overflow_and_back(self):
+        cls = create_mut_mapping_class(1)
+        mapping = cls({"a": 1})
+
+        mapping["b"] = 2
+        self.assertIs(type(mapping), cls._overflow_cls)
+        del mapping["b"]
+        self.assertEqual(dict(mapping), {"a": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+import unittest
+
+from opticol.migrate import migrate
+from opticol.projector import OptimizedCollectionProjector
+
+_PROJECTOR = OptimizedCollectionProjector(0, 3, True)
+
+
+@dataclass(slots=True, frozen=True)
+class SlottedEntry:
+    items: list
+    attributes: dict
+
+
+class Entry:
+    def __init__(self):
+        self.items = [1, 2]
+
+
+class Library:
+    def __init__(self):
+        self.internal = [1, 2]
+
+
+class MigrateTest(unittest.TestCase):
+    def test_dict_attributes(self):
+        entry = Entry()
+        report = migrate(_PROJECTOR, [entry])
+        self.assertEqual(report.replaced, 1)
+        self.assertNotIsInstance(entry.items, list)
+        self.assertEqual(list(entry.items), [1, 2])
+
+    def test_slots_of_frozen_dataclass(self):
+        entry = SlottedEntry([1], {"a": [2]})
+        report = migrate(_PROJECTOR, [entry])
+        self.assertEqual(report.replaced, 3)
+        self.assertNotIsInstance(entry.items, list)
+        self.assertNotIsInstance(entry.attributes, dict)
+        self.assertNotIsInstance(entry.attributes["a"], list)
+
+    def test_other_objects_are_not_walked(self):
+        entry = Entry()
+        entry.library = Library()
+        migrate(_PROJECTOR, [entry])
+        self.assertIs(type(entry.library.internal), list)
+
+    def test_predicate(self):
+        cache = {"a": Entry(), "b": Library()}
+        migrate(_PROJECTOR, [cache], walk_attributes=lambda obj: isinstance(obj, Entry))
+        self.assertNotIsInstance(cache["a"].items, list)
+        self.assertIs(type(cache["b"].internal), list)
+
+    def test_shared_references_stay_shared(self):
+        shared = [1]
+        cache = {"a": shared, "b": [shared]}
+        report = migrate(_PROJECTOR, [cache])
+        self.assertIs(cache["a"], cache["b"][0])
+        self.assertEqual(report.replaced, 2)
+        self.assertGreater(report.shallow_bytes_reclaimed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
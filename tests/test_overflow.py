@@ -0,0 +1,99 @@
+import random
+import unittest
+
+import opticol
+from opticol.projector import OptimizedCollectionProjector
+
+
+class OverflowSwapTest(unittest.TestCase):
+    def setUp(self):
+        self.projector = OptimizedCollectionProjector(0, 3, False)
+
+    def test_sequence(self):
+        m = self.projector.mut_seq([1, 2, 3])
+        slot_cls = type(m)
+        self.assertIs(slot_cls._slot_cls, slot_cls)
+
+        m.append(4)
+        self.assertIs(type(m), slot_cls._overflow_cls)
+        self.assertIsInstance(m, slot_cls)
+        self.assertEqual(list(m), [1, 2, 3, 4])
+
+        m.pop()
+        self.assertIs(type(m), slot_cls)
+        self.assertEqual(list(m), [1, 2, 3])
+
+        m.extend(range(5))
+        del m[1:]
+        self.assertIs(type(m), slot_cls)
+        self.assertEqual(list(m), [1])
+
+    def test_set(self):
+        s = self.projector.mut_set({1, 2})
+        slot_cls = type(s)
+        s |= {3, 4, 5}
+        self.assertIs(type(s), slot_cls._overflow_cls)
+        s -= {1, 2, 3}
+        self.assertIs(type(s), slot_cls)
+        self.assertEqual(set(s), {4, 5})
+
+    def test_mapping(self):
+        m = self.projector.mut_mapping({"a": 1, "b": 2, "c": 3})
+        slot_cls = type(m)
+        m.update(c=3, d=4)
+        self.assertIs(type(m), slot_cls._overflow_cls)
+        del m["a"]
+        self.assertIs(type(m), slot_cls)
+        self.assertEqual(dict(m), {"b": 2, "c": 3, "d": 4})
+        m.clear()
+        self.assertIs(type(m), slot_cls)
+        self.assertEqual(len(m), 0)
+
+    def test_matches_list(self):
+        rng = random.Random(7)
+        m, expected = self.projector.mut_seq([]), []
+        for _ in range(500):
+            match rng.randrange(5):
+                case 0 | 1:
+                    value = rng.randrange(100)
+                    m.append(value)
+                    expected.append(value)
+                case 2 if expected:
+                    i = rng.randrange(len(expected))
+                    self.assertEqual(m.pop(i), expected.pop(i))
+                case 3:
+                    i = rng.randrange(len(expected) + 1)
+                    m.insert(i, -i)
+                    expected.insert(i, -i)
+                case 4 if expected:
+                    del m[rng.randrange(len(expected)) :]
+                    del expected[len(m) :]
+            self.assertEqual(list(m), expected)
+
+
+class SelfExtendTest(unittest.TestCase):
+    def test_extend_self(self):
+        for size in (2, 4):
+            m = opticol.mut_seq([1, 2, 3])
+            m.extend(range(4, size + 2))
+            expected = list(m) * 2
+            m.extend(m)
+            self.assertEqual(list(m), expected)
+
+    def test_iadd_self(self):
+        m = opticol.mut_seq([1, 2, 3])
+        m.append(4)
+        m += m
+        self.assertEqual(list(m), [1, 2, 3, 4] * 2)
+
+    def test_shared_extend_self(self):
+        projector = OptimizedCollectionProjector(0, 2, True, mut_ownership="copy_on_write")
+        source = list(range(4))
+        m = projector.mut_seq(source)
+        m.extend(m)
+        self.assertEqual(list(m), [0, 1, 2, 3] * 2)
+        self.assertEqual(source, [0, 1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+
+from opticol.projector import OptimizedCollectionProjector
+
+
+def _iadd(seq):
+    seq += [100, 101]
+    return seq
+
+
+def _ior(s):
+    s |= {100, 101}
+    return s
+
+
+def _isub(s):
+    s -= {0, 1}
+    return s
+
+
+def _shrink_seq(seq):
+    while len(seq) > 2:
+        seq.pop()
+    seq.append(100)
+    return seq
+
+
+def _shrink_set(s):
+    for i in range(8):
+        s.discard(i)
+    s.add(100)
+    return s
+
+
+def _popitems(mapping):
+    # Which item popitem removes differs between dict and MutableMapping, so every popped item is
+    # put back after shrinking.
+    popped = [mapping.popitem() for _ in range(len(mapping) - 2)]
+    mapping["new"] = 100
+    mapping.update(popped)
+    return mapping
+
+
+def _setdefault(mapping):
+    mapping.setdefault("k0", -1)
+    mapping.setdefault("new", 100)
+    return mapping
+
+
+def _update(mapping):
+    mapping.update({"k0": -1, "new": 100})
+    return mapping
+
+
+def _clear(collection):
+    collection.clear()
+    return collection
+
+
+_CASES = (
+    ("mut_seq", lambda: list(range(10)), list, (_clear, _iadd, _shrink_seq)),
+    ("mut_set", lambda: set(range(10)), set, (_clear, _ior, _isub, _shrink_set)),
+    (
+        "mut_mapping",
+        lambda: {f"k{i}": i for i in range(10)},
+        dict,
+        (_clear, _popitems, _setdefault, _update),
+    ),
+)
+
+
+class OwnershipTest(unittest.TestCase):
+    def check(self, mode, isolated):
+        projector = OptimizedCollectionProjector(0, 3, True, mut_ownership=mode)
+        for method, make, builtin, ops in _CASES:
+            for op in ops:
+                with self.subTest(method=method, op=op.__name__):
+                    original = make()
+                    result = op(getattr(projector, method)(original))
+                    self.assertNotIsInstance(result, builtin)
+                    self.assertEqual(builtin(result), op(make()))
+                    if isolated:
+                        self.assertEqual(original, make())
+
+    def test_take(self):
+        self.check("take", False)
+
+    def test_copy(self):
+        self.check("copy", True)
+
+    def test_copy_on_write(self):
+        self.check("copy_on_write", True)
+
+    def test_copy_on_write_copies_once(self):
+        projector = OptimizedCollectionProjector(0, 3, True, mut_ownership="copy_on_write")
+        original = list(range(10))
+        result = projector.mut_seq(original)
+        result.append(10)
+        result.append(11)
+        self.assertEqual(list(result), list(range(12)))
+        self.assertEqual(original, list(range(10)))
+
+    def test_default_aliases(self):
+        projector = OptimizedCollectionProjector(0, 3, True)
+        original = list(range(10))
+        self.assertIs(projector.mut_seq(original), original)
+
+
+if __name__ == "__main__":
+    unittest.main()
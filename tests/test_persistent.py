@@ -0,0 +1,136 @@
+import copy
+import os
+import pickle
+import subprocess
+import sys
+import unittest
+
+import opticol
+from opticol.persistent import PersistentMapping, PersistentSequence
+from opticol.projector import OptimizedCollectionProjector
+
+
+class CollidingKey:
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        return 7
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and other.name == self.name
+
+
+class PersistentMappingTest(unittest.TestCase):
+    def test_updates_share_the_original(self):
+        base = PersistentMapping({i: i for i in range(1000)})
+        overlay = base.set(1, -1).set(1000, 1000).delete(2)
+        self.assertEqual((base[1], overlay[1]), (1, -1))
+        self.assertIn(2, base)
+        self.assertNotIn(2, overlay)
+        self.assertEqual(len(base), 1000)
+        self.assertEqual(len(overlay), 1000)
+        self.assertIs(base.set(3, 3), base)
+        with self.assertRaises(KeyError):
+            base.delete(-1)
+
+    def test_collisions(self):
+        keys = [CollidingKey(name) for name in "abc"]
+        m = PersistentMapping({keys[0]: 0, keys[1]: 1})
+        m = m.set(keys[2], 2).set(9, 9)
+        self.assertEqual(m[CollidingKey("c")], 2)
+        m = m.delete(CollidingKey("a")).delete(CollidingKey("b"))
+        self.assertEqual(dict(m), {keys[2]: 2, 9: 9})
+
+    def test_matches_dict(self):
+        expected = {}
+        m = PersistentMapping()
+        for i in range(0, 3000, 7):
+            expected[i], m = i, m.set(i, i)
+        for i in range(0, 3000, 21):
+            del expected[i]
+            m = m.delete(i)
+        self.assertEqual(m, expected)
+        self.assertEqual(sorted(m.items()), sorted(expected.items()))
+
+    def test_pickle_and_copy(self):
+        m = PersistentMapping({f"k{i}": [i] for i in range(200)})
+        for clone in (pickle.loads(pickle.dumps(m)), copy.deepcopy(m), copy.copy(m)):
+            self.assertIs(type(clone), PersistentMapping)
+            self.assertEqual(clone, m)
+            self.assertEqual(sorted(clone), sorted(m))
+            self.assertEqual(clone["k5"], [5])
+
+    def test_unpickle_in_another_process(self):
+        m = PersistentMapping({f"k{i}": i for i in range(100)})
+        code = (
+            "import pickle, sys; m = pickle.loads(sys.stdin.buffer.read()); "
+            "print('k1' in m, m['k99'], len(list(m)))"
+        )
+        env = dict(os.environ, PYTHONHASHSEED="random")
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            input=pickle.dumps(m),
+            capture_output=True,
+            check=True,
+            env=env,
+        ).stdout
+        self.assertEqual(out.split(), [b"True", b"99", b"100"])
+
+
+class PersistentSequenceTest(unittest.TestCase):
+    def test_append_and_set(self):
+        values = []
+        seq = PersistentSequence()
+        for i in range(2000):
+            values.append(i)
+            seq = seq.append(i)
+        self.assertEqual(list(seq), values)
+        self.assertEqual(seq[-1], 1999)
+        self.assertEqual(seq[1000], 1000)
+
+        changed = seq.set(5, "a").set(-1, "b")
+        self.assertEqual((changed[5], changed[1999]), ("a", "b"))
+        self.assertEqual((seq[5], seq[1999]), (5, 1999))
+        with self.assertRaises(IndexError):
+            seq.set(2000, 0)
+
+    def test_slices(self):
+        seq = PersistentSequence(range(100))
+        self.assertEqual(list(seq[10:20:3]), [10, 13, 16, 19])
+        self.assertIsInstance(seq[:5], PersistentSequence)
+
+    def test_pickle_and_copy(self):
+        seq = PersistentSequence(range(1100))
+        for clone in (pickle.loads(pickle.dumps(seq)), copy.deepcopy(seq)):
+            self.assertIs(type(clone), PersistentSequence)
+            self.assertEqual(list(clone), list(seq))
+            self.assertEqual(clone.append(1100)[1100], 1100)
+
+
+class ChainedUpdatesTest(unittest.TestCase):
+    def test_unrouted_results(self):
+        m = opticol.mapping({"a": 1, "b": 2, "c": 3}).set("d", 4).set("e", 5).delete("a")
+        self.assertEqual(dict(m), {"b": 2, "c": 3, "d": 4, "e": 5})
+
+        seq = opticol.seq([1, 2, 3]).append(4).append(5).set(0, 0)
+        self.assertEqual(list(seq), [0, 2, 3, 4, 5])
+
+    def test_without_projection(self):
+        projector = OptimizedCollectionProjector(0, 3, False, tuple_max_size=8)
+        for m in (projector.mapping({"a": 1}), projector.mapping({str(i): i for i in range(5)})):
+            updated = m.set("x", 0).set("y", 0).delete("x")
+            self.assertEqual(updated["y"], 0)
+            self.assertNotIn("x", updated)
+
+        seq = projector.seq([1, 2]).append(3).append(4)
+        self.assertEqual(list(seq.set(-1, 0)), [1, 2, 3, 0])
+
+    def test_routed_results_keep_their_class(self):
+        projector = OptimizedCollectionProjector(0, 3, True)
+        m = projector.mapping({"a": 1}).set("b", 2)
+        self.assertIs(type(m), type(projector.mapping({"x": 0, "y": 0})))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import sys
+import unittest
+
+from opticol.factory import create_mapping_class, create_mut_seq_class, create_seq_class
+from opticol.profiler import generated_classes, MethodProfiler
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.seq_cls = create_seq_class(3)
+        self.mapping_cls = create_mapping_class(2)
+
+    def test_generated_classes(self):
+        mut_cls = create_mut_seq_class(2, None)
+        classes = generated_classes()
+
+        self.assertIn(self.seq_cls, classes)
+        self.assertIn(self.mapping_cls, classes)
+        self.assertIn(mut_cls._overflow_cls, classes)
+        self.assertNotIn(list, classes)
+
+    def test_counts_generated_and_mixin_methods(self):
+        seq = self.seq_cls([1, 2, 3])
+        mapping = self.mapping_cls({"a": 1, "b": 2})
+
+        with MethodProfiler([self.seq_cls, self.mapping_cls]) as profiler:
+            for _ in range(10):
+                seq[0]
+                mapping["a"]
+            list(mapping.items())
+            seq.index(3)
+
+        stats = profiler.stats()
+        getitem = stats[(self.seq_cls, "__getitem__")]
+        self.assertGreaterEqual(getitem.calls, 10)
+        self.assertFalse(getitem.mixin)
+        self.assertEqual(stats[(self.mapping_cls, "__getitem__")].calls, 10)
+        self.assertTrue(stats[(self.seq_cls, "index")].mixin)
+        self.assertEqual(stats[(self.seq_cls, "index")].calls, 1)
+        self.assertGreater(stats[(self.seq_cls, "index")].total_ns, 0)
+
+    def test_generator_methods(self):
+        seq = self.seq_cls([1, 2, 3])
+
+        with MethodProfiler([self.seq_cls]) as profiler:
+            self.assertEqual(list(seq), [1, 2, 3])
+
+        # One call, however often the generator resumes.
+        self.assertEqual(profiler.stats()[(self.seq_cls, "__iter__")].calls, 1)
+
+    def test_exceptions_keep_the_stack_balanced(self):
+        seq = self.seq_cls([1, 2, 3])
+
+        with MethodProfiler([self.seq_cls]) as profiler:
+            for _ in range(5):
+                with self.assertRaises(IndexError):
+                    seq[10]
+            seq[0]
+
+        self.assertEqual(profiler.stats()[(self.seq_cls, "__getitem__")].calls, 6)
+        self.assertEqual(profiler._stack(), [])
+
+    def test_unprofiled_classes_are_ignored(self):
+        other = create_seq_class(4)([1, 2, 3, 4])
+
+        with MethodProfiler([self.seq_cls]) as profiler:
+            other[0]
+
+        self.assertEqual(profiler.stats(), {})
+
+    def test_stop_frees_the_tool_id(self):
+        profiler = MethodProfiler([self.seq_cls])
+        profiler.start()
+        with self.assertRaises(RuntimeError):
+            profiler.start()
+        tool_id = profiler._tool_id
+        profiler.stop()
+        profiler.stop()
+
+        self.assertIsNone(sys.monitoring.get_tool(tool_id))
+        self.seq_cls([1, 2, 3])[0]
+        self.assertEqual(profiler.stats(), {})
+
+    def test_stats_accumulate_until_reset(self):
+        seq = self.seq_cls([1, 2, 3])
+        profiler = MethodProfiler([self.seq_cls])
+        for _ in range(2):
+            with profiler:
+                seq[0]
+
+        self.assertEqual(profiler.stats()[(self.seq_cls, "__getitem__")].calls, 2)
+        profiler.reset()
+        self.assertEqual(profiler.stats(), {})
+
+    def test_report(self):
+        seq = self.seq_cls([1, 2, 3])
+        mapping = self.mapping_cls({"a": 1, "b": 2})
+
+        with MethodProfiler([self.seq_cls, self.mapping_cls]) as profiler:
+            seq[0]
+            seq.index(2)
+            mapping["a"]
+
+        lines = profiler.report().splitlines()
+        self.assertEqual(lines[0].split(), ["calls", "total", "ms", "ns/call", "method"])
+        self.assertIn(f"{self.seq_cls.__qualname__}.__getitem__", profiler.report())
+        self.assertIn(f"{self.seq_cls.__qualname__}.index (mixin)", profiler.report())
+        self.assertIn(f"{self.mapping_cls.__qualname__}.__getitem__", profiler.report())
+        self.assertEqual(len(profiler.report(limit=1).splitlines()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from opticol.persistent import PersistentSequence
+from opticol.projector import OptimizedCollectionProjector
+
+
+class SliceTypeTest(unittest.TestCase):
+    def setUp(self):
+        self.projector = OptimizedCollectionProjector(2, 4, True)
+
+    def test_mut_seq_slice_in_range(self):
+        m = self.projector.mut_seq([1, 2, 3, 4])
+        part = m[:2]
+        self.assertEqual(list(part), [1, 2])
+        self.assertTrue(hasattr(part, "append"))
+
+    def test_mut_seq_slice_out_of_range(self):
+        m = self.projector.mut_seq([1, 2, 3, 4])
+        self.assertEqual(type(m[:1]), list)
+        self.assertEqual(m[:1], [1])
+        self.assertEqual(type(m[4:]), list)
+
+    def test_mut_seq_overflow_slice(self):
+        m = self.projector.mut_seq([1, 2, 3, 4])
+        m.append(5)
+        self.assertEqual(type(m[:1]), list)
+        self.assertEqual(list(m[1:3]), [2, 3])
+
+    def test_seq_slice_in_range(self):
+        s = self.projector.seq([1, 2, 3, 4])
+        self.assertEqual(list(s[::2]), [1, 3])
+        self.assertNotIsInstance(s[::2], tuple)
+
+    def test_seq_slice_out_of_range(self):
+        s = self.projector.seq([1, 2, 3, 4])
+        self.assertEqual(type(s[:1]), list)
+        self.assertEqual(s[:1], [1])
+
+    def test_seq_without_projection(self):
+        s = OptimizedCollectionProjector(2, 4, False).seq([1, 2, 3])
+        self.assertEqual(type(s[1:]), list)
+        self.assertEqual(type(s.append(4)), PersistentSequence)
+
+    def test_seq_append_out_of_range(self):
+        s = self.projector.seq([1, 2, 3, 4])
+        self.assertEqual(type(s.append(5)), PersistentSequence)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+
+from opticol import snapshot
+
+
+class SnapshotTest(unittest.TestCase):
+    def test_round_trip(self):
+        value = {
+            "rows": [{"id": i, "name": f"user{i}"} for i in range(3)],
+            "index": {f"user{i}": i for i in range(50)},
+            "pairs": {(1, 2): "a", (3, (4,)): "b"},
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.optc")
+            self.assertEqual(snapshot.dump(value, path), os.path.getsize(path))
+            with snapshot.load(path) as snap:
+                root = snap.root
+                self.assertEqual(root["rows"][2]["name"], "user2")
+                self.assertEqual(root["index"]["user42"], 42)
+                self.assertEqual(root["pairs"][(3, (4,))], "b")
+                del root
+
+    def test_invalid_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.optc")
+            with open(path, "wb") as f:
+                f.write(b"not a snapshot file")
+            with self.assertRaises(ValueError):
+                snapshot.load(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+from array import array
+import unittest
+
+import opticol
+from opticol.projector import OptimizedCollectionProjector
+from opticol.table import RecordTable, RecordView
+
+
+def _rows(count):
+    return [{"id": i, "name": f"n{i}", "score": i / 2} for i in range(count)]
+
+
+class RecordTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = RecordTable(opticol.default, ("id", "name", "score"), typecodes={"id": "q"})
+        self.table.extend(_rows(10))
+
+    def test_rows(self):
+        self.assertEqual(len(self.table), 10)
+        self.assertEqual(self.table.keys, ("id", "name", "score"))
+        row = self.table[3]
+        self.assertIsInstance(row, RecordView)
+        self.assertEqual(dict(row), {"id": 3, "name": "n3", "score": 1.5})
+        self.assertEqual(row, _rows(10)[3])
+        self.assertEqual(list(row), ["id", "name", "score"])
+        self.assertIn("name", row)
+        self.assertNotIn("other", row)
+        self.assertEqual([r["id"] for r in self.table], list(range(10)))
+
+    def test_indices(self):
+        self.assertEqual(self.table[-1]["id"], 9)
+        self.assertEqual(self.table[-10]["id"], 0)
+        for index in (10, -11):
+            with self.assertRaises(IndexError):
+                self.table[index]
+        with self.assertRaises(TypeError):
+            self.table["id"]
+
+    def test_slices(self):
+        part = self.table[2:8:2]
+        self.assertIsInstance(part, RecordTable)
+        self.assertEqual([r["id"] for r in part], [2, 4, 6])
+        self.assertEqual(len(self.table[5:5]), 0)
+        self.assertEqual([r["id"] for r in self.table[::-4]], [9, 5, 1])
+
+    def test_typed_columns(self):
+        self.assertIsInstance(self.table.column("id"), array)
+        self.assertIsInstance(self.table.column("name"), list)
+        with self.assertRaises(TypeError):
+            self.table.append({"id": "x", "name": "n", "score": 0.0})
+        self.assertEqual(len(self.table), 10)
+        with self.assertRaises(ValueError):
+            RecordTable(opticol.default, ("id",), typecodes={"other": "q"})
+
+    def test_append_validation(self):
+        for row in ({"id": 1, "name": "n"}, {"id": 1, "name": "n", "other": 0.0}):
+            with self.assertRaises(ValueError):
+                self.table.append(row)
+        with self.assertRaises(ValueError):
+            self.table.extend([_rows(1)[0], {"id": 1}])
+        self.assertEqual(len(self.table), 10)
+
+        self.table.append({"score": 0.0, "name": "x", "id": 10})
+        self.assertEqual(dict(self.table[10]), {"id": 10, "name": "x", "score": 0.0})
+
+    def test_extend_columns(self):
+        self.table.extend_columns({"id": [10, 11], "name": ["a", "b"], "score": (0.0, 1.0)})
+        self.assertEqual(self.table[11]["name"], "b")
+        with self.assertRaises(ValueError):
+            self.table.extend_columns({"id": [1], "name": ["a"], "score": []})
+        with self.assertRaises(ValueError):
+            self.table.extend_columns({"id": [1]})
+        self.assertEqual(len(self.table), 12)
+
+    def test_where_select_filter(self):
+        self.assertEqual(self.table.where("id", lambda v: v % 3 == 0), [0, 3, 6, 9])
+        selected = self.table.select([7, 1])
+        self.assertEqual([r["id"] for r in selected], [7, 1])
+        self.assertIsInstance(selected.column("id"), array)
+        self.assertEqual(len(self.table.select([])), 0)
+        self.assertEqual([r["name"] for r in self.table.select([4])], ["n4"])
+
+        filtered = self.table.filter("score", lambda v: v > 3.5)
+        self.assertEqual([r["id"] for r in filtered], [8, 9])
+        self.assertIs(filtered.projector, self.table.projector)
+
+    def test_materialize(self):
+        projector = OptimizedCollectionProjector(0, 4, True)
+        table = RecordTable(projector, ("id", "tags"))
+        table.extend([{"id": 1, "tags": [1, 2]}])
+        row = table.materialize(-1)
+        self.assertIs(type(row), type(projector.mapping({"id": 0, "tags": 0})))
+        self.assertEqual(dict(row), {"id": 1, "tags": [1, 2]})
+
+        table.extend_columns({"id": [2], "tags": [[]]})
+        self.assertEqual(row["id"], 1)
+
+    def test_empty(self):
+        table = RecordTable(opticol.default, ())
+        self.assertEqual(len(table), 0)
+        self.assertEqual(list(table), [])
+        self.assertEqual(repr(table), "RecordTable(keys=(), rows=0)")
+
+
+if __name__ == "__main__":
+    unittest.main()
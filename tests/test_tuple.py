@@ -0,0 +1,106 @@
+import unittest
+
+from opticol._tuple import TUPLE_SET_MAX_SIZE
+from opticol.factory import create_tuple_mapping_class, create_tuple_set_class
+from opticol.projector import OptimizedCollectionProjector
+
+
+class Colliding:
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return 3
+
+    def __eq__(self, other):
+        return isinstance(other, Colliding) and other.value == self.value
+
+
+class TupleSetTest(unittest.TestCase):
+    def test_membership(self):
+        s = create_tuple_set_class()(set(range(0, 200, 2)))
+        self.assertEqual(len(s), 100)
+        self.assertTrue(all(i in s for i in range(0, 200, 2)))
+        self.assertFalse(any(i in s for i in range(1, 200, 2)))
+        self.assertEqual(s, set(range(0, 200, 2)))
+
+    def test_collisions(self):
+        s = create_tuple_set_class()({Colliding(i) for i in range(20)})
+        self.assertIn(Colliding(19), s)
+        self.assertNotIn(Colliding(20), s)
+
+    def test_max_size(self):
+        cls = create_tuple_set_class()
+        self.assertEqual(len(cls(set(range(TUPLE_SET_MAX_SIZE)))), TUPLE_SET_MAX_SIZE)
+        with self.assertRaises(ValueError):
+            cls(set(range(TUPLE_SET_MAX_SIZE + 1)))
+
+    def test_operations_deduplicate(self):
+        for recursive in (False, True):
+            projector = OptimizedCollectionProjector(0, 3, recursive, tuple_max_size=64)
+            s = projector.set(set(range(10)))
+            union = s | {1, 2, 99}
+            self.assertEqual(len(union), 11)
+            self.assertEqual(union, set(range(10)) | {99})
+            self.assertEqual(s & {1, 2, 99}, {1, 2})
+            self.assertEqual(s - set(range(8)), {8, 9})
+            self.assertEqual(s ^ {9, 10}, set(range(9)) | {10})
+
+    def test_operations_beyond_max_size(self):
+        s = create_tuple_set_class()(set(range(TUPLE_SET_MAX_SIZE)))
+        union = s | {-1, -2}
+        self.assertEqual(len(union), TUPLE_SET_MAX_SIZE + 2)
+        self.assertIn(-1, union)
+
+
+class TupleMappingTest(unittest.TestCase):
+    def setUp(self):
+        self.data = {f"k{i}": i for i in range(20)}
+        self.m = create_tuple_mapping_class()(self.data)
+
+    def test_lookup(self):
+        self.assertEqual(self.m["k7"], 7)
+        self.assertEqual(self.m.get("k7"), 7)
+        self.assertIsNone(self.m.get("missing"))
+        self.assertIn("k19", self.m)
+        with self.assertRaises(KeyError):
+            self.m["missing"]
+
+    def test_views(self):
+        self.assertEqual(list(self.m), list(self.data))
+        self.assertEqual(list(self.m.items()), list(self.data.items()))
+        self.assertEqual(list(self.m.values()), list(self.data.values()))
+        self.assertEqual(self.m, self.data)
+
+    def test_updates(self):
+        replaced = self.m.set("k3", -3)
+        self.assertIs(type(replaced), type(self.m))
+        self.assertIs(replaced._keys, self.m._keys)
+        self.assertEqual(replaced["k3"], -3)
+        self.assertEqual(self.m["k3"], 3)
+
+        added = self.m.set("new", 1).delete("k0")
+        self.assertEqual(added["new"], 1)
+        self.assertNotIn("k0", added)
+        self.assertEqual(len(added), 20)
+
+
+class ProjectorTierTest(unittest.TestCase):
+    def test_routing(self):
+        projector = OptimizedCollectionProjector(0, 3, True, tuple_max_size=8)
+        tuple_set = create_tuple_set_class(projector.set)
+        self.assertIs(type(projector.set(set(range(8)))), tuple_set)
+        self.assertIsNot(type(projector.set({1, 2})), tuple_set)
+        self.assertIs(type(projector.set(set(range(9)))), set)
+        self.assertIs(
+            type(projector.mapping({i: i for i in range(5)})),
+            create_tuple_mapping_class(projector.mapping),
+        )
+
+    def test_limit(self):
+        with self.assertRaises(ValueError):
+            OptimizedCollectionProjector(0, 3, True, tuple_max_size=TUPLE_SET_MAX_SIZE + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()